@@ -1,11 +1,8 @@
-import time
 import sys
 
 # Redirect standard error to standard out
 _stderr = sys.stderr
 sys.stderr = sys.stdout
-## import cProfile
-## import pstats
 
 # Packages and modules from super-directories
 import noggin_constants as Constants
@@ -24,6 +21,15 @@ from .navigator import Navigator
 from .playbook import PBInterface
 from .players import Switch
 from .kickDecider import KickDecider
+from .util import Clock
+from .util import Collector
+from .util import FrameCache
+from .util import FrameTimer
+from .util import ImportTimer
+from .util import Log
+from .util import Recorder
+from .util import Scheduler
+from .util import Snapshot
 
 # Import message protocol buffers and interface
 import interface
@@ -40,6 +46,9 @@ import VisionField_proto
 import ButtonState_proto
 import FallStatus_proto
 
+# The playbook runs every this many frames while nothing is moving
+IDLE_PLAYBOOK_DIVIDER = 10
+
 class Brain(object):
     """
     Class brings all of our components together and runs the behaviors
@@ -55,7 +64,27 @@ class Brain(object):
         self.teamNumber = teamNum
 
         self.counter = 0
-        self.time = time.time()
+        # Ticked once per frame; everything that needs the frame time
+        # reads self.time (or the FSAs, clock.now())
+        self.clock = Clock.RealTimeClock()
+        self.time = self.clock.now()
+
+        # Per-phase timing of run()
+        self.frameTimer = FrameTimer.FrameTimer()
+
+        # Garbage is collected at the end of frames, see run()
+        self.collector = Collector.FrameCollector(self.frameTimer)
+
+        # Runtime profiler, off until startProfiling()
+        self.profiler = None
+
+        # Input recorder, off until startRecording()
+        self.recorder = None
+
+        # This frame's inputs; the behaviors read these rather than the
+        # interface's messages
+        self.snapshotter = Snapshot.Snapshotter()
+        self.world = None
 
         # Initalize the leds and game controller
         self.leds = Leds.Leds(self)
@@ -76,7 +105,6 @@ class Brain(object):
         self.ball = None
         self.initTeamMembers()
         self.motion = None
-        self.game = None
 
         self.play = Play.Play()
 
@@ -86,10 +114,60 @@ class Brain(object):
         self.nav = Navigator.Navigator(self)
         self.playbook = PBInterface.PBInterface(self)
         self.kickDecider = KickDecider.KickDecider(self)
+        self.setClock(self.clock)
 
         # Message interface
         self.interface = interface.interface
 
+        # Everything run() does after the snapshot, in order
+        self.scheduler = Scheduler.Scheduler(self.frameTimer)
+        self.initSchedule()
+
+        self.collector.start()
+
+        if ImportTimer.installed():
+            ImportTimer.dump(Log.getLogger('ImportTimer').info)
+
+    def initSchedule(self):
+        """
+        Order here is very important. The leds only show what happened,
+        so they are the first thing put off when a frame runs long.
+        """
+        add = self.scheduler.add
+        # Update objects
+        add('updateVisionObjects', self.updateVisionObjects,
+            priority = Scheduler.CRITICAL)
+        add('updateMotion', self.updateMotion, priority = Scheduler.CRITICAL)
+        add('updateLoc', self.updateLoc, priority = Scheduler.CRITICAL)
+        add('getCommUpdate', self.getCommUpdate)
+
+        # Behavior stuff
+        add('gameController', self.gameController.run,
+            priority = Scheduler.CRITICAL)
+        add('updateRates', self.updateRates, priority = Scheduler.CRITICAL)
+        add('updatePlaybook', self.updatePlaybook)
+        add('fallController', self.fallController.run,
+            priority = Scheduler.CRITICAL)
+        add('player', self.player.run, priority = Scheduler.CRITICAL)
+        add('tracker', self.tracker.run, priority = Scheduler.CRITICAL)
+        add('nav', self.nav.run, priority = Scheduler.CRITICAL)
+
+        #Set LED message
+        add('leds', self.leds.processLeds, priority = Scheduler.LOW)
+
+    def updateRates(self):
+        """
+        Slows the playbook down in gameInitial and gameFinished, when
+        nobody moves.
+        """
+        if not self.gameController.stateChanged:
+            return
+        if self.gameController.currentState in (GameController.STATE_INITIAL,
+                                                GameController.STATE_FINISHED):
+            self.scheduler.setDivider('updatePlaybook', IDLE_PLAYBOOK_DIVIDER)
+        else:
+            self.scheduler.setDivider('updatePlaybook', 1)
+
     def initTeamMembers(self):
         self.teamMembers = []
         for i in xrange(Constants.NUM_PLAYERS_PER_TEAM):
@@ -100,74 +178,115 @@ class Brain(object):
 ##
 ##--------------CONTROL METHODS---------------##
 ##
+    def startProfiling(self, deterministic = False):
+        """
+        Turns on profiling; safe to call while running.
+        By default a background thread samples the frame loop's stack.
+        With deterministic, one frame in Profiler.FRAME_PERIOD is run
+        under cProfile instead. Either way results roll into
+        Profiler.PROFILE_FILE.
+        """
+        if self.profiler is not None:
+            self.stopProfiling()
+
+        # only needed when profiling, and it brings in cProfile
+        from .util import Profiler
+        if deterministic:
+            self.profiler = Profiler.FrameProfiler()
+            # Route frames through profile() until stopProfiling()
+            self.run = self.profile
+        else:
+            self.profiler = Profiler.SamplingProfiler()
+        self.profiler.start()
+
+    def stopProfiling(self):
+        """
+        Turns off profiling and writes the final dump in the background.
+        """
+        if self.profiler is None:
+            return
+        self.profiler.stop()
+        self.__dict__.pop('run', None)
+        self.profiler = None
+
+    def setClock(self, clock):
+        """
+        Shares clock (see util/Clock) with Brain and its FSAs, e.g. a
+        simulated one to run faster than real time.
+        """
+        self.clock = clock
+        self.time = clock.now()
+        for fsa in (self.player, self.tracker, self.nav):
+            fsa.setTimeFunction(clock.now)
+
+    def startRecording(self, path = Recorder.RECORD_FILE):
+        """
+        Starts logging every frame's interface inputs to path.
+        """
+        if self.recorder is not None:
+            self.stopRecording()
+        info = {'team' : self.teamNumber,
+                'player' : self.playerNumber,
+                'playerModule' : Switch.selectedPlayer.__name__}
+        self.recorder = Recorder.FrameRecorder(path, info)
+
+    def stopRecording(self):
+        """
+        Flushes and closes the input log.
+        """
+        if self.recorder is None:
+            return
+        self.recorder.close()
+        self.recorder = None
+
     def profile(self):
-        if self.counter == 0:
-            cProfile.runctx('self.run()',  self.__dict__, locals(),
-                            'pythonStats')
-            self.p = pstats.Stats('pythonStats')
-
-        elif self.counter < 3000:
-            self.p.add('pythonStats')
-            cProfile.runctx('self.run()',  self.__dict__, locals(),
-                            'pythonStats')
-
-        elif self.counter == 3000:
-            self.p.strip_dirs()
-            self.p.sort_stats('cumulative')
-            ## print 'PYTHON STATS:'
-            ## self.p.print_stats()
-            ## print 'OUTGOING CALLEES:'
-            ## self.p.print_callees()
-            ## print 'OUTGOING CALLEES:'
-            ## self.p.print_callers()
-            self.p.dump_stats('pythonStats')
-
-        self.counter += 1
+        """
+        Runs a frame through the deterministic profiler.
+        """
+        self.profiler.runFrame(Brain.run, self)
 
     def run(self):
         """
         Main control loop
         """
+        timer = self.frameTimer
+        timer.startFrame()
+
         # Update Environment
-        self.time = time.time()
+        self.time = self.clock.tick()
 
-        # Update objects
-        self.updateVisionObjects()
-        self.updateMotion()
-        self.updateLoc()
-        self.getCommUpdate()
-        self.updateLoc()
+        if self.recorder is not None:
+            self.recorder.record(self.interface, self.time)
+            timer.mark('record')
 
-        # Behavior stuff
-        # Order here is very important
-        self.gameController.run()
-        self.updatePlaybook()
-        self.fallController.run()
-        self.player.run()
-        self.tracker.run()
-        self.nav.run()
+        self.world = self.snapshotter.take(self.interface, self.time)
+        FrameCache.newFrame()
+        timer.mark('snapshot')
 
-        #Set LED message
-        self.leds.processLeds()
+        # Everything else, see initSchedule()
+        self.scheduler.run()
+
+        # In whatever time is left
+        self.collector.endFrame(self.player.currentState)
+
+        # Output is flushed by util/Log's writer thread, off the frame
 
-        # Flush the output
-        sys.stdout.flush()
+        timer.endFrame()
 
     def getCommUpdate(self):
-        self.game = self.interface.gameState
-        for i in range(len(self.teamMembers)):
-            self.teamMembers[i].update(self.interface.worldModelList()[i])
+        for mate, model in zip(self.teamMembers, self.world.worldModels):
+            mate.update(model)
 
     def updateMotion(self):
-        self.motion = self.interface.motionStatus
+        self.motion = self.world.motion
 
     def updateVisionObjects(self):
         """
         Update estimates of robot and ball positions on the field
         """
-        self.ball = self.interface.filteredBall
-        self.yglp = self.interface.visionField.goal_post_l.visual_detection
-        self.ygrp = self.interface.visionField.goal_post_r.visual_detection
+        self.ball = self.world.ball
+        self.yglp = self.world.leftPost
+        self.ygrp = self.world.rightPost
 
     def updatePlaybook(self):
         """
@@ -187,9 +306,8 @@ class Brain(object):
         """
         Make Loc info a RobotLocation.
         """
-        self.loc = RobotLocation(self.interface.loc.x,
-                                 self.interface.loc.y,
-                                 self.interface.loc.h)
+        world = self.world
+        self.loc = RobotLocation(world.locX, world.locY, world.locH)
 
     def resetLocTo(self, x, y, h):
         """
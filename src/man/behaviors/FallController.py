@@ -19,7 +19,7 @@ class FallController():
             return
 
         # Check if we have just begun falling.
-        if (not self.falling and self.brain.interface.fallStatus.falling):
+        if (not self.falling and self.brain.world.falling):
             # Save the player. We are falling
             self.falling = True
             self.brain.player.gainsOff()
@@ -28,7 +28,7 @@ class FallController():
         # Check if we have fallen.
         # HACK Guardian's `fallen` is not actually on the ground
         #      Put in a delay to ensure we hit the ground softly
-        if (not self.fell and self.brain.interface.fallStatus.fallen):
+        if (not self.fell and self.brain.world.fallen):
             self.standDelay += 1
             if (self.standDelay == 15): # Half a second
                 self.fell = True
@@ -41,7 +41,7 @@ class FallController():
             self.brain.tracker.setNeutralHead()
 
             move = None
-            if (self.brain.interface.fallStatus.on_front):
+            if (self.brain.world.onFront):
                 move = SweetMoves.STAND_UP_FRONT
             else:
                 move = SweetMoves.STAND_UP_BACK
@@ -46,15 +46,15 @@ class GameController():
         self.playingStartTime = 0
 
     def run(self):
-        gameState = self.brain.interface.gameState
+        world = self.brain.world
 
         # reset field for change
         self.stateChanged = False
 
-        if (self.currentState != gameState.state):
+        if (self.currentState != world.gameState):
             self.stateChanged = True
             self.lastState = self.currentState
-            self.currentState = gameState.state
+            self.currentState = world.gameState
             if (self.currentState == STATE_PLAYING):
                 self.playingStartTime = self.brain.time
             else:
@@ -64,7 +64,7 @@ class GameController():
         # reset field for change
         self.teamColorChanged = False
 
-        if (gameState.team(self.teamColor).team_number != self.brain.teamNumber):
+        if (world.teamNumbers[self.teamColor] != self.brain.teamNumber):
             # We have the wrong team color
             self.teamColorChanged = True
             # This function might look weird, but!
@@ -75,7 +75,7 @@ class GameController():
         # reset field for change
         self.kickOffChanged = False
 
-        if (gameState.kick_off_team == self.teamColor):
+        if (world.kickOffTeam == self.teamColor):
             # It is currently our kick off
             if not self.ownKickOff:
                 self.kickOffChanged = True
@@ -89,7 +89,7 @@ class GameController():
         # Egocentric check for penalty.
         # Note: being penalized is considered a state change, and should
         # override self.currentState when checked by the player FSA.
-        if (gameState.team(self.teamColor).player(self.brain.playerNumber-1).penalty):
+        if (world.penalties[self.teamColor][self.brain.playerNumber-1]):
             # I am penalized.
             if not self.penalized:
                 self.stateChanged = True
@@ -105,7 +105,7 @@ class GameController():
             if self.penalized:
                 self.brain.player.switchTo('gamePenalized')
             else:
-                if gameState.secondary_state != STATE2_PENALTYSHOOT:
+                if world.secondaryState != STATE2_PENALTYSHOOT:
                     self.brain.player.switchTo(convertStateFormat[self.currentState])
                 else:
                     self.brain.player.switchTo(convertStateFormatPenaltyShots[self.currentState])
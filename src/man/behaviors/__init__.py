@@ -1 +1,13 @@
+import os
+
+# Times every import from here on; see util/ImportTimer
+if os.environ.get('BEHAVIORS_IMPORT_TIMES'):
+    from .util import ImportTimer
+    ImportTimer.install()
+
+# Serves the precomputed tables built with the behaviors, see
+# util/TableCache
+from .util import TableCache
+TableCache.install()
+
 from . import Brain
@@ -1,5 +1,6 @@
 from . import TrackingConstants as constants
 from ..util import MyMath as MyMath
+from ..util import Geometry
 from .. import StiffnessModes
 from math import fabs, degrees
 import HeadMoves
@@ -76,7 +77,7 @@ class HeadTrackingHelper(object):
         headMovePitch = headMove[1][0][1]
 
         #TODO do this math in C++
-        curYaw = degrees(self.tracker.brain.interface.joints.head_yaw)
+        curYaw = degrees(self.tracker.brain.world.headYaw)
         degreesPerSecond = 80 #fast, but hopefully won't destabilize the walk much
         yawDiff = MyMath.fabs(curYaw - headMoveYaw)
         totalTime = yawDiff/degreesPerSecond
@@ -96,7 +97,7 @@ class HeadTrackingHelper(object):
         headMoveYaw = headMove[0][0][0]
         headMovePitch = headMove[0][0][1]
 
-        curYaw = degrees(self.tracker.brain.interface.joints.head_yaw)
+        curYaw = degrees(self.tracker.brain.world.headYaw)
         degreesPerSecond = (headMoveYaw*2)/headMove[0][1] # double the yaw b/c pans are symmetric
         yawDiff = MyMath.fabs(curYaw-headMoveYaw)
         totalTime = yawDiff/degreesPerSecond
@@ -145,7 +146,7 @@ class HeadTrackingHelper(object):
         changeX = target.vis.angle_x_deg
         # ignore changeY: pitch is fixed
 
-        curYaw   = degrees(self.tracker.brain.interface.joints.head_yaw)
+        curYaw   = degrees(self.tracker.brain.world.headYaw)
         maxChange = 13.0
 
         # Warning- no gain is applied currently!
@@ -232,15 +233,8 @@ class HeadTrackingHelper(object):
         brain = self.tracker.brain
         posts = [brain.yglp, brain.ygrp, brain.bgrp, brain.bglp]
 
-        currYaw = degrees(brain.interface.joints.head_yaw)
+        currYaw = degrees(brain.world.headYaw)
 
-        minDiff = 1000000000
-        bestPost = None
-
-        for p in posts:
-            diff = MyMath.sub180Angle(currYaw - p.bearing)
-
-            if diff < minDiff:
-                bestPost = p
-                minDiff = diff
-        return bestPost
+        diffs = Geometry.wrap180s([currYaw - p.bearing for p in posts])
+        minDiff = min(diffs)
+        return posts[diffs.index(minDiff)]
@@ -0,0 +1,306 @@
+#!/usr/bin/python
+"""
+Bench.py - what each player's states cost, scenario by scenario
+
+Every player in players/ is run through a Harness, in its own process, for
+each of a set of scripted scenarios (kickoff, ball approaching, ball lost,
+penalized). A scenario sets the interface's inputs before every frame.
+Afterwards the player, head tracker and navigator FSAs' accounting (see
+util/StateStats) gives each state's runs and cost and each transition's
+count and cost, which are written out as JSON:
+
+    python Bench.py [-o baseline.json] [-c old.json] [-f frames] [player ...]
+
+Motion reports itself calibrated throughout, so players get past their
+game* states into the states that play. A scenario whose player never
+leaves the game* states measured nothing; Bench lists those and exits
+with an error once the file is written. The test players that play from
+their game* states, PLAY_IN_GAME_STATES, are not checked.
+
+With no players named every player is run; one that fails to build is
+recorded with its error, and a scenario that crashes with its own. Keys
+are sorted, so a baseline kept under version control diffs cleanly.
+baseline.json here is the one for the current tree. -c compares against
+an earlier file:
+states that got more than TOLERANCE slower per run (over at least
+MIN_RUNS runs) and transitions whose count changed (a change in
+behavior) are listed.
+"""
+import imp
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import Harness
+
+DEFAULT_FRAMES = 600
+DEFAULT_OUTPUT = 'baseline.json'
+
+# Slowdown per run, and the absolute one in seconds, that -c reports
+TOLERANCE = 0.25
+MIN_SLOWDOWN = 0.000002
+# States that ran fewer times are too noisy to compare
+MIN_RUNS = 30
+
+# Players whose game* states are all they run
+PLAY_IN_GAME_STATES = ('pNone', 'pPositionTest', 'pSnapshot', 'pWall')
+
+# Our team is the first, blue, team; see Harness.initGameState
+OUR_COLOR = 0
+
+USAGE = ("Usage: Bench.py [-o output] [-c compareTo] [-f frames] "
+         "[player ...]")
+
+def _setBall(interface, distance, bearing, framesOn, framesOff):
+    """A ball seen framesOn frames in a row at distance cm and bearing deg."""
+    ball = interface.filteredBall
+    ball.vis.on = framesOn > 0
+    ball.vis.frames_on = framesOn
+    ball.vis.frames_off = framesOff
+    ball.vis.distance = ball.distance = distance
+    ball.vis.bearing_deg = ball.bearing_deg = bearing
+    ball.vis.bearing = ball.bearing = math.radians(bearing)
+    ball.rel_x = distance*math.cos(ball.bearing)
+    ball.rel_y = distance*math.sin(ball.bearing)
+
+def _setGame(interface, state, penalized = False):
+    # players wait in their game* states until motion is calibrated
+    interface.motionStatus.calibrated = True
+    gameState = interface.gameState
+    gameState.state = Harness.GAME_STATES[state]
+    gameState.kick_off_team = OUR_COLOR
+    gameState.team(OUR_COLOR).player(Harness.PLAYER_NUMBER - 1).penalty = \
+        int(penalized)
+
+def kickoff(interface, frame):
+    """Ready, set, then playing with the ball in the center circle."""
+    if frame < 60:
+        _setGame(interface, 'gameReady')
+        _setBall(interface, 0.0, 0.0, 0, frame + 1)
+    elif frame < 120:
+        _setGame(interface, 'gameSet')
+        _setBall(interface, 80.0, 0.0, frame - 59, 0)
+    else:
+        _setGame(interface, 'gamePlaying')
+        _setBall(interface, 80.0, 0.0, frame - 59, 0)
+
+def ballApproaching(interface, frame):
+    """The ball rolls in from 4m, weaving a little."""
+    _setGame(interface, 'gamePlaying')
+    distance = max(15.0, 400.0 - 2.0*frame)
+    _setBall(interface, distance, 20.0*math.sin(frame/20.0), frame + 1, 0)
+    ball = interface.filteredBall
+    ball.vel_x = -60.0 if distance > 15.0 else 0.0
+    ball.vis.heat = min(frame, 100)
+
+def ballLost(interface, frame):
+    """The ball is seen for three seconds, then never again."""
+    _setGame(interface, 'gamePlaying')
+    if frame < 90:
+        _setBall(interface, 150.0, 10.0, frame + 1, 0)
+    else:
+        _setBall(interface, 150.0, 10.0, 0, frame - 89)
+
+def penalized(interface, frame):
+    """Penalized for ten seconds two seconds into play."""
+    _setGame(interface, 'gamePlaying', 60 <= frame < 360)
+    _setBall(interface, 200.0, -15.0, frame + 1, 0)
+
+SCENARIOS = (('kickoff', kickoff),
+             ('ballApproaching', ballApproaching),
+             ('ballLost', ballLost),
+             ('penalized', penalized))
+
+def players():
+    """Every player module, by name."""
+    playersDir = os.path.join(Harness.BEHAVIORS_DIR, 'players')
+    return sorted(name[:-3] for name in os.listdir(playersDir)
+                  if name.startswith('p') and name.endswith('.py'))
+
+def _fsaResult(fsa):
+    stats = fsa.exportStats()
+    states = dict()
+    for name, state in stats['states'].iteritems():
+        if state['frames']:
+            states[name] = {'runs' : state['frames'],
+                            'costMs' : round(state['cost']*1000, 3),
+                            'usPerRun' : round(state['cost']*1e6 /
+                                               state['frames'], 2)}
+    transitions = dict()
+    for fromName, to in stats['transitions'].iteritems():
+        for toName, count in to.iteritems():
+            cost = stats['transitionCost'][fromName][toName]
+            transitions[fromName + ' -> ' + toName] = {
+                'count' : count,
+                'costMs' : round(cost*1000, 3)}
+    return {'states' : states, 'transitions' : transitions}
+
+def leftGameStates(result):
+    """Whether the player ran any state besides the game* ones."""
+    return any(not name.startswith('game')
+               for name in result['player']['states'])
+
+def benchPlayer(player, frames):
+    """Runs every scenario on a fresh Brain; {scenario : results}."""
+    results = dict()
+    for name, script in SCENARIOS:
+        harness = Harness.Harness(player)
+        interface = harness.interface
+        start = time.time()
+        try:
+            for frame in xrange(frames):
+                script(interface, frame)
+                harness.step()
+        except Exception, e:
+            results[name] = {'error' : 'frame %d: %s: %s' %
+                             (frame, type(e).__name__, e)}
+            continue
+        elapsed = time.time() - start
+        brain = harness.brain
+        results[name] = {'frames' : frames,
+                         'msPerFrame' : round(elapsed*1000/frames, 3),
+                         'player' : _fsaResult(brain.player),
+                         'tracker' : _fsaResult(brain.tracker),
+                         'nav' : _fsaResult(brain.nav)}
+    return results
+
+def _child(player, frames, path):
+    """Benches one player and writes its results, or its error, to path."""
+    try:
+        result = benchPlayer(player, frames)
+    except Exception, e:
+        result = {'error' : '%s: %s' % (type(e).__name__, e)}
+    f = open(path, 'w')
+    try:
+        json.dump(result, f)
+    finally:
+        f.close()
+
+def runPlayer(player, frames):
+    """Benches player in a child process, so players don't share modules."""
+    handle, path = tempfile.mkstemp(suffix = '.json')
+    os.close(handle)
+    try:
+        child = subprocess.Popen([sys.executable, os.path.abspath(__file__),
+                                  '--child', player, str(frames), path],
+                                 stdout = subprocess.PIPE,
+                                 stderr = subprocess.STDOUT)
+        output = child.communicate()[0]
+        if child.returncode != 0:
+            lines = output.strip().splitlines()
+            return {'error' : lines[-1] if lines else
+                    'exited with %d' % child.returncode}
+        f = open(path)
+        try:
+            return json.load(f)
+        finally:
+            f.close()
+    finally:
+        os.remove(path)
+
+def compare(old, new, outputFunction):
+    """Reports slower states and changed transition counts."""
+    for player in sorted(new):
+        if 'error' in new[player] or 'error' in old.get(player, {}):
+            continue
+        for scenario, result in sorted(new[player].iteritems()):
+            before = old.get(player, {}).get(scenario)
+            if before is None or 'error' in before or 'error' in result:
+                continue
+            for fsa in ('player', 'tracker', 'nav'):
+                where = '%s %s %s' % (player, scenario, fsa)
+                oldStates = before[fsa]['states']
+                for name, state in sorted(result[fsa]['states'].iteritems()):
+                    if (name not in oldStates or
+                        min(state['runs'], oldStates[name]['runs']) < MIN_RUNS):
+                        continue
+                    was = oldStates[name]['usPerRun']
+                    now = state['usPerRun']
+                    if (now > was*(1 + TOLERANCE) and
+                        now - was > MIN_SLOWDOWN*1e6):
+                        outputFunction("%s: %s %.2fus -> %.2fus per run" %
+                                       (where, name, was, now))
+                oldTransitions = before[fsa]['transitions']
+                newTransitions = result[fsa]['transitions']
+                for name in sorted(set(oldTransitions) | set(newTransitions)):
+                    was = oldTransitions.get(name, {}).get('count', 0)
+                    now = newTransitions.get(name, {}).get('count', 0)
+                    if was != now:
+                        outputFunction("%s: %s taken %d -> %d times" %
+                                       (where, name, was, now))
+
+def main(argv):
+    if argv[:1] == ['--child']:
+        _child(argv[1], int(argv[2]), argv[3])
+        return
+
+    output = DEFAULT_OUTPUT
+    compareTo = None
+    frames = DEFAULT_FRAMES
+    chosen = []
+    args = iter(argv)
+    try:
+        for arg in args:
+            if arg == '-o':
+                output = args.next()
+            elif arg == '-c':
+                compareTo = args.next()
+            elif arg == '-f':
+                frames = int(args.next())
+            elif arg in ('-h', '--help') or arg.startswith('-'):
+                print USAGE
+                sys.exit(arg not in ('-h', '--help'))
+            else:
+                chosen.append(arg)
+    except (StopIteration, ValueError):
+        print USAGE
+        sys.exit(2)
+
+    results = dict()
+    # (player, scenario) that never got past the game* states
+    stuck = []
+    for player in chosen or players():
+        start = time.time()
+        results[player] = runPlayer(player, frames)
+        if 'error' in results[player]:
+            print "%-20s failed: %s" % (player, results[player]['error'])
+            continue
+        print "%-20s %6.1fs" % (player, time.time() - start)
+        for scenario, result in sorted(results[player].iteritems()):
+            if 'error' in result:
+                print "  %-18s failed: %s" % (scenario, result['error'])
+            elif (player not in PLAY_IN_GAME_STATES and
+                  not leftGameStates(result)):
+                stuck.append((player, scenario))
+
+    f = open(output, 'w')
+    try:
+        json.dump(results, f, indent = 1, sort_keys = True)
+        f.write('\n')
+    finally:
+        f.close()
+    print "wrote", output
+
+    if compareTo is not None:
+        f = open(compareTo)
+        try:
+            old = json.load(f)
+        finally:
+            f.close()
+        # straight from the file, as the behaviors are only imported by the
+        # children
+        Log = imp.load_source('Log', os.path.join(
+            Harness.BEHAVIORS_DIR, 'util', 'Log.py'))
+        compare(old, results, Log.printLine)
+
+    if stuck:
+        for player, scenario in stuck:
+            print "%s %s: never left the game* states" % (player, scenario)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,187 @@
+#!/usr/bin/python
+"""
+Harness.py - runs a full Brain and player off the robot
+
+The modules in this directory stand in for the boost modules the behaviors
+import (interface, the *_proto messages, objects, noggin_constants and
+goalie). install() puts them first on sys.path, imports the behaviors as
+the package `behaviors` and points players.Switch at the chosen player, so
+a Brain can be built and stepped as fast as the CPU allows.
+
+    python Harness.py [player] [frames] [gameState]
+
+e.g. `python Harness.py pGoalie 5000 gamePlaying` prints the frame rate
+and Brain's per-phase timings. This directory is not installed on the
+robot.
+"""
+import imp
+import os
+import sys
+import time
+
+HEADLESS_DIR = os.path.dirname(os.path.abspath(__file__))
+BEHAVIORS_DIR = os.path.dirname(HEADLESS_DIR)
+PACKAGE = os.path.basename(BEHAVIORS_DIR)
+
+DEFAULT_PLAYER = 'pBrunswick'
+DEFAULT_FRAMES = 1000
+TEAM_NUMBER = 16
+PLAYER_NUMBER = 2
+
+# GameController's STATE_ constants, by the player state they switch to
+GAME_STATES = {'gameInitial' : 0,
+               'gameReady' : 1,
+               'gameSet' : 2,
+               'gamePlaying' : 3,
+               'gameFinished' : 4}
+
+USAGE = "Usage: Harness.py [player] [frames] [%s]" % '|'.join(
+    sorted(GAME_STATES, key = GAME_STATES.get))
+
+def _importModule(name):
+    __import__(name)
+    return sys.modules[name]
+
+class _SwitchImporter(object):
+    """
+    Serves players.Switch, which cmake generates for robot builds. It has
+    to come through an importer rather than straight from sys.modules so
+    that `from .players import Switch` finds it on the package.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.module = imp.new_module(name)
+        self.module.__loader__ = self
+
+    def find_module(self, fullname, path = None):
+        if fullname == self.name:
+            return self
+        return None
+
+    def load_module(self, fullname):
+        return sys.modules.setdefault(fullname, self.module)
+
+def _switchModule():
+    name = PACKAGE + '.players.Switch'
+    for importer in sys.meta_path:
+        if isinstance(importer, _SwitchImporter) and importer.name == name:
+            return importer.module
+    importer = _SwitchImporter(name)
+    sys.meta_path.append(importer)
+    return importer.module
+
+def install(player, messagesDir = None):
+    """
+    Makes the stand-in modules importable, selects `player` in
+    players.Switch and returns the imported Brain module.
+    """
+    if HEADLESS_DIR not in sys.path:
+        sys.path.insert(0, HEADLESS_DIR)
+
+    import protos
+    if not protos.registry:
+        protos.install(messagesDir or protos.MESSAGES_DIR)
+
+    root = os.path.dirname(BEHAVIORS_DIR)
+    if root not in sys.path:
+        sys.path.append(root)
+
+    switch = _switchModule()
+    switch.selectedPlayer = _importModule(PACKAGE + '.players.' + player)
+
+    return _importModule(PACKAGE + '.Brain')
+
+class Harness(object):
+    """
+    Owns a Brain and the stand-in interface it reads from. Fill in
+    self.interface between frames to feed the behaviors. Unless given
+    another clock, Brain runs on a simulated one that moves a frame's
+    length per step, however fast the steps actually run.
+    """
+    def __init__(self, player = DEFAULT_PLAYER, teamNumber = TEAM_NUMBER,
+                 playerNumber = PLAYER_NUMBER, messagesDir = None,
+                 clock = None):
+        self.brainModule = install(player, messagesDir)
+        if clock is None:
+            Clock = _importModule(PACKAGE + '.util.Clock')
+            clock = Clock.SimulatedClock()
+        self.clock = clock
+
+        import interface
+        import noggin_constants
+        # an interface of its own, so Harnesses can run side by side; Brain
+        # takes the module's when it is built
+        self.interface = interface.Interface()
+        interface.interface = self.interface
+        self.constants = noggin_constants
+        self.initGameState(teamNumber)
+
+        self.brain = self.brainModule.Brain(teamNumber, playerNumber)
+        self.brain.setClock(clock)
+        self.frames = 0
+        self.elapsed = 0.0
+
+    def initGameState(self, teamNumber):
+        """Two teams with full rosters; we are the first (blue) team."""
+        gameState = self.interface.gameState
+        gameState.clear_team()
+        for color in xrange(self.constants.NUM_GAME_TEAM_COLORS):
+            team = gameState.add_team()
+            team.team_number = teamNumber + color
+            team.team_color = color
+            for i in xrange(self.constants.NUM_PLAYERS_PER_TEAM):
+                team.add_player()
+
+    def setGameState(self, state):
+        """Takes a GameController state number or player state name."""
+        self.interface.gameState.state = GAME_STATES.get(state, state)
+
+    def step(self):
+        self.interface.prepareMessages()
+        self.brain.run()
+        self.frames += 1
+
+    def run(self, frames):
+        """Steps `frames` frames and returns the frame rate."""
+        start = time.time()
+        for i in xrange(frames):
+            self.step()
+        elapsed = time.time() - start
+        self.elapsed += elapsed
+        if elapsed == 0:
+            return float('inf')
+        return frames/elapsed
+
+def main(argv):
+    if len(argv) > 3 or (argv and argv[0] in ('-h', '--help')):
+        print USAGE
+        sys.exit()
+
+    player = DEFAULT_PLAYER
+    frames = DEFAULT_FRAMES
+    state = 'gamePlaying'
+    if len(argv) > 0:
+        player = argv[0]
+    if len(argv) > 1:
+        frames = int(argv[1])
+    if len(argv) > 2:
+        state = argv[2]
+    if state not in GAME_STATES:
+        print USAGE
+        sys.exit(2)
+
+    harness = Harness(player)
+    harness.setGameState(state)
+    rate = harness.run(frames)
+
+    print "%s: %d frames in %.3fs, %.1f frames/sec" % (
+        player, frames, harness.elapsed, rate)
+    harness.brain.frameTimer.dump()
+    harness.brain.scheduler.dump()
+    _importModule(PACKAGE + '.util.FrameCache').dump()
+    for fsa in (harness.brain.player, harness.brain.tracker, harness.brain.nav):
+        fsa.dumpHops()
+        fsa.dumpStats()
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,154 @@
+#!/usr/bin/python
+"""
+Replay.py - drives a headless Brain from a log written by util/Recorder
+
+Every recorded frame is loaded into the stand-in interface and run through
+the behaviors as fast as the CPU allows. Brain and its FSAs read a simulated
+clock set to the time each frame was recorded at, and random is seeded, so
+replaying the same log through the same code always gives the same
+commands. Each frame's outgoing messages (led, motion request, body and
+head commands, loc resets) are captured, and their digest makes a quick
+regression check between commits:
+
+    python Replay.py <log> [player] [commandsFile]
+
+The player defaults to the one that recorded the log. commandsFile, when
+given, gets the marshalled per-frame commands for a closer diff.
+"""
+import hashlib
+import marshal
+import random
+import sys
+import time
+from itertools import islice
+
+import Harness
+
+SEED = 0
+
+USAGE = "Usage: Replay.py <log> [player] [commandsFile]"
+
+class Replay(object):
+    """
+    Replays a recorded log through a Harness. After run(), self.commands
+    holds (frame index, {field : encoded message}) for every frame.
+    """
+    def __init__(self, path, player = None, teamNumber = None,
+                 playerNumber = None, messagesDir = None, seed = SEED):
+        # the recorder is part of the behaviors, so the stand-ins go first
+        Harness.install(player or Harness.DEFAULT_PLAYER, messagesDir)
+        self.Recorder = Harness._importModule(Harness.PACKAGE +
+                                              '.util.Recorder')
+        self.log = self.Recorder.FrameLog(path)
+        Clock = Harness._importModule(Harness.PACKAGE + '.util.Clock')
+
+        info = self.log.info
+        if player is None:
+            player = info.get('playerModule',
+                              Harness.DEFAULT_PLAYER).split('.')[-1]
+        if teamNumber is None:
+            teamNumber = info.get('team', Harness.TEAM_NUMBER)
+        if playerNumber is None:
+            playerNumber = info.get('player', Harness.PLAYER_NUMBER)
+        self.player = player
+
+        random.seed(seed)
+        # moved only by step(), to each frame's recorded time
+        self.clock = Clock.SimulatedClock(step = 0)
+        if len(self.log):
+            self.clock.set(self.log.frame(0)[1])
+        self.harness = Harness.Harness(player, teamNumber, playerNumber,
+                                       messagesDir, self.clock)
+        self.interface = self.harness.interface
+        self.brain = self.harness.brain
+
+        import interface
+        import protos
+        schemas = dict()
+        outputs = [(field, self.Recorder.describe(protos.registry[messageType],
+                                                  schemas))
+                   for field, messageType in interface.OUT_MESSAGES]
+        codecs = self.Recorder.compileSchemas(schemas)
+        self.outputs = [(field, codecs[typeName])
+                        for field, typeName in outputs]
+
+        self.commands = []
+        self.frames = 0
+        self.elapsed = 0.0
+
+    def step(self, frame):
+        """Runs one (index, time, values) frame from the log."""
+        index, frameTime, values = frame
+        self.clock.set(frameTime)
+        self.interface.prepareMessages()
+        self.log.load(values, self.interface)
+        self.brain.run()
+        self.frames += 1
+
+        outgoing = self.interface.outgoing()
+        encode = self.Recorder.encode
+        self.commands.append((index,
+                              dict((field, encode(outgoing[field], codec))
+                                   for field, codec in self.outputs
+                                   if field in outgoing)))
+
+    def run(self, frames = None):
+        """
+        Replays the log, or its first `frames` frames, and returns the
+        frame rate.
+        """
+        replayed = self.frames
+        start = time.time()
+        for frame in islice(self.log, frames):
+            self.step(frame)
+        elapsed = time.time() - start
+        self.elapsed += elapsed
+        replayed = self.frames - replayed
+        if elapsed == 0:
+            return float('inf')
+        return replayed/elapsed
+
+    def dumpCommands(self):
+        return marshal.dumps(self.commands)
+
+    def digest(self):
+        """Identifies the commands sent; equal digests mean equal runs."""
+        return hashlib.md5(self.dumpCommands()).hexdigest()
+
+    def close(self):
+        self.log.close()
+
+def main(argv):
+    if not argv or len(argv) > 3 or argv[0] in ('-h', '--help'):
+        print USAGE
+        sys.exit(not argv)
+
+    player = None
+    commandsFile = None
+    if len(argv) > 1:
+        player = argv[1]
+    if len(argv) > 2:
+        commandsFile = argv[2]
+
+    replay = Replay(argv[0], player)
+    rate = replay.run()
+    replay.close()
+
+    print "%s: %d frames in %.3fs, %.1f frames/sec" % (
+        replay.player, replay.frames, replay.elapsed, rate)
+    print "commands digest", replay.digest()
+    if commandsFile is not None:
+        f = open(commandsFile, 'wb')
+        try:
+            f.write(replay.dumpCommands())
+        finally:
+            f.close()
+    replay.brain.frameTimer.dump()
+    replay.brain.scheduler.dump()
+    Harness._importModule(Harness.PACKAGE + '.util.FrameCache').dump()
+    for fsa in (replay.brain.player, replay.brain.tracker, replay.brain.nav):
+        fsa.dumpHops()
+        fsa.dumpStats()
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
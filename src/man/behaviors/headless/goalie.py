@@ -0,0 +1,143 @@
+"""
+goalie.py - pure Python stand-in for the boost `goalie` module
+(GoalieSystem.cpp).
+"""
+import math
+from collections import deque
+
+import noggin_constants as Constants
+from objects import RelRobotLocation
+
+TO_RAD = math.pi/180.0
+TO_DEG = 180.0/math.pi
+
+POST_Q_LENGTH = 20
+CROSS_Q_LENGTH = 5
+
+RIGHT_X = Constants.FIELD_WHITE_LEFT_SIDELINE_X + Constants.LINE_CROSS_OFFSET
+RIGHT_Y = Constants.FIELD_WHITE_BOTTOM_SIDELINE_Y
+
+RIGHT_SIDE_LP_ANGLE = math.atan2(
+    RIGHT_X - Constants.LANDMARK_MY_GOAL_LEFT_POST_X,
+    Constants.LANDMARK_MY_GOAL_LEFT_POST_Y - RIGHT_Y)*TO_DEG
+RIGHT_SIDE_LP_DISTANCE = math.hypot(
+    RIGHT_X - Constants.LANDMARK_MY_GOAL_LEFT_POST_X,
+    Constants.LANDMARK_MY_GOAL_LEFT_POST_Y - RIGHT_Y)
+RIGHT_SIDE_RP_ANGLE = math.atan2(
+    RIGHT_X - Constants.LANDMARK_MY_GOAL_RIGHT_POST_X,
+    Constants.LANDMARK_MY_GOAL_RIGHT_POST_Y - RIGHT_Y)*TO_DEG
+RIGHT_SIDE_RP_DISTANCE = math.hypot(
+    RIGHT_X - Constants.LANDMARK_MY_GOAL_RIGHT_POST_X,
+    Constants.LANDMARK_MY_GOAL_RIGHT_POST_Y - RIGHT_Y)
+RIGHT_SIDE_ANGLE = (RIGHT_SIDE_LP_ANGLE + RIGHT_SIDE_RP_ANGLE)/2.0
+
+LEFT_SIDE_LP_ANGLE = -RIGHT_SIDE_RP_ANGLE
+LEFT_SIDE_RP_ANGLE = -RIGHT_SIDE_LP_ANGLE
+LEFT_SIDE_LP_DISTANCE = RIGHT_SIDE_RP_DISTANCE
+LEFT_SIDE_RP_DISTANCE = RIGHT_SIDE_LP_DISTANCE
+LEFT_SIDE_ANGLE = -RIGHT_SIDE_ANGLE
+
+def _average(values):
+    # float division by zero in C++ gives nan rather than raising
+    if not values:
+        return float('nan')
+    return sum(values)/float(len(values))
+
+class GoalieSystem(object):
+    def __init__(self):
+        self.home = RelRobotLocation(0, 0, 0)
+        self.rightPostBearings = deque()
+        self.rightPostDistances = deque()
+        self.leftPostBearings = deque()
+        self.leftPostDistances = deque()
+        self.crossBearings = deque()
+        self.crossDistances = deque()
+
+        self.pushRightPostObservation(0.0, 0.0)
+        self.pushLeftPostObservation(0.0, 0.0)
+        self.pushCrossObservation(0.0, 0.0)
+
+    def resetPosts(self, rightDistance, rightBearing,
+                   leftDistance, leftBearing):
+        self.rightPostBearings.clear()
+        self.rightPostDistances.clear()
+        self.leftPostBearings.clear()
+        self.leftPostDistances.clear()
+        self.pushRightPostObservation(rightDistance, rightBearing)
+        self.pushLeftPostObservation(leftDistance, leftBearing)
+
+    def resetCross(self, distance, bearing):
+        self.crossBearings.clear()
+        self.crossDistances.clear()
+        self.pushCrossObservation(distance, bearing)
+
+    def pushRightPostObservation(self, distance, bearing):
+        self.rightPostDistances.append(distance)
+        self.rightPostBearings.append(bearing)
+        if len(self.rightPostDistances) > POST_Q_LENGTH:
+            self.rightPostDistances.popleft()
+            self.rightPostBearings.popleft()
+
+    def pushLeftPostObservation(self, distance, bearing):
+        self.leftPostDistances.append(distance)
+        self.leftPostBearings.append(bearing)
+        if len(self.leftPostDistances) > POST_Q_LENGTH:
+            self.leftPostDistances.popleft()
+            self.leftPostBearings.popleft()
+
+    def pushCrossObservation(self, distance, bearing):
+        # Same as C++: both values go into the bearing queue
+        self.crossBearings.append(bearing)
+        self.crossBearings.append(distance)
+        if len(self.crossBearings) > CROSS_Q_LENGTH:
+            self.crossBearings.popleft()
+            if self.crossDistances:
+                self.crossDistances.popleft()
+
+    def leftPostBearing(self):
+        return _average(self.leftPostBearings)
+
+    def leftPostDistance(self):
+        return _average(self.leftPostDistances)
+
+    def rightPostBearing(self):
+        return _average(self.rightPostBearings)
+
+    def rightPostDistance(self):
+        return _average(self.rightPostDistances)
+
+    def crossBearing(self):
+        return _average(self.crossBearings)
+
+    def crossDistance(self):
+        return _average(self.crossDistances)
+
+    def leftPostRelX(self):
+        return self.leftPostDistance()*math.cos(self.leftPostBearing()*TO_RAD)
+
+    def leftPostRelY(self):
+        return self.leftPostDistance()*math.sin(self.leftPostBearing()*TO_RAD)
+
+    def rightPostRelX(self):
+        return self.rightPostDistance()*math.cos(self.rightPostBearing()*TO_RAD)
+
+    def rightPostRelY(self):
+        return self.rightPostDistance()*math.sin(self.rightPostBearing()*TO_RAD)
+
+    def crossRelX(self):
+        return self.crossDistance()*math.cos(self.crossBearing()*TO_RAD)
+
+    def crossRelY(self):
+        return self.crossDistance()*math.sin(self.crossBearing()*TO_RAD)
+
+    def centerGoalDistance(self):
+        return (self.leftPostDistance() + self.rightPostDistance())/2.0
+
+    def centerGoalBearing(self):
+        return (self.leftPostBearing() + self.rightPostBearing())/2.0
+
+    def centerGoalRelX(self):
+        return (self.leftPostRelX() + self.rightPostRelX())/2.0
+
+    def centerGoalRelY(self):
+        return (self.leftPostRelY() + self.rightPostRelY())/2.0
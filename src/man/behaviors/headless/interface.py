@@ -0,0 +1,64 @@
+"""
+interface.py - pure Python stand-in for the boost `interface` module
+
+Interface has the same fields as PyInterface. Incoming messages are plain
+message objects that whoever drives the Brain fills in between frames;
+outgoing messages are replaced with fresh ones by prepareMessages(), like
+BehaviorsModule::prepareMessages does before every call to Brain.run().
+"""
+import noggin_constants as Constants
+import protos
+
+# field : message type, in PyInterface order
+IN_MESSAGES = (('gameState', 'GameState'),
+               ('loc', 'RobotLocation'),
+               ('visionRobot', 'VisionRobot'),
+               ('visionField', 'VisionField'),
+               ('visionObstacle', 'VisionObstacle'),
+               ('filteredBall', 'FilteredBall'),
+               ('motionStatus', 'MotionStatus'),
+               ('odometry', 'RobotLocation'),
+               ('sonarState', 'SonarState'),
+               ('footBumperState', 'FootBumperState'),
+               ('joints', 'JointAngles'),
+               ('fallStatus', 'FallStatus'))
+
+OUT_MESSAGES = (('ledCommand', 'LedCommand'),
+                ('motionRequest', 'MotionRequest'),
+                ('bodyMotionCommand', 'MotionCommand'),
+                ('headMotionCommand', 'HeadMotionCommand'),
+                ('resetLocRequest', 'RobotLocation'))
+
+class Interface(object):
+    def __init__(self):
+        for field, messageType in IN_MESSAGES:
+            setattr(self, field, protos.registry[messageType]())
+        self.worldModels = [protos.registry['WorldModel']()
+                            for i in xrange(Constants.NUM_PLAYERS_PER_TEAM)]
+        self.prepareMessages()
+
+    def worldModelList(self):
+        return list(self.worldModels)
+
+    def prepareMessages(self):
+        """Gives Brain a fresh set of outgoing messages for the next frame."""
+        for field, messageType in OUT_MESSAGES:
+            setattr(self, field, protos.registry[messageType]())
+
+    def outgoing(self):
+        """
+        The outgoing messages that would be sent this frame: the led
+        command always, the others only once they carry a timestamp.
+        """
+        messages = dict()
+        for field, messageType in OUT_MESSAGES:
+            message = getattr(self, field)
+            if field == 'ledCommand' or message.timestamp != 0:
+                messages[field] = message
+        return messages
+
+# The module level instance Brain picks up, like the one BehaviorsModule
+# hands to the boost module
+if not protos.registry:
+    protos.install()
+interface = Interface()
@@ -0,0 +1,198 @@
+"""
+noggin_constants.py - pure Python stand-in for the boost noggin_constants
+module. Values follow PyConstants.cpp, PyNogginConstants.h and
+FieldConstants.h for the competition field (USING_LAB_FIELD off).
+"""
+
+class _Enum(object):
+    """Enough of a boost enum_ for comparisons and attribute access."""
+    def __init__(self, name, *values):
+        self.__name__ = name
+        self.names = dict()
+        self.values = dict()
+        for value, valueName in enumerate(values):
+            if valueName is None:
+                continue
+            setattr(self, valueName, value)
+            self.names[valueName] = value
+            self.values[value] = valueName
+
+# Switch board
+LOG_LOC = False
+
+# Walk time
+TIME_STEP = 40.0
+TIME_PER_STEP = TIME_STEP/1000.0
+
+# Team stuff
+NUM_PLAYERS_PER_TEAM = 4
+LENGTH_OF_HALF = 600
+NUM_GAME_TEAM_COLORS = 2
+
+teamColor = _Enum('teamColor', 'TEAM_BLUE', 'TEAM_RED')
+
+# Vision connection
+CAMERA_FPS = 15
+IMAGE_WIDTH = 320
+IMAGE_HEIGHT = 240
+IMAGE_CENTER_X = int(IMAGE_WIDTH/2.0)
+FOV_X_DEG = 60.9
+FOV_Y_DEG = 47.6
+IMAGE_ANGLE_X = IMAGE_WIDTH/FOV_X_DEG
+IMAGE_ANGLE_Y = IMAGE_WIDTH/FOV_Y_DEG
+
+# Ball
+NUM_TOTAL_BALL_VALUES = 27
+
+# Localization
+FIELD_WHITE_WIDTH = 900.0
+FIELD_WHITE_HEIGHT = 600.0
+GREEN_PAD_X = 63.0
+GREEN_PAD_Y = 65.0
+
+FIELD_GREEN_WIDTH = FIELD_WHITE_WIDTH + 2.0*GREEN_PAD_Y
+FIELD_GREEN_HEIGHT = FIELD_WHITE_HEIGHT + 2.0*GREEN_PAD_X
+FIELD_WIDTH = FIELD_GREEN_WIDTH
+FIELD_HEIGHT = FIELD_GREEN_HEIGHT
+
+CENTER_FIELD_X = FIELD_GREEN_WIDTH*0.5
+CENTER_FIELD_Y = FIELD_GREEN_HEIGHT*0.5
+
+FIELD_GREEN_LEFT_SIDELINE_X = 0.0
+FIELD_GREEN_RIGHT_SIDELINE_X = FIELD_GREEN_WIDTH
+FIELD_GREEN_BOTTOM_SIDELINE_Y = 0.0
+FIELD_GREEN_TOP_SIDELINE_Y = FIELD_GREEN_HEIGHT
+
+FIELD_WHITE_LEFT_SIDELINE_X = GREEN_PAD_X
+FIELD_WHITE_RIGHT_SIDELINE_X = FIELD_WHITE_WIDTH + GREEN_PAD_X
+FIELD_WHITE_BOTTOM_SIDELINE_Y = GREEN_PAD_Y
+FIELD_WHITE_TOP_SIDELINE_Y = FIELD_WHITE_HEIGHT + GREEN_PAD_Y
+
+MIDFIELD_X = FIELD_GREEN_WIDTH*0.5
+MIDFIELD_Y = FIELD_GREEN_HEIGHT*0.5
+
+OPP_GOAL_HEADING = 0.0
+MY_GOAL_HEADING = 180.0
+
+GOAL_POST_CM_HEIGHT = 90.0
+GOAL_POST_CM_WIDTH = 10.0
+CROSSBAR_CM_WIDTH = 150.0
+CROSSBAR_CM_HEIGHT = 10.0
+GOAL_POST_RADIUS = GOAL_POST_CM_WIDTH/2.0
+
+LANDMARK_MY_GOAL_LEFT_POST_X = FIELD_WHITE_LEFT_SIDELINE_X + GOAL_POST_RADIUS
+LANDMARK_MY_GOAL_RIGHT_POST_X = FIELD_WHITE_LEFT_SIDELINE_X + GOAL_POST_RADIUS
+LANDMARK_OPP_GOAL_LEFT_POST_X = FIELD_WHITE_RIGHT_SIDELINE_X - GOAL_POST_RADIUS
+LANDMARK_OPP_GOAL_RIGHT_POST_X = FIELD_WHITE_RIGHT_SIDELINE_X - GOAL_POST_RADIUS
+
+LANDMARK_MY_GOAL_LEFT_POST_Y = CENTER_FIELD_Y + CROSSBAR_CM_WIDTH/2.0
+LANDMARK_MY_GOAL_RIGHT_POST_Y = CENTER_FIELD_Y - CROSSBAR_CM_WIDTH/2.0
+LANDMARK_OPP_GOAL_RIGHT_POST_Y = CENTER_FIELD_Y - CROSSBAR_CM_WIDTH/2.0
+LANDMARK_OPP_GOAL_LEFT_POST_Y = CENTER_FIELD_Y + CROSSBAR_CM_WIDTH/2.0
+
+GOAL_WIDTH = LANDMARK_MY_GOAL_LEFT_POST_Y - LANDMARK_MY_GOAL_RIGHT_POST_Y
+
+CENTER_CIRCLE_RADIUS = 75.0
+
+GOALBOX_DEPTH = 60.0
+GOALBOX_WIDTH = 220.0
+
+OUTSIDE_GOALBOX_Y = MIDFIELD_Y - GOALBOX_WIDTH/2.0
+
+MY_GOALBOX_LEFT_X = GREEN_PAD_X
+MY_GOALBOX_RIGHT_X = GREEN_PAD_X + GOALBOX_DEPTH
+MY_GOALBOX_BOTTOM_Y = MIDFIELD_Y - GOALBOX_WIDTH/2.0
+MY_GOALBOX_TOP_Y = MIDFIELD_Y + GOALBOX_WIDTH/2.0
+MY_GOALBOX_MIDDLE_Y = (MY_GOALBOX_BOTTOM_Y + MY_GOALBOX_TOP_Y)/2.0
+
+OPP_GOALBOX_LEFT_X = FIELD_WHITE_RIGHT_SIDELINE_X - GOALBOX_DEPTH
+OPP_GOALBOX_RIGHT_X = FIELD_WHITE_RIGHT_SIDELINE_X
+OPP_GOALBOX_BOTTOM_Y = MIDFIELD_Y - GOALBOX_WIDTH/2.0
+OPP_GOALBOX_TOP_Y = MIDFIELD_Y + GOALBOX_WIDTH/2.0
+OPP_GOALBOX_MIDDLE_Y = (OPP_GOALBOX_BOTTOM_Y + OPP_GOALBOX_TOP_Y)/2.0
+# The C++ initializer uses the comma operator, so this is just the y
+OPP_GOAL_MIDPOINT = OPP_GOALBOX_MIDDLE_Y
+
+LINE_CROSS_OFFSET = 180.0
+
+NUM_LANDMARKS = 19
+
+landmarkID = _Enum('landmarkID',
+                   'LANDMARK_MY_GOAL_LEFT_POST_ID',
+                   'LANDMARK_MY_GOAL_RIGHT_POST_ID',
+                   'LANDMARK_OPP_GOAL_LEFT_POST_ID',
+                   'LANDMARK_OPP_GOAL_RIGHT_POST_ID',
+                   'LANDMARK_BALL_ID',
+                   'LANDMARK_MY_CORNER_LEFT_L_ID',
+                   'LANDMARK_MY_CORNER_RIGHT_L_ID',
+                   'LANDMARK_MY_GOAL_LEFT_T_ID',
+                   'LANDMARK_MY_GOAL_RIGHT_T_ID',
+                   'LANDMARK_MY_GOAL_LEFT_L_ID',
+                   'LANDMARK_MY_GOAL_RIGHT_L_ID',
+                   'LANDMARK_CENTER_LEFT_T_ID',
+                   'LANDMARK_CENTER_RIGHT_T_ID',
+                   'LANDMARK_OPP_CORNER_LEFT_L_ID',
+                   'LANDMARK_OPP_CORNER_RIGHT_L_ID',
+                   'LANDMARK_OPP_GOAL_LEFT_T_ID',
+                   'LANDMARK_OPP_GOAL_RIGHT_T_ID',
+                   'LANDMARK_OPP_GOAL_LEFT_L_ID',
+                   'LANDMARK_OPP_GOAL_RIGHT_L_ID')
+
+LANDMARK_MY_GOAL_LEFT_POST = (int(LANDMARK_MY_GOAL_LEFT_POST_X),
+                              int(LANDMARK_MY_GOAL_LEFT_POST_Y),
+                              landmarkID.LANDMARK_MY_GOAL_LEFT_POST_ID)
+LANDMARK_MY_GOAL_RIGHT_POST = (int(LANDMARK_MY_GOAL_RIGHT_POST_X),
+                               int(LANDMARK_MY_GOAL_RIGHT_POST_Y),
+                               landmarkID.LANDMARK_MY_GOAL_RIGHT_POST_ID)
+LANDMARK_OPP_GOAL_LEFT_POST = (int(LANDMARK_OPP_GOAL_LEFT_POST_X),
+                               int(LANDMARK_OPP_GOAL_LEFT_POST_Y),
+                               landmarkID.LANDMARK_OPP_GOAL_LEFT_POST_ID)
+LANDMARK_OPP_GOAL_RIGHT_POST = (int(LANDMARK_OPP_GOAL_RIGHT_POST_X),
+                                int(LANDMARK_OPP_GOAL_RIGHT_POST_Y),
+                                landmarkID.LANDMARK_OPP_GOAL_RIGHT_POST_ID)
+
+NUM_VIS_LANDMARKS = 6
+
+# DEFAULT is not wrapped
+vis_landmark = _Enum('vis_landmark', None,
+                     'VISION_YGLP', 'VISION_YGRP',
+                     'VISION_BGLP', 'VISION_BGRP',
+                     'VISION_BG_CROSSBAR', 'VISION_YG_CROSSBAR')
+
+LANDMARK_OPP_FIELD_CROSS = (int(FIELD_WHITE_RIGHT_SIDELINE_X -
+                                LINE_CROSS_OFFSET),
+                            int(MIDFIELD_Y))
+LANDMARK_MY_FIELD_CROSS = (int(FIELD_WHITE_LEFT_SIDELINE_X + LINE_CROSS_OFFSET),
+                           int(MIDFIELD_Y))
+
+NUM_LOC_SCORES = 3
+
+locScore = _Enum('locScore', 'BAD_LOC', 'OK_LOC', 'GOOD_LOC')
+
+GOOD_LOC_XY_UNCERT_THRESH = 50
+GOOD_LOC_THETA_UNCERT_THRESH = 20
+OK_LOC_XY_UNCERT_THRESH = 90
+OK_LOC_THETA_UNCERT_THRESH = 30
+BAD_LOC_XY_UNCERT_THRESH = 200
+BAD_LOC_THETA_UNCERT_THRESH = 40
+
+BLUE_GOALBOX_RIGHT_X = GREEN_PAD_X + GOALBOX_DEPTH
+YELLOW_GOALBOX_LEFT_X = FIELD_WHITE_RIGHT_SIDELINE_X - GOALBOX_DEPTH
+LANDMARK_BLUE_GOAL_CROSS_X = FIELD_WHITE_LEFT_SIDELINE_X + LINE_CROSS_OFFSET
+LANDMARK_YELLOW_GOAL_CROSS_X = FIELD_WHITE_RIGHT_SIDELINE_X - LINE_CROSS_OFFSET
+LANDMARK_BLUE_GOAL_TOP_POST_Y = CENTER_FIELD_Y + CROSSBAR_CM_WIDTH/2.0
+LANDMARK_BLUE_GOAL_BOTTOM_POST_Y = CENTER_FIELD_Y - CROSSBAR_CM_WIDTH/2.0
+HEADING_UP = 90.0
+HEADING_DOWN = -90.0
+HEADING_RIGHT = 0.0
+
+# Messages
+GAME_STATE_IN = 0
+FILTERED_BALL_IN = 1
+WORLD_MODEL_IN = 2
+
+# Robots
+NUM_POSSIBLE_ROBOTS = 6
+
+robotID = _Enum('robotID', 'RED_1', 'RED_2', 'RED_3',
+                'BLUE_1', 'BLUE_2', 'BLUE_3')
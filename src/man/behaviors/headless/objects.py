@@ -0,0 +1,191 @@
+"""
+objects.py - pure Python stand-in for the boost `objects` module
+
+Mirrors CombinationObjects.cpp, including its quirks, so behaviors make
+the same decisions here as on the robot. Headings are kept in radians and
+handed out in degrees, like the C++ classes.
+"""
+import math
+
+import noggin_constants as Constants
+
+TO_RAD = math.pi/180.0
+TO_DEG = 180.0/math.pi
+
+TOP_LIMIT = Constants.FIELD_HEIGHT*2.0/3.0
+BOTTOM_LIMIT = Constants.FIELD_HEIGHT/3.0
+BOX_BUFFER = 10
+
+def _sign(value):
+    if value > 0:
+        return 1.0
+    if value < 0:
+        return -1.0
+    return 0.0
+
+class Location(object):
+    INFINITE_DISTANCE = 10000000.0
+
+    def __init__(self, x, y):
+        self.x = float(x)
+        self.y = float(y)
+
+    def __eq__(self, other):
+        return self.x == other.x and self.y == other.y
+
+    def __ne__(self, other):
+        return self.x != other.x or self.y != other.y
+
+    def __sub__(self, other):
+        return RelLocation(self.x - other.x, self.y - other.y)
+
+    def relativeLocationOf(self, other):
+        return RelLocation(other.x - self.x, other.y - self.y)
+
+    def toTupleXY(self):
+        return (self.x, self.y)
+
+    def distTo(self, other):
+        if math.isinf(other.x) or math.isinf(other.y):
+            print "INFINITY DISTANCE"
+            return self.INFINITE_DISTANCE
+        return math.hypot(other.y - self.y, other.x - self.x)
+
+    def headingTo(self, other):
+        return math.atan2(other.y - self.y, other.x - self.x)*TO_DEG
+
+    def _headingToInRad(self, other):
+        return math.atan2(other.y - self.y, other.x - self.x)
+
+    def inOppGoalBox(self):
+        return (Constants.OPP_GOALBOX_LEFT_X - BOX_BUFFER < self.x and
+                Constants.OPP_GOALBOX_RIGHT_X + BOX_BUFFER > self.x and
+                Constants.OPP_GOALBOX_TOP_Y + BOX_BUFFER > self.y and
+                self.y > Constants.OPP_GOALBOX_BOTTOM_Y - BOX_BUFFER)
+
+    def inMyGoalBox(self):
+        return (self.x < Constants.MY_GOALBOX_RIGHT_X + BOX_BUFFER and
+                Constants.MY_GOALBOX_TOP_Y + BOX_BUFFER > self.y and
+                self.y > Constants.OPP_GOALBOX_BOTTOM_Y - BOX_BUFFER)
+
+    def inCenterOfField(self):
+        return TOP_LIMIT > self.y and self.y > BOTTOM_LIMIT
+
+    def inTopOfField(self):
+        return TOP_LIMIT < self.y
+
+    def inBottomOfField(self):
+        return BOTTOM_LIMIT > self.y
+
+    def __hasattr__(self, obj, attrName):
+        return hasattr(obj, attrName)
+
+    def __str__(self):
+        return "x = %s, y = %s" % (self.x, self.y)
+
+class RobotLocation(Location):
+    def __init__(self, x, y, h):
+        Location.__init__(self, x, y)
+        self._h = h*TO_RAD
+
+    def _getH(self):
+        return self._h*TO_DEG
+
+    def _setH(self, h):
+        self._h = h*TO_RAD
+
+    h = property(_getH, _setH)
+
+    def __eq__(self, other):
+        return (self.x == other.x and self.y == other.y and
+                getattr(other, '_h', None) == self._h)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __sub__(self, other):
+        return RelRobotLocation(self.x - other.x, self.y - other.y,
+                                (self._h - other._h)*TO_DEG)
+
+    def __add__(self, other):
+        # Same as C++: a heading in radians plus a relH in degrees, read back
+        # as degrees
+        return RobotLocation(self.x + other.relX, self.y + other.relY,
+                             self._h + other.relH)
+
+    def relativeRobotLocationOf(self, other):
+        dx = other.x - self.x
+        dy = other.y - self.y
+        sinh = math.sin(-self._h)
+        cosh = math.cos(-self._h)
+        return RelRobotLocation(cosh*dx - sinh*dy,
+                                sinh*dx + cosh*dy,
+                                (other._h - self._h)*TO_DEG)
+
+    def getRelativeBearing(self, other):
+        return (self._headingToInRad(other) - self._h)*TO_DEG
+
+    def spinDirToPoint(self, other):
+        return _sign(self.getRelativeBearing(other))
+
+    def __str__(self):
+        return "x = %s, y = %s, h = %s (in degrees)" % (self.x, self.y,
+                                                         self.h)
+
+class RelLocation(object):
+    def __init__(self, dx = 0.0, dy = 0.0):
+        self.relX = float(dx)
+        self.relY = float(dy)
+
+    @property
+    def bearing(self):
+        return math.atan2(self.relY, self.relX)*TO_DEG
+
+    @property
+    def dist(self):
+        return math.hypot(self.relY, self.relX)
+
+    def __str__(self):
+        return "relx = %s, rely = %s" % (self.relX, self.relY)
+
+class RelRobotLocation(RelLocation):
+    def __init__(self, dx = 0.0, dy = 0.0, dh = 0.0):
+        RelLocation.__init__(self, dx, dy)
+        self._relH = dh*TO_RAD
+
+    def _getRelH(self):
+        return self._relH*TO_DEG
+
+    def _setRelH(self, h):
+        self._relH = h*TO_RAD
+
+    relH = property(_getRelH, _setRelH)
+
+    def __sub__(self, other):
+        if isinstance(other, tuple):
+            return RelRobotLocation(self.relX - other[0],
+                                    self.relY - other[1],
+                                    self.relH - other[2])
+        # Same as C++: the radian difference is read as degrees
+        return RelRobotLocation(self.relX - other.relX,
+                                self.relY - other.relY,
+                                self._relH - other._relH)
+
+    def rotate(self, theta):
+        theta = theta*TO_RAD
+        sint = math.sin(theta)
+        cost = math.cos(theta)
+        self.relX, self.relY = (self.relX*cost - self.relY*sint,
+                                self.relX*sint + self.relY*cost)
+        self._relH += theta
+
+    def within(self, region):
+        if math.fabs(self._relH) > region[2]*TO_RAD:
+            return False
+        x = float(region[0])
+        y = float(region[1])
+        return (self.relX*self.relX)/(x*x) + (self.relY*self.relY)/(y*y) <= 1
+
+    def __str__(self):
+        return "relx = %s, rely = %s, relh = %s (in degrees)" % (
+            self.relX, self.relY, self.relH)
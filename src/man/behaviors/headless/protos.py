@@ -0,0 +1,346 @@
+"""
+protos.py - pure Python stand-ins for the boost wrapped *_proto modules
+
+Parses the .proto files in share/messages and builds message classes with
+the same surface the autowrap boost bindings give the behaviors:
+
+    single fields     msg.x, msg.has_x(), msg.clear_x()
+    repeated fields   msg.x(i), msg.x_size(), msg.add_x(), msg.clear_x()
+                      (plus msg.set_x(i, v) for repeated primitives)
+    enums             Msg.EnumName.VALUE and the exported Msg.VALUE
+
+Single message fields are created the first time they are touched, like
+the mutable_ accessors the bindings use. install() registers one module
+per proto file as sys.modules['<File>_proto'], with every message of the
+file under its package scope (e.g. PMotion_proto.messages.MotionCommand).
+"""
+import imp
+import os
+import re
+import sys
+
+MESSAGES_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__),
+                                             os.pardir, os.pardir, os.pardir,
+                                             'share', 'messages'))
+
+INT_TYPES = ('int32', 'int64', 'uint32', 'uint64', 'sint32', 'sint64',
+             'fixed32', 'fixed64', 'sfixed32', 'sfixed64')
+FLOAT_TYPES = ('float', 'double')
+STRING_TYPES = ('string', 'bytes')
+
+# Every message class by name; protos in this tree share one package
+registry = dict()
+
+_COMMENTS = re.compile(r'//[^\n]*|/\*.*?\*/', re.S)
+_TOKENS = re.compile(r'"[^"]*"|[-+]?[\w.]+|[{}\[\]=;]')
+
+class ProtoError(Exception):
+    pass
+
+class EnumDef(object):
+    def __init__(self, name):
+        self.name = name
+        self.values = []
+
+class FieldDef(object):
+    def __init__(self, label, type, name, number, default):
+        self.label = label
+        self.type = type
+        self.name = name
+        self.number = number
+        self.default = default
+
+class MessageDef(object):
+    def __init__(self, name):
+        self.name = name
+        self.fields = []
+        self.enums = []
+        self.messages = []
+
+class ProtoFile(object):
+    def __init__(self, path):
+        self.path = path
+        self.package = None
+        self.imports = []
+        self.messages = []
+        self.enums = []
+
+def _tokenize(text):
+    return _TOKENS.findall(_COMMENTS.sub('', text))
+
+class _Parser(object):
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.i = 0
+
+    def peek(self):
+        if self.i < len(self.tokens):
+            return self.tokens[self.i]
+        return None
+
+    def next(self):
+        token = self.peek()
+        if token is None:
+            raise ProtoError("unexpected end of file")
+        self.i += 1
+        return token
+
+    def expect(self, token):
+        got = self.next()
+        if got != token:
+            raise ProtoError("expected %r, got %r" % (token, got))
+
+    def skipStatement(self):
+        while self.next() != ';':
+            pass
+
+    def parseFile(self, protoFile):
+        while self.peek() is not None:
+            token = self.next()
+            if token == 'package':
+                protoFile.package = self.next()
+                self.expect(';')
+            elif token == 'import':
+                protoFile.imports.append(self.next().strip('"'))
+                self.expect(';')
+            elif token == 'message':
+                protoFile.messages.append(self.parseMessage())
+            elif token == 'enum':
+                protoFile.enums.append(self.parseEnum())
+            elif token == 'option':
+                self.skipStatement()
+            else:
+                raise ProtoError("unexpected %r" % token)
+
+    def parseEnum(self):
+        enum = EnumDef(self.next())
+        self.expect('{')
+        while self.peek() != '}':
+            name = self.next()
+            if name == 'option':
+                self.skipStatement()
+                continue
+            self.expect('=')
+            enum.values.append((name, int(self.next())))
+            self.expect(';')
+        self.expect('}')
+        return enum
+
+    def parseMessage(self):
+        message = MessageDef(self.next())
+        self.expect('{')
+        while self.peek() != '}':
+            token = self.next()
+            if token == 'enum':
+                message.enums.append(self.parseEnum())
+            elif token == 'message':
+                message.messages.append(self.parseMessage())
+            elif token in ('optional', 'required', 'repeated'):
+                message.fields.append(self.parseField(token))
+            elif token == 'option':
+                self.skipStatement()
+            else:
+                raise ProtoError("unexpected %r in message %s" %
+                                 (token, message.name))
+        self.expect('}')
+        return message
+
+    def parseField(self, label):
+        type = self.next()
+        name = self.next()
+        self.expect('=')
+        number = int(self.next())
+        default = None
+        if self.peek() == '[':
+            self.next()
+            while self.peek() != ']':
+                option = self.next()
+                self.expect('=')
+                value = self.next()
+                if option == 'default':
+                    default = value
+                if self.peek() == ',':
+                    self.next()
+            self.expect(']')
+        self.expect(';')
+        return FieldDef(label, type, name, number, default)
+
+def parse(path):
+    """Parses one .proto file into a ProtoFile."""
+    f = open(path)
+    try:
+        text = f.read()
+    finally:
+        f.close()
+    protoFile = ProtoFile(path)
+    try:
+        _Parser(_tokenize(text)).parseFile(protoFile)
+    except ProtoError, e:
+        raise ProtoError("%s: %s" % (path, e))
+    return protoFile
+
+##
+##--------------GENERATED CLASSES---------------##
+##
+
+class Message(object):
+    """
+    Base of the generated message classes. FIELDS holds the FieldDefs of
+    the message in declaration order.
+    """
+    FIELDS = ()
+
+    def __repr__(self):
+        return '<%s %s>' % (type(self).__name__, self.__dict__)
+
+def _makeEnum(enumDef):
+    attrs = dict(enumDef.values)
+    attrs['names'] = dict(enumDef.values)
+    attrs['values'] = dict((v, n) for n, v in enumDef.values)
+    return type(enumDef.name, (object,), attrs)
+
+def _primitiveDefault(field, enums):
+    if field.type in enums:
+        values = enums[field.type].values
+        if field.default is not None:
+            return dict(values)[field.default]
+        return values[0][1]
+    if field.type == 'bool':
+        return field.default == 'true'
+    if field.type in FLOAT_TYPES:
+        return float(field.default or 0)
+    if field.type in INT_TYPES:
+        return int(field.default or 0)
+    if field.type in STRING_TYPES:
+        return (field.default or '').strip('"')
+    return None
+
+class _MessageField(object):
+    """
+    Single message field. Builds the sub-message on first access and caches
+    it in the instance, so later reads are plain attribute lookups.
+    """
+    def __init__(self, name, type):
+        self.name = name
+        self.type = type
+
+    def __get__(self, obj, cls):
+        if obj is None:
+            return self
+        message = obj.__dict__[self.name] = registry[self.type]()
+        return message
+
+def _repeatedList(obj, key):
+    try:
+        return obj.__dict__[key]
+    except KeyError:
+        values = obj.__dict__[key] = []
+        return values
+
+def _addSingle(attrs, name):
+    def has(self):
+        return name in self.__dict__
+    def clear(self):
+        self.__dict__.pop(name, None)
+    attrs['has_' + name] = has
+    attrs['clear_' + name] = clear
+
+def _addRepeated(attrs, name, type, isMessage):
+    key = '_' + name
+
+    def get(self, i):
+        return _repeatedList(self, key)[i]
+    def size(self):
+        return len(self.__dict__.get(key, ()))
+    def clear(self):
+        self.__dict__.pop(key, None)
+
+    if isMessage:
+        def add(self):
+            message = registry[type]()
+            _repeatedList(self, key).append(message)
+            return message
+    else:
+        def add(self, value):
+            _repeatedList(self, key).append(value)
+        def set(self, i, value):
+            _repeatedList(self, key)[i] = value
+        attrs['set_' + name] = set
+
+    attrs[name] = get
+    attrs[name + '_size'] = size
+    attrs['add_' + name] = add
+    attrs['clear_' + name] = clear
+
+def _makeMessage(messageDef, outerEnums):
+    attrs = {'FIELDS' : tuple(messageDef.fields),
+             '__module__' : __name__}
+    enums = dict(outerEnums)
+    for enumDef in messageDef.enums:
+        enums[enumDef.name] = enumDef
+        attrs[enumDef.name] = _makeEnum(enumDef)
+        # enums are exported into the scope of their message
+        attrs.update(enumDef.values)
+
+    for nested in messageDef.messages:
+        attrs[nested.name] = _makeMessage(nested, enums)
+
+    for field in messageDef.fields:
+        default = _primitiveDefault(field, enums)
+        isMessage = (default is None)
+        if field.label == 'repeated':
+            _addRepeated(attrs, field.name, field.type, isMessage)
+            continue
+        if isMessage:
+            attrs[field.name] = _MessageField(field.name, field.type)
+        else:
+            attrs[field.name] = default
+        _addSingle(attrs, field.name)
+
+    cls = type(messageDef.name, (Message,), attrs)
+    registry[messageDef.name] = cls
+    return cls
+
+def load(path):
+    """
+    Builds the message classes of one .proto file and returns them as a
+    '<File>_proto' module, without registering it in sys.modules.
+    """
+    protoFile = parse(path)
+    name = os.path.splitext(os.path.basename(path))[0] + '_proto'
+    module = imp.new_module(name)
+    module.__file__ = path
+
+    scope = module
+    if protoFile.package is not None:
+        for part in protoFile.package.split('.'):
+            inner = type(part, (object,), {})
+            setattr(scope, part, inner)
+            scope = inner
+
+    enums = dict()
+    for enumDef in protoFile.enums:
+        enums[enumDef.name] = enumDef
+        setattr(scope, enumDef.name, _makeEnum(enumDef))
+        for valueName, value in enumDef.values:
+            setattr(scope, valueName, value)
+    for messageDef in protoFile.messages:
+        setattr(scope, messageDef.name, _makeMessage(messageDef, enums))
+    return module
+
+def install(messagesDir = MESSAGES_DIR):
+    """
+    Loads every .proto file in messagesDir and registers the modules in
+    sys.modules, where `import GameState_proto` will find them. Returns
+    the list of module names.
+    """
+    if not os.path.isdir(messagesDir):
+        raise ProtoError("no message definitions in " + messagesDir)
+    names = []
+    for fileName in sorted(os.listdir(messagesDir)):
+        if not fileName.endswith('.proto'):
+            continue
+        module = load(os.path.join(messagesDir, fileName))
+        sys.modules[module.__name__] = module
+        names.append(module.__name__)
+    return names
@@ -1,3 +1,4 @@
+from ..util import Log
 import kicks
 import objects as Objects
 import noggin_constants as constants
@@ -7,6 +8,8 @@ DEBUG_KICK_DECISION = False
 USE_LOC = False
 USE_LOC_HALF_FIELD = False
 
+log = Log.getLogger('KickDecider')
+
 class KickInformation:
     """
     Class to hold all the things we need to decide a kick
@@ -138,9 +141,9 @@ class KickInformation:
 
         if DEBUG_KICK_DECISION:
             if seenPostPair:
-                print "Already seen a pair of near posts: abort pan."
+                log.info("Already seen a pair of near posts: abort pan.")
             if nearPostAndDangerous:
-                print "Already seen a post, and heard dangerous ball: abort pan."
+                log.info("Already seen a post, and heard dangerous ball: abort pan.")
 
         return (seenPostPair or nearPostAndDangerous)
 
@@ -152,10 +155,12 @@ class KickInformation:
             return
 
         if DEBUG_KICK_DECISION:
-            print "Total far goal sightings (sum both posts): ",\
-                len(self.farGoalLeftPostBearings)+len(self.farGoalRightPostBearings)
-            print "Total near goal sightings (sum both posts): ",\
-                len(self.nearGoalLeftPostBearings)+len(self.nearGoalRightPostBearings)
+            log.info("Total far goal sightings (sum both posts): %d",
+                     len(self.farGoalLeftPostBearings) +
+                     len(self.farGoalRightPostBearings))
+            log.info("Total near goal sightings (sum both posts): %d",
+                     len(self.nearGoalLeftPostBearings) +
+                     len(self.nearGoalRightPostBearings))
 
         # bearing averages
         # Need more than 4 frames of each post to consider it "real".
@@ -201,8 +206,8 @@ class KickInformation:
             self.nearAvgPostDist = self.nearRightPostDist
 
         if DEBUG_KICK_DECISION:
-            print "near reds: ",self.nearGoalieRed
-            print "near navys: ",self.nearGoalieNavy
+            log.info("near reds: %s", self.nearGoalieRed)
+            log.info("near navys: %s", self.nearGoalieNavy)
 
         # Determine visual dangerous goalie
         # Note that the values should be double the sightings:
@@ -235,7 +240,7 @@ class KickInformation:
         kick = None
 
         if DEBUG_KICK_DECISION:
-            print "In method shoot."
+            log.info("In method shoot.")
 
         # Is loc GOOD_ENOUGH for a kick decision?
         # Need to use aimCenter in decision.
@@ -243,7 +248,7 @@ class KickInformation:
 
             if DEBUG_KICK_DECISION:
                 #print "loc Score is good. Using it to decide kick."
-                print "Flag is set: using loc for decision."
+                log.info("Flag is set: using loc for decision.")
 
             relLocationBallToGoal = self.brain.ball.loc.relativeLocationOf(Objects.Location(constants.FIELD_WHITE_RIGHT_SIDELINE_X,constants.CENTER_FIELD_Y))
             bearingBallToGoal = relLocationBallToGoal.bearing
@@ -280,9 +285,9 @@ class KickInformation:
 
         # Loc is bad- use only visual information to choose a kick.
         if DEBUG_KICK_DECISION:
-            print "Using vision for kick decision."
-            print "Dangerous ball count: ",self.dangerousBallCount
-            print "Own goalie in near goal? ",self.nearGoalieOwn
+            log.info("Using vision for kick decision.")
+            log.info("Dangerous ball count: %s", self.dangerousBallCount)
+            log.info("Own goalie in near goal? %s", self.nearGoalieOwn)
 
         # Determine which goal to aim at
         if self.farAvgPostDist != 0 and self.nearAvgPostDist != 0:
@@ -307,13 +312,13 @@ class KickInformation:
                 # Can only see our own goal: Use goalie to make decision
                 if self.dangerousBallCount > 5:
                     if DEBUG_KICK_DECISION:
-                        print "Doing a goalie based clearing kick."
+                        log.info("Doing a goalie based clearing kick.")
                     return self.goalieBasedKick()
 
                 # Saw two posts: use them to triangulate.
                 if self.nearRightPostBearing != 0 and self.nearLeftPostBearing != 0:
                     if DEBUG_KICK_DECISION:
-                        print "Saw two own posts. Triangulating and clearing."
+                        log.info("Saw two own posts. Triangulating and clearing.")
                     return self.triangulateClearKick()
 
                 # Saw one post: oh god, what now?
@@ -337,12 +342,12 @@ class KickInformation:
             return kick
 
         if DEBUG_KICK_DECISION:
-            print "farRightPostBearing: ",self.farRightPostBearing
-            print "farLeftPostBearing: ",self.farLeftPostBearing
-            print "nearRightPostBearing: ",self.nearRightPostBearing
-            print "nearLeftPostBearing: ",self.nearLeftPostBearing
-            print "rightPostBearing: ",rightPostBearing
-            print "leftPostBearing:  ",leftPostBearing
+            log.info("farRightPostBearing: %s", self.farRightPostBearing)
+            log.info("farLeftPostBearing: %s", self.farLeftPostBearing)
+            log.info("nearRightPostBearing: %s", self.nearRightPostBearing)
+            log.info("nearLeftPostBearing: %s", self.nearLeftPostBearing)
+            log.info("rightPostBearing: %s", rightPostBearing)
+            log.info("leftPostBearing:  %s", leftPostBearing)
 
         if rightPostBearing == 0 and leftPostBearing == 0:
             # Can't see any posts: orbit.
@@ -370,8 +375,8 @@ class KickInformation:
             leftScorePoint = rightScorePoint + 10
 
         if DEBUG_KICK_DECISION:
-            print "rightScorePoint: ",rightScorePoint
-            print "leftScorePoint:  ",leftScorePoint
+            log.info("rightScorePoint: %s", rightScorePoint)
+            log.info("leftScorePoint:  %s", leftScorePoint)
 
         # If any kick is currently valid, choose that kick.
         # Note: this ignores the aimCenter distinction.
@@ -396,7 +401,7 @@ class KickInformation:
         avgScorePoint = int((rightScorePoint + leftScorePoint) * .5)
 
         if DEBUG_KICK_DECISION:
-            print "Didn't choose a 0 heading kick.\navgScorePoint: ",avgScorePoint
+            log.info("Didn't choose a 0 heading kick.\navgScorePoint: %s", avgScorePoint)
 
         if rightScorePoint > 70:
                 # Quadrant 2
@@ -460,7 +465,7 @@ class KickInformation:
             return kick
 
         if DEBUG_KICK_DECISION:
-            print "Somehow got to end without a kick..."
+            log.info("Somehow got to end without a kick...")
 
         # If all else fails, orbit and re-decide.
         # Note: this case should already be covered above,
@@ -522,8 +527,8 @@ class KickInformation:
         # Assert: I have my global heading and coordinates of the ball.
 
         if DEBUG_KICK_DECISION:
-            print "myGlobalHeading: ",myGlobalHeading
-            print "ballY: ",ballY
+            log.info("myGlobalHeading: %s", myGlobalHeading)
+            log.info("ballY: %s", ballY)
 
         # Determine which kick I should do.
         if myGlobalHeading < -135 or myGlobalHeading > 135:
@@ -1,3 +1,4 @@
+from ..util import Log
 import kicks
 import KickInformation
 import KickingConstants as constants
@@ -5,6 +6,8 @@ import noggin_constants as NogginConstants
 from ..playbook import PBConstants
 from objects import RelRobotLocation
 
+log = Log.getLogger('KickDecider')
+
 class KickDecider(object):
     """
     Uses current info gathered by KickInformation to determine the
@@ -31,7 +34,7 @@ class KickDecider(object):
         """
         sets a particular kick
         """
-        print "set kick"
+        log.info("set kick")
         self.info.kick = k
 
     def getIdealKickPosition(self):
@@ -69,15 +72,15 @@ class KickDecider(object):
 
         # if there are too few players on the field to do a side kick pass.
         if smallTeam:
-            print "Kickoff Alone!"
+            log.info("Kickoff Alone!")
             self.setKick(self.info.chooseShortQuickKick())
         # do a side kick pass depending on where the offender is.
         elif self.brain.playbook.pb.kickoffFormation == 0:
             self.setKick(kicks.RIGHT_SIDE_KICK)
-            print "Kickoff RIGHT_SIDE_KICK"
+            log.info("Kickoff RIGHT_SIDE_KICK")
         else:
             self.setKick(kicks.LEFT_SIDE_KICK)
-            print "Kickoff LEFT_SIDE_KICK"
+            log.info("Kickoff LEFT_SIDE_KICK")
 
     def decideKick(self):
         """
@@ -93,9 +96,9 @@ class KickDecider(object):
 
         # Check localization to make sure it's good enough.
         if self.brain.my.locScore == NogginConstants.locScore.BAD_LOC:
-            print "BAD_LOC!"
-            print "Uncertainty: ", self.brain.loc.xUncert, self.brain.loc.yUncert,\
-                self.brain.loc.hUncert
+            log.info("BAD_LOC!")
+            log.info("Uncertainty: %s %s %s", self.brain.loc.xUncert,
+                     self.brain.loc.yUncert, self.brain.loc.hUncert)
             self.info.kick = kicks.ORBIT_KICK_POSITION
             return
 
@@ -123,9 +126,9 @@ class KickDecider(object):
                 self.info.kick.isBackKick():
             self.info.kick = kicks.ORBIT_KICK_POSITION
 
-        print "I'm at position " + str(self.brain.my)
+        log.info("I'm at position " + str(self.brain.my))
 
-        print "Chose: {0}".format(self.info.kick)
+        log.info("Chose: %s", str(self.info.kick))
 
     def score(self):
         """
@@ -196,41 +199,41 @@ class KickDecider(object):
               my.headingTo(oppRightPost, forceCalc = True)):
             return self.chooseShortBackKick()
         elif (my.h > 0):
-            print "LEFT_SIDE"
+            log.info("LEFT_SIDE")
             return kicks.LEFT_SIDE_KICK
         else:
-            print "RIGHT_SIDE"
+            log.info("RIGHT_SIDE")
             return kicks.RIGHT_SIDE_KICK
         """
 
     def chooseDynamicKick(self):
         ball = self.brain.ball
         if ball.loc.relY >= 0:
-            print "LEFT_DYNAMIC_STRAIGHT"
+            log.info("LEFT_DYNAMIC_STRAIGHT")
             return kicks.LEFT_STRAIGHT_KICK
-        print "RIGHT_DYNAMIC_STRAIGHT"
+        log.info("RIGHT_DYNAMIC_STRAIGHT")
         return kicks.RIGHT_STRAIGHT_KICK
 
     def chooseLongBackKick(self):
         ball = self.brain.ball
         if ball.loc.relY > 0:
-            print "LEFT_LONG_BACK"
+            log.info("LEFT_LONG_BACK")
             return kicks.LEFT_LONG_BACK_KICK
-        print "RIGHT_LONG_BACK"
+        log.info("RIGHT_LONG_BACK")
         return kicks.RIGHT_LONG_BACK_KICK
 
     def chooseShortBackKick(self):
         ball = self.brain.ball
         if ball.loc.relY > 0:
-            print "LEFT_SHORT_BACK"
+            log.info("LEFT_SHORT_BACK")
             return kicks.LEFT_SHORT_BACK_KICK
-        print "RIGHT_SHORT_BACK"
+        log.info("RIGHT_SHORT_BACK")
         return kicks.RIGHT_SHORT_BACK_KICK
 
     def chooseShortQuickKick(self):
         ball = self.brain.ball
         if ball.loc.relY > 0:
-            print "SHORT_QUICK_LEFT"
+            log.info("SHORT_QUICK_LEFT")
             return kicks.LEFT_SHORT_STRAIGHT_KICK
-        print "SHORT_QUICK_RIGHT"
+        log.info("SHORT_QUICK_RIGHT")
         return kicks.RIGHT_SHORT_STRAIGHT_KICK
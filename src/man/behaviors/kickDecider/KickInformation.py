@@ -2,6 +2,7 @@ import kicks
 import KickingConstants as constants
 import noggin_constants as NogginConstants
 from objects import Location
+from ..util import Geometry
 from ..util import MyMath
 from math import fabs
 """
@@ -154,12 +155,15 @@ class KickInformation:
         bestHeading = -1.
         bestDest = None
 
-        for dest in dests:
+        myHeadingToBall = my.headingTo(ball.loc)
+        ballHeadings = Geometry.pairwiseHeadings(
+            ((ball.loc.x, ball.loc.y),), [(dest.x, dest.y) for dest in dests])[0]
+
+        for dest, ballHeading in zip(dests, ballHeadings):
             # Don't need to sub180Angle here because we mod. I know it looks
             # wierd and suspiciously complicated, but it makes for an easy
             # compare and I promise I unit tested it. -- Wils (7/1/11)
-            heading = (fabs(((ball.loc.headingTo(dest) - my.headingTo(ball.loc))
-                             % 90) - 45))
+            heading = (fabs(((ballHeading - myHeadingToBall) % 90) - 45))
 
             if heading > bestHeading:
                 bestHeading = heading
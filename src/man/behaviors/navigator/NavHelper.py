@@ -178,4 +178,4 @@ def executeMove(nav, sweetMove):
             command.timestamp = int(nav.brain.time * 1000)
 
         else:
-            print("What kind of sweet ass-Move is this?")
+            nav.printf("What kind of sweet ass-Move is this?")
@@ -11,15 +11,19 @@ DEBUG = False
 def scriptedMove(nav):
     '''State that we stay in while doing sweet moves'''
     if nav.firstFrame():
-        helper.executeMove(nav, scriptedMove.sweetMove)
+        helper.executeMove(nav, nav.stateData.scriptedMove.sweetMove)
         return nav.stay()
 
-    if not nav.brain.interface.motionStatus.body_is_active:
+    if not nav.brain.world.motion.body_is_active:
         return nav.goNow('stopped')
 
     return nav.stay()
 
-scriptedMove.sweetMove = None
+class ScriptedMoveData(object):
+    __slots__ = ('sweetMove',)
+
+    def __init__(self):
+        self.sweetMove = None
 
 def goToPosition(nav):
     """
@@ -29,21 +33,22 @@ def goToPosition(nav):
     Absolute locations get transformed to relative locations based on current loc
     For relative locations we use our bearing to that point as the heading
     """
-    relDest = helper.getRelativeDestination(nav.brain.loc, goToPosition.dest)
-    goToPosition.deltaDest = relDest # cache it for later use
+    data = nav.stateData.goToPosition
+    relDest = helper.getRelativeDestination(nav.brain.loc, data.dest)
+    data.deltaDest = relDest # cache it for later use
 
 #    if nav.counter % 10 is 0:
 #        print "going to " + str(relDest)
 #        print "ball is at {0}, {1}, {2} ".format(nav.brain.ball.loc.relX,
 #                                                 nav.brain.ball.loc.relY,
 #                                                 nav.brain.ball.loc.bearing)
-    if goToPosition.adaptive and relDest.relX >= 0:
+    if data.adaptive and relDest.relX >= 0:
         #reduce the speed if we're close to the target
         speed = helper.adaptSpeed(relDest.dist,
                                  constants.ADAPT_DISTANCE,
-                                 goToPosition.speed)
+                                 data.speed)
     else:
-        speed = goToPosition.speed
+        speed = data.speed
 
 #    print "distance {0} and speed {1}".format(relDest.dist, speed)
 
@@ -56,11 +61,17 @@ def goToPosition(nav):
 
     return Transition.getNextState(nav, goToPosition)
 
-goToPosition.speed = "speed gain from 0 to 1"
-goToPosition.dest = "destination, can be any type of location"
-goToPosition.deltaDest = "how much we have left to travel to location (or rel destination)"
-goToPosition.adaptive = "adapts the speed to the distance of the destination"
-goToPosition.precision = "how precise we want to be in moving"
+class GoToPositionData(object):
+    __slots__ = ('speed', 'dest', 'deltaDest', 'adaptive', 'precision',
+                 'avoidObstacles')
+
+    def __init__(self):
+        self.speed = None     # speed gain from 0 to 1
+        self.dest = None      # destination, can be any type of location
+        self.deltaDest = None # how much we have left to travel to location (or rel destination)
+        self.adaptive = False # adapts the speed to the distance of the destination
+        self.precision = None # how precise we want to be in moving
+        self.avoidObstacles = False
 
 def avoidLeft(nav):
     if nav.firstFrame():
@@ -95,18 +106,26 @@ def walkingTo(nav):
         helper.stand(nav)
         return nav.stay()
 
-    if nav.brain.interface.motionStatus.standing:
-        if len(walkingTo.destQueue) > 0:
-            dest = walkingTo.destQueue.popleft()
-            helper.setOdometryDestination(nav, dest, walkingTo.speed)
+    if nav.brain.world.motion.standing:
+        data = nav.stateData.walkingTo
+        if len(data.destQueue) > 0:
+            dest = data.destQueue.popleft()
+            helper.setOdometryDestination(nav, dest, data.speed)
             return nav.stay()
         else:
             return nav.goNow('standing')
 
     return nav.stay()
 
-walkingTo.destQueue = deque()
-walkingTo.speed = 0
+class WalkingToData(object):
+    __slots__ = ('destQueue', 'speed', 'dest', 'deltaDest', 'precision')
+
+    def __init__(self):
+        self.destQueue = deque()
+        self.speed = 0
+        self.dest = None
+        self.deltaDest = None
+        self.precision = None
 
 # State to be used with standard setSpeed movement
 def walking(nav):
@@ -114,16 +133,20 @@ def walking(nav):
     State to be used when setSpeed is called
     """
 
-    if ((walking.speeds != walking.lastSpeeds)
-        or not nav.brain.interface.motionStatus.walk_is_active):
-        helper.setSpeed(nav, walking.speeds)
-    walking.lastSpeeds = walking.speeds
+    data = nav.stateData.walking
+    if ((data.speeds != data.lastSpeeds)
+        or not nav.brain.world.motion.walk_is_active):
+        helper.setSpeed(nav, data.speeds)
+    data.lastSpeeds = data.speeds
 
     return Transition.getNextState(nav, walking)
 
-walking.speeds = constants.ZERO_SPEEDS     # current walking speeds
-walking.lastSpeeds = constants.ZERO_SPEEDS # useful for knowing if speeds changed
-walking.transitions = {}
+class WalkingData(object):
+    __slots__ = ('speeds', 'lastSpeeds')
+
+    def __init__(self):
+        self.speeds = constants.ZERO_SPEEDS     # current walking speeds
+        self.lastSpeeds = constants.ZERO_SPEEDS # useful for knowing if speeds changed
 
 ### Stopping States ###
 def stopped(nav):
@@ -149,7 +172,7 @@ def stand(nav):
         helper.stand(nav)
         return nav.stay()
 
-    if not nav.brain.interface.motionStatus.walk_is_active:
+    if not nav.brain.world.motion.walk_is_active:
         return nav.goNow('standing')
 
     return nav.stay()
@@ -159,3 +182,9 @@ def standing(nav):
     Complete walk standstill
     """
     return nav.stay()
+
+# Each navigator's data for the states above, see FSA.StateData
+STATE_DATA = {'scriptedMove' : ScriptedMoveData,
+              'goToPosition' : GoToPositionData,
+              'walkingTo' : WalkingToData,
+              'walking' : WalkingData}
@@ -1,7 +1,6 @@
 from math import fabs, hypot
 from . import NavConstants as constants
-import NavStates as states
-from ..util import MyMath
+from ..util import FieldIndex
 import noggin_constants as NogginConstants
 from ..players import ChaseBallTransitions
 from . import NavHelper as helper
@@ -14,27 +13,28 @@ def atDestination(nav):
     Takes into account loc uncertainty to check if we're at least close to
     the destination according to our belief
     """
-    relDest = helper.getRelativeDestination(nav.brain.loc, states.goToPosition.dest)
+    data = nav.stateData.goToPosition
+    relDest = helper.getRelativeDestination(nav.brain.loc, data.dest)
     my = nav.brain.loc
-    (x, y, h) = states.goToPosition.precision
+    (x, y, h) = data.precision
 
-    if (not helper.isDestinationRelative(states.goToPosition.dest)):
+    if (not helper.isDestinationRelative(data.dest)):
         # HACK HACK '30's below should be loc uncerts.
         return relDest.within((x + 30, y + 30, h + 30))
     else:
         return relDest.within((x, y, h))
 
 def shouldDodgeLeft(nav):
-    if not states.goToPosition.avoidObstacles:
+    if not nav.stateData.goToPosition.avoidObstacles:
         return False
 
     # check sonars
-    sonarState = nav.brain.interface.sonarState
-    sonars = (sonarState.us_right != -1 and
-              sonarState.us_right < constants.AVOID_OBSTACLE_SIDE_DIST)
+    world = nav.brain.world
+    sonars = (world.sonarRight != -1 and
+              world.sonarRight < constants.AVOID_OBSTACLE_SIDE_DIST)
 
     #check vision
-    vision = nav.brain.interface.visionObstacle.on_right
+    vision = world.obstacleOnRight
 
     #check feet
 #    footBumperState = nav.brain.interface.footBumperState
@@ -54,15 +54,15 @@ def shouldDodgeLeft(nav):
         return False
 
 def shouldDodgeRight(nav):
-    if not states.goToPosition.avoidObstacles:
+    if not nav.stateData.goToPosition.avoidObstacles:
         return False
 
     # check sonars
-    sonarState = nav.brain.interface.sonarState
-    sonars = (sonarState.us_left != -1 and
-              sonarState.us_left < constants.AVOID_OBSTACLE_SIDE_DIST)
+    world = nav.brain.world
+    sonars = (world.sonarLeft != -1 and
+              world.sonarLeft < constants.AVOID_OBSTACLE_SIDE_DIST)
     #check vision
-    vision = nav.brain.interface.visionObstacle.on_left
+    vision = world.obstacleOnLeft
 
     #check feet
 #    footBumperState = nav.brain.interface.footBumperState
@@ -82,15 +82,15 @@ def shouldDodgeRight(nav):
         return False
 
 def doneDodging(nav):
-    return nav.brain.interface.motionStatus.standing
+    return nav.brain.world.motion.standing
 
 def notAtLocPosition(nav):
     return not atDestination(nav)
 
 def walkedEnough(nav):
-    deltaDest = states.walkingTo.deltaDest
-    dest = states.walkingTo.dest
-    precision = states.walkingTo.precision
+    deltaDest = nav.stateData.walkingTo.deltaDest
+    dest = nav.stateData.walkingTo.dest
+    precision = nav.stateData.walkingTo.precision
 
     #check if we've "passed" the point we were supposed to go to
     #with odometry
@@ -121,21 +121,7 @@ def shouldChaseAroundBox(my, ball):
         if ball.y > NogginConstants.MY_GOALBOX_TOP_Y:
             return False
 
-    # handle more complex cases where correct behavior isn't obvious
-    intersect = MyMath.linesIntersect
-
-    return ( intersect( my.x, my.y, ball.x, ball.y, # BOTTOM_GOALBOX_LINE
-                        NogginConstants.MY_GOALBOX_LEFT_X,
-                        NogginConstants.MY_GOALBOX_BOTTOM_Y,
-                        NogginConstants.MY_GOALBOX_RIGHT_X,
-                        NogginConstants.MY_GOALBOX_BOTTOM_Y) or
-             intersect( my.x, my.y, ball.x, ball.y, # LEFT_GOALBOX_LINE
-                        NogginConstants.MY_GOALBOX_RIGHT_X,
-                        NogginConstants.MY_GOALBOX_TOP_Y,
-                        NogginConstants.MY_GOALBOX_RIGHT_X,
-                        NogginConstants.MY_GOALBOX_BOTTOM_Y) or
-             intersect( my.x, my.y, ball.x, ball.y, # BOTTOM_GOALBOX_LINE
-                        NogginConstants.MY_GOALBOX_LEFT_X,
-                        NogginConstants.MY_GOALBOX_TOP_Y,
-                        NogginConstants.MY_GOALBOX_RIGHT_X,
-                        NogginConstants.MY_GOALBOX_TOP_Y) )
+    # handle more complex cases where correct behavior isn't obvious:
+    # whether the way to the ball crosses the goalbox's top, bottom or front
+    return FieldIndex.field().segmentHits(my.x, my.y, ball.x, ball.y,
+                                          (FieldIndex.MY_GOALBOX,))
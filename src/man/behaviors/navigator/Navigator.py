@@ -32,6 +32,37 @@ RIGHT = -LEFT
 
 DEBUG_DESTINATION = False
 
+# Each state's transitions, checked in this order; see Transition
+TRANSITIONS = (
+    (NavStates.goToPosition, (
+        (navTrans.atDestination,
+         Transition.MOST_OF_THE_TIME, Transition.OK_PRECISION,
+         NavStates.atPosition),
+
+        (navTrans.shouldDodgeLeft,
+         Transition.MOST_OF_THE_TIME, Transition.LOW_PRECISION,
+         NavStates.avoidLeft),
+
+        (navTrans.shouldDodgeRight,
+         Transition.MOST_OF_THE_TIME, Transition.LOW_PRECISION,
+         NavStates.avoidRight))),
+
+    (NavStates.avoidLeft, (
+        (navTrans.doneDodging,
+         Transition.ALL_OF_THE_TIME, Transition.INSTANT,
+         NavStates.briefStand),)),
+
+    (NavStates.avoidRight, (
+        (navTrans.doneDodging,
+         Transition.ALL_OF_THE_TIME, Transition.INSTANT,
+         NavStates.briefStand),)),
+
+    (NavStates.atPosition, (
+        (navTrans.notAtLocPosition,
+         Transition.SOME_OF_THE_TIME, Transition.LOW_PRECISION,
+         NavStates.goToPosition),)),
+    )
+
 class Navigator(FSA.FSA):
     """it gets you where you want to go"""
 
@@ -44,44 +75,7 @@ class Navigator(FSA.FSA):
         self.setPrintStateChanges(True)
         self.stateChangeColor = 'cyan'
 
-        #transitions
-        #@todo: move this to the actual transitions file?
-        self.atLocPositionTransition = Transition.CountTransition(navTrans.atDestination)
-        self.locRepositionTransition = Transition.CountTransition(navTrans.notAtLocPosition,
-                                                                  Transition.SOME_OF_THE_TIME,
-                                                                  Transition.LOW_PRECISION)
-
-        NavStates.goToPosition.transitions = {
-            self.atLocPositionTransition : NavStates.atPosition,
-
-            Transition.CountTransition(navTrans.shouldDodgeLeft,
-                                       Transition.MOST_OF_THE_TIME,
-                                       Transition.LOW_PRECISION)
-            : NavStates.avoidLeft,
-
-            Transition.CountTransition(navTrans.shouldDodgeRight,
-                                       Transition.MOST_OF_THE_TIME,
-                                       Transition.LOW_PRECISION)
-            : NavStates.avoidRight
-            }
-
-        NavStates.avoidLeft.transitions = {
-            Transition.CountTransition(navTrans.doneDodging,
-                                       Transition.ALL_OF_THE_TIME,
-                                       Transition.INSTANT)
-            : NavStates.briefStand
-            }
-
-        NavStates.avoidRight.transitions = {
-            Transition.CountTransition(navTrans.doneDodging,
-                                       Transition.ALL_OF_THE_TIME,
-                                       Transition.INSTANT)
-            : NavStates.briefStand
-            }
-
-        NavStates.atPosition.transitions = {
-            self.locRepositionTransition : NavStates.goToPosition
-            }
+        self.addTransitions(TRANSITIONS)
 
     def run(self):
         FSA.FSA.run(self)
@@ -90,7 +84,7 @@ class Navigator(FSA.FSA):
         """
         Navigator function to do the sweet move
         """
-        NavStates.scriptedMove.sweetMove = move
+        self.stateData.scriptedMove.sweetMove = move
         self.switchTo('scriptedMove')
 
     def positionPlaybook(self):
@@ -129,18 +123,18 @@ class Navigator(FSA.FSA):
         """
 
         self.updateDest(dest, speed)
-        NavStates.goToPosition.precision = precision
-        NavStates.goToPosition.avoidObstacles = avoidObstacles
-        NavStates.goToPosition.adaptive = adaptive
+        self.stateData.goToPosition.precision = precision
+        self.stateData.goToPosition.avoidObstacles = avoidObstacles
+        self.stateData.goToPosition.adaptive = adaptive
 
         if self.currentState is not 'goToPosition':
             self.switchTo('goToPosition')
 
     def updateDest(self, dest, speed = KEEP_SAME_SPEED):
         """  Update the destination we're headed to   """
-        NavStates.goToPosition.dest = dest
+        self.stateData.goToPosition.dest = dest
         if speed is not KEEP_SAME_SPEED:
-            NavStates.goToPosition.speed = speed
+            self.stateData.goToPosition.speed = speed
 
     def walkTo(self, walkToDest, speed = FULL_SPEED):
         """
@@ -156,10 +150,10 @@ class Navigator(FSA.FSA):
         if not isinstance(walkToDest, RelRobotLocation):
             raise TypeError, "walkToDest must be a RelRobotLocation"
 
-        NavStates.walkingTo.destQueue.clear()
+        self.stateData.walkingTo.destQueue.clear()
 
-        NavStates.walkingTo.destQueue.append(walkToDest)
-        NavStates.walkingTo.speed = speed
+        self.stateData.walkingTo.destQueue.append(walkToDest)
+        self.stateData.walkingTo.speed = speed
 
         #reset the counter to make sure walkingTo.firstFrame() is true on entrance
         #in case we were in walkingTo before as well
@@ -183,19 +177,20 @@ class Navigator(FSA.FSA):
         when I test it out)
         """
 
-        NavStates.walkingTo.destQueue.clear()
+        destQueue = self.stateData.walkingTo.destQueue
+        destQueue.clear()
 
         #@todo: make this a bit nicer or figure out a better way to do it
         # split it up in 15 degree moves; good enough approximation for small radii
         for k in range(0, abs(angle) / 15):
             if angle > 0:
-                NavStates.walkingTo.destQueue.append(RelRobotLocation(0.0, radius / 6, 0.0))
-                NavStates.walkingTo.destQueue.append(RelRobotLocation(0.0, 0.0, -15))
+                destQueue.append(RelRobotLocation(0.0, radius / 6, 0.0))
+                destQueue.append(RelRobotLocation(0.0, 0.0, -15))
             else:
-                NavStates.walkingTo.destQueue.append(RelRobotLocation(0.0, -radius / 6, 0.0))
-                NavStates.walkingTo.destQueue.append(RelRobotLocation(0.0, 0.0, 15))
+                destQueue.append(RelRobotLocation(0.0, -radius / 6, 0.0))
+                destQueue.append(RelRobotLocation(0.0, 0.0, 15))
 
-        NavStates.walkingTo.speed = FAST_SPEED
+        self.stateData.walkingTo.speed = FAST_SPEED
         self.switchTo('walkingTo')
         #self.walkTo(helper.getOrbitLocation(radius, angle), speed)
         #self.walk(0, .75, -.5)
@@ -207,7 +202,7 @@ class Navigator(FSA.FSA):
         Does nothing if it is the same as the current walk
         Switches to it otherwise
         """
-        NavStates.walking.speeds = (x, y, theta)
+        self.stateData.walking.speeds = (x, y, theta)
         self.switchTo('walking')
 
     def stand(self):
@@ -233,25 +228,25 @@ class Navigator(FSA.FSA):
         #@todo: put in a threshold since a relative destination
         # will never  have heading 0; I don't know how important that is
         if self.currentState is 'goToPosition':
-            if NavStates.goToPosition.deltaDest.relH > 0:
+            if self.stateData.goToPosition.deltaDest.relH > 0:
                 return LEFT
-            elif NavStates.goToPosition.deltaDest.relH < 0:
+            elif self.stateData.goToPosition.deltaDest.relH < 0:
                 return RIGHT
             else:
                 return 0
 
         if self.currentState is 'walkingTo':
-            if NavStates.walkingTo.deltaDest.relH > 0:
+            if self.stateData.walkingTo.deltaDest.relH > 0:
                 return LEFT
-            elif NavStates.walkingTo.deltaDest.relH < 0:
+            elif self.stateData.walkingTo.deltaDest.relH < 0:
                 return RIGHT
             else:
                 return 0
 
         if self.currentState is 'walking':
-            if NavStates.walking.speeds[2] > 0:
+            if self.stateData.walking.speeds[2] > 0:
                 return LEFT
-            elif NavStates.walking.speeds[2] < 0:
+            elif self.stateData.walking.speeds[2] < 0:
                 return RIGHT
             else:
                 return 0
@@ -1,19 +1,15 @@
 from math import (hypot, atan2, cos, sin, acos, asin)
+from ..util import Log
+from ..util import Geometry
 from ..util import MyMath
 from . import PBConstants
 from . import Strategies
 import noggin_constants as NogginConstants
-import time
-
-# ANSI terminal color codes
-# http://pueblo.sourceforge.net/doc/manual/ansi_color_codes.html
-RESET_COLORS_CODE = '\033[0m'
-RED_COLOR_CODE = '\033[31m'
-GREEN_COLOR_CODE = '\033[32m'
-YELLOW_COLOR_CODE = '\033[33m'
-BLUE_COLOR_CODE = '\033[34m'
-PURPLE_COLOR_CODE = '\033[35m'
-CYAN_COLOR_CODE = '\033[36m'
+
+# The positions bots 2, 3 and 4 take, by index, in each of the 6 ways to
+# fill three positions; the first of equally short ones is chosen
+THREE_POSITION_CHOICES = ((0, 1, 2), (1, 2, 0), (2, 0, 1),
+                          (1, 0, 2), (2, 1, 0), (0, 2, 1))
 
 class GoTeam:
     """This is the class which controls all of our coordinated
@@ -22,7 +18,7 @@ class GoTeam:
     def __init__(self, brain):
         self.brain = brain
         self.printStateChanges = True
-        self.time = time.time()
+        self.time = self.brain.time
 
         # Information about teammates
         #self.position = []
@@ -53,10 +49,10 @@ class GoTeam:
 
     def run(self, play):
         """We run this each frame to get the latest info"""
-        if self.brain.interface.gameState.state != 'gamePenalized':
+        if self.brain.world.gameState != 'gamePenalized':
             self.aPrioriTeammateUpdate()
 
-        if self.brain.interface.gameState.state == 'gameReady':
+        if self.brain.world.gameState == 'gameReady':
             # Change which wing is forward based on the opponents score
             # TODO: implement this
             pass
@@ -72,7 +68,7 @@ class GoTeam:
         creates a play, picks the strategy to run, returns the play after
         it is modified by Strategies
         """
-        currentGCState = self.brain.interface.gameState.state
+        currentGCState = self.brain.world.gameState
         # We don't control anything in initial or finished
         if (currentGCState == 'gameInitial' or
             currentGCState == 'gameFinished'):
@@ -263,14 +259,10 @@ class GoTeam:
 
         # if we have two positions only two possibilites of positions
         elif len(positions) == 2:
-            myDist1 = hypot(positions[0].toTupleXY()[0] - self.brain.my.x,
-                            positions[0].toTupleXY()[1] - self.brain.my.y)
-            myDist2 = hypot(positions[1].toTupleXY()[0] - self.brain.my.x,
-                            positions[1].toTupleXY()[1] - self.brain.my.y)
-            mateDist1 = hypot(positions[0].toTupleXY()[0] - mates[0].x,
-                              positions[0].toTupleXY()[1] - mates[0].y)
-            mateDist2 = hypot(positions[1].toTupleXY()[0] - mates[0].x,
-                              positions[1].toTupleXY()[1] - mates[0].y)
+            ((myDist1, myDist2), (mateDist1, mateDist2)) = \
+                Geometry.pairwiseDistances(
+                ((self.brain.my.x, self.brain.my.y), (mates[0].x, mates[0].y)),
+                [p.toTupleXY() for p in positions])
 
             # Subrole hysteresis prevention does tie-breaking for us.
             # May need role hysteresis prevention.
@@ -285,58 +277,33 @@ class GoTeam:
                 return positions[1]
 
         # We have three positions
-        # Pseudo 2d array to hold the 3 bots dists to the 3 positions
         elif len(positions) == 3:
-            bot2, bot3, bot4 = [], [], []
-            bot_distances = [bot2,bot3,bot4]
-
-            # get distances from every bot every possible position
-            for i,bot in enumerate(bot_distances):
-                bot_number = i+2
-                x, y = 0.0, 0.0
-                # use either my estimate or teammates'
+            # where bots 2, 3 and 4 are, using either my estimate or
+            # teammates'
+            bots = []
+            for bot_number in (2, 3, 4):
                 if bot_number == self.me.playerNumber:
-                    x = self.brain.my.x
-                    y = self.brain.my.y
+                    bots.append((self.brain.my.x, self.brain.my.y))
                 else:
-                    x = self.mates[bot_number-1].x
-                    y = self.mates[bot_number-1].y
-
-                for p in positions:
-                    bot.append([hypot(p[0] - x, p[1] - y), p])
-
-            # bot1, bot2, bot3 are now 2D arrays of size 3x2.
-            # the first arg corresponds to which position the bot is picking
-            # and the second arg is the dist(0) which is calculated above
-            # or the actual Location(1) which is also an [x,y] array.
-
-            # 6 possible weights and positions
-            distances = [ (bot2[0][0] + bot3[1][0] + bot4[2][0],  # dist sum,
-                           bot2[0][1],  bot3[1][1],  bot4[2][1]), # positions
-                          (bot2[1][0] + bot3[2][0] + bot4[0][0],  # dist sum,
-                           bot2[1][1],  bot3[2][1],  bot4[0][1]), # positions
-                          (bot2[2][0] + bot3[0][0] + bot4[1][0],  # .
-                           bot2[2][1],  bot3[0][1],  bot4[1][1]), # .
-                          (bot2[1][0] + bot3[0][0] + bot4[2][0],  # .
-                           bot2[1][1],  bot3[0][1],  bot4[2][1]), # .
-                          (bot2[2][0] + bot3[1][0] + bot4[0][0],  # .
-                           bot2[2][1],  bot3[1][1],  bot4[0][1]), # .
-                          (bot2[0][0] + bot3[2][0] + bot4[1][0],  # dist sum,
-                           bot2[0][1],  bot3[2][1],  bot4[1][1])] # positions
+                    mate = self.mates[bot_number-1]
+                    bots.append((mate.x, mate.y))
+
+            # distances[bot][position] for every bot and possible position
+            distances = Geometry.pairwiseDistances(
+                bots, [(p[0], p[1]) for p in positions])
 
             # We must find the least weight choice from the 6 possibilities
             min_dist = NogginConstants.FIELD_WIDTH*3
             chosenPositions = None
-            for i,d in enumerate(distances):
-                if d[0] < min_dist:
-                    min_dist = d[0]
-                    chosenPositions = d
+            for choice in THREE_POSITION_CHOICES:
+                dist = sum(distances[bot][position]
+                           for bot, position in enumerate(choice))
+                if dist < min_dist:
+                    min_dist = dist
+                    chosenPositions = choice
 
-            # chosen Postitions is an array of size 4
-            #where 1,2,3 are the positions
-
-            # returns a Location
-            return chosenPositions[self.me.playerNumber -1]
+            # bot 2 is the first of chosenPositions
+            return positions[chosenPositions[self.me.playerNumber - 2]]
 
 
 
@@ -349,7 +316,7 @@ class GoTeam:
         before running a new frame"""
 
         # update my own information for role switching
-        self.time = time.time()
+        self.time = self.brain.time
         self.me.updateMe()
 
         # loop through teammates
@@ -568,19 +535,9 @@ class GoTeam:
 #############################################################################
 
     def printf(self, outputString, printingColor='purple'):
-        """FSA print function that allows colors to be specified"""
-        if printingColor == 'red':
-            print RED_COLOR_CODE + str(outputString) + RESET_COLORS_CODE
-        elif printingColor == 'blue':
-            print BLUE_COLOR_CODE + str(outputString) + RESET_COLORS_CODE
-        elif printingColor == 'yellow':
-            print YELLOW_COLOR_CODE + str(outputString) + RESET_COLORS_CODE
-        elif printingColor == 'cyan':
-            print CYAN_COLOR_CODE + str(outputString) + RESET_COLORS_CODE
-        elif printingColor == 'purple':
-            print PURPLE_COLOR_CODE + str(outputString) + RESET_COLORS_CODE
-        else:
-            print(str(outputString))
+        """Print function that allows colors to be specified; see util/Log"""
+        Log.getLogger('GoTeam').log(Log.INFO, str(outputString),
+                                    color = printingColor)
 
 
     # Reset counters for role transitions
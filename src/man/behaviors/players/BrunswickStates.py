@@ -85,7 +85,7 @@ def gameSet(player):
 
         if (player.brain.playerNumber == 4 and
             player.brain.gameController.ownKickOff):
-            print "Setting Kickoff to True"
+            player.printf("Setting Kickoff to True")
             player.shouldKickOff = True
         else:
             player.shouldKickOff = False
@@ -108,7 +108,7 @@ def gamePlaying(player):
         player.brain.nav.stand()
         player.brain.tracker.trackBall()
         if player.lastDiffState == 'gamePenalized':
-            print 'Player coming out of penalized state after ' + str(player.lastStateTime) + ' seconds in last state'
+            player.printf('Player coming out of penalized state after ' + str(player.lastStateTime) + ' seconds in last state')
             #HACK
             #if player.lastStateTime > 5:
             #    player.brain.resetLocalizationFromPenalty()
@@ -68,14 +68,15 @@ def approachBall(player):
         return player.stay()
 
 def prepareForKick(player):
+    data = player.stateData.prepareForKick
     if player.firstFrame():
-        prepareForKick.hackKick = hackKick.KickInformation(player.brain)
+        data.hackKick = hackKick.KickInformation(player.brain)
         player.orbitDistance = player.brain.ball.distance
-        player.brain.tracker.performKickPan(prepareForKick.hackKick.shouldKickPanRight())
+        player.brain.tracker.performKickPan(data.hackKick.shouldKickPanRight())
         player.brain.nav.stand()
         return player.stay()
 
-    prepareForKick.hackKick.collectData()
+    data.hackKick.collectData()
 
     if player.brain.ball.distance > 40:
         # Ball has moved away. Go get it!
@@ -88,17 +89,23 @@ def prepareForKick(player):
 
     # If hackKickInfo has enough information already, prematurely end pan and kick.
     if player.brain.tracker.isStopped() or \
-            prepareForKick.hackKick.hasEnoughInformation():
-        prepareForKick.hackKick.calculateDataAverages()
+            data.hackKick.hasEnoughInformation():
+        data.hackKick.calculateDataAverages()
         if hackKick.DEBUG_KICK_DECISION:
-            print str(prepareForKick.hackKick)
-        player.kick = prepareForKick.hackKick.shoot()
+            player.printf(str(data.hackKick))
+        player.kick = data.hackKick.shoot()
         if hackKick.DEBUG_KICK_DECISION:
-            print str(player.kick)
+            player.printf(str(player.kick))
         return player.goNow('orbitBall')
 
     return player.stay()
 
+class PrepareForKickData(object):
+    __slots__ = ('hackKick',)
+
+    def __init__(self):
+        self.hackKick = None
+
 def orbitBall(player):
     """
     State to orbit the ball
@@ -106,7 +113,7 @@ def orbitBall(player):
     if player.firstFrame():
 
         if hackKick.DEBUG_KICK_DECISION:
-            print "Orbiting at angle: ",player.kick.h
+            player.printf("Orbiting at angle: " + str(player.kick.h))
 
         if player.kick.h == 0:
             return player.goNow('positionForKick')
@@ -140,35 +147,42 @@ def positionForKick(player):
         player.inKickingState = False
         return player.goLater('chase')
 
+    data = player.stateData.positionForKick
     ball = player.brain.ball
     kick_pos = player.kick.getPosition()
-    positionForKick.kickPose = RelRobotLocation(ball.rel_x - kick_pos[0],
-                                                ball.rel_y - kick_pos[1],
-                                                0)
+    data.kickPose = RelRobotLocation(ball.rel_x - kick_pos[0],
+                                     ball.rel_y - kick_pos[1],
+                                     0)
 
     #only enque the new goTo destination once
     if player.firstFrame():
         # Safer when coming from orbit in 1 frame. Still works otherwise, too.
         player.brain.tracker.lookStraightThenTrack()
-        player.brain.nav.goTo(positionForKick.kickPose,
+        player.brain.nav.goTo(data.kickPose,
                               Navigator.PRECISELY,
                               Navigator.GRADUAL_SPEED,
                               False,
                               Navigator.ADAPTIVE)
     else:
-        player.brain.nav.updateDest(positionForKick.kickPose)
+        player.brain.nav.updateDest(data.kickPose)
 
     if transitions.shouldFindBallKick(player) and player.counter > 15:
         player.inKickingState = False
         return player.goLater('chase')
 
-    if (transitions.ballInPosition(player, positionForKick.kickPose) or
+    if (transitions.ballInPosition(player, data.kickPose) or
         player.brain.nav.isAtPosition()):
         player.brain.nav.stand()
         return player.goNow('kickBallExecute')
 
     return player.stay()
 
+class PositionForKickData(object):
+    __slots__ = ('kickPose',)
+
+    def __init__(self):
+        self.kickPose = None
+
 def lookAround(player):
     """
     Nav is stopped. We want to look around to get better loc.
@@ -186,9 +200,13 @@ def lookAround(player):
             player.brain.tracker.trackBall()
             player.brain.kickDecider.decideKick()
             if transitions.shouldOrbit(player) and not player.penaltyKicking:
-                print "Don't have a kick, orbitting"
+                player.printf("Don't have a kick, orbitting")
                 return player.goNow('orbitBall')
             else:
                 return player.goLater('chase')
 
     return player.stay()
+
+# Each player's data for the states above, see FSA.StateData
+STATE_DATA = {'prepareForKick' : PrepareForKickData,
+              'positionForKick' : PositionForKickData}
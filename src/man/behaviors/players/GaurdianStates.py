@@ -66,7 +66,7 @@ def gamePlaying(player):
 
     # Came from penalized? Fell recently? Become a chaser!
     if player.lastDiffState == 'gamePenalized':
-        print "become a chaser!" #/* ** */ ADD CHASER CODE
+        player.printf("become a chaser!") #/* ** */ ADD CHASER CODE
 
     return player.goLater('gaurd')
 
@@ -82,7 +82,7 @@ def gaurd(player):
     if (yglpVis.on and yglpVis.distance < 200) or \
             (ygrpVis.on and ygrpVis.distance < 200):
         # Goals are close: become a full fledged chaser!
-        print "become a chaser!" #/* ** */ ADD CHASER CODE
+        player.printf("become a chaser!") #/* ** */ ADD CHASER CODE
 
     # Is the ball nearby? Omni approach it.
     if player.brain.ball.vis.frames_on > 4 and \
@@ -129,11 +129,11 @@ def omniPositionForKick(player):
     if (0 < position.relX < constants.BALL_X_OFFSET and
             position.relY < constants.BALL_Y_OFFSET and
             position.relH < constants.GOOD_ENOUGH_H):
-        print "kicking!" # KICK IT!!!$@%&!!
+        player.printf("kicking!") # KICK IT!!!$@%&!!
         player.brain.nav.stop()
         player.executeMove(SweetMoves.LEFT_BIG_KICK) #check this @!
     else:
-        print "orbiting!" # ORBIT
+        player.printf("orbiting!") # ORBIT
 
     return player.stay()
 
@@ -39,9 +39,9 @@ def goalieSave(player):
         brain.tracker.stopHeadMoves()
         brain.fallController.enableFallProtection(False)
         if TESTING:
-            print "Saving because"
-            print  "Ball.relVelX is" + str(ball.loc.relVelX)
-            print  "And Ball.heat is" + str(ball.vis.heat)
+            player.printf("Saving because")
+            player.printf("Ball.relVelX is" + str(ball.loc.relVelX))
+            player.printf("And Ball.heat is" + str(ball.vis.heat))
             if helper.shouldSaveRight(player):
                 return player.goNow('testSaveRight')
             elif helper.shouldSaveLeft(player):
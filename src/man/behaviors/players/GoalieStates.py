@@ -1,8 +1,6 @@
-import time
 from objects import RelRobotLocation
 from ..navigator import Navigator as nav
 from ..util import Transition
-import VisualGoalieStates as VisualStates
 from .. import SweetMoves
 from goalie import GoalieSystem, RIGHT_SIDE_ANGLE, LEFT_SIDE_ANGLE
 from GoalieConstants import RIGHT, LEFT
@@ -113,19 +111,20 @@ def kickBall(player):
     """
     if player.firstFrame():
         # save odometry if this was your first kick
+        returnToGoal = player.stateData.returnToGoal
         if player.lastDiffState == 'clearIt':
-            VisualStates.returnToGoal.kickPose = \
-                RelRobotLocation(player.brain.interface.odometry.x,
-                                 player.brain.interface.odometry.y,
-                                 player.brain.interface.odometry.h)
+            returnToGoal.kickPose = \
+                RelRobotLocation(player.brain.world.odometryX,
+                                 player.brain.world.odometryY,
+                                 player.brain.world.odometryH)
         #otherwise add to previously saved odo
         else:
-            VisualStates.returnToGoal.kickPose.relX += \
-                player.brain.interface.odometry.x
-            VisualStates.returnToGoal.kickPose.relY += \
-                player.brain.interface.odometry.y
-            VisualStates.returnToGoal.kickPose.relH += \
-                player.brain.interface.odometry.h
+            returnToGoal.kickPose.relX += \
+                player.brain.world.odometryX
+            returnToGoal.kickPose.relY += \
+                player.brain.world.odometryY
+            returnToGoal.kickPose.relH += \
+                player.brain.world.odometryH
 
         player.brain.tracker.trackBall()
 
@@ -143,11 +142,11 @@ def saveIt(player):
         player.isSaving = False
         #player.brain.fallController.enableFallProtection(False)
     if (not player.motion.isBodyActive() and not player.isSaving):
-        player.squatTime = time.time()
+        player.squatTime = player.brain.time
         player.isSaving = True
         return player.stay()
     if player.isSaving:
-        stopTime = time.time()
+        stopTime = player.brain.time
         # This is to stand up before a penalty is called.
         if (stopTime - player.squatTime > 2):
             player.executeMove(SweetMoves.GOALIE_SQUAT_STAND_UP)
@@ -6,8 +6,8 @@
 
 import GoalieConstants as goalCon
 from math import fabs
-import VisualGoalieStates
 from objects import RelRobotLocation
+from ..util import FrameCache
 
 # Visual Goalie
 
@@ -26,7 +26,7 @@ def atGoalArea(player):
     Checks if robot is close enough to the field edge to be at the goal.
     """
     #magic number
-    return player.brain.interface.visionField.visual_field_edge.distance_m < 110.0
+    return player.brain.world.fieldEdgeMiddle < 110.0
 
 def ballIsInMyWay(player):
     """
@@ -38,33 +38,29 @@ def ballIsInMyWay(player):
     return (fabs(player.brain.ball.rel_y < 20.0 and
                  player.brain.ball.rel_x < 30.0))
 
+@FrameCache.perFrame
 def foundACorner(player):
     """
-    Loops through corners to find a visible goalbox corner.
+    Loops through corners to find a visible goalbox corner, and keeps it
+    for centerAtGoalBasedOnCorners. That only depends on the frame's
+    corners, so a cached call leaves the same corner kept.
     """
-    vision = player.brain.interface.visionField
-    if vision.visual_corner_size() == 0:
+    corners = player.brain.world.corners
+    if not corners:
         return False
 
-    for i in range(0, vision.visual_corner_size()):
-        for j in range(0, vision.visual_corner(i).poss_id_size()):
-            if (vision.visual_corner(i).poss_id(j) ==
-                vision.visual_corner(i).corner_id.YELLOW_GOAL_LEFT_L):
-                if (vision.visual_corner(i).orientation < 0 and
-                    vision.visual_corner(i).visual_detection.bearing > 0):
-                    VisualGoalieStates.centerAtGoalBasedOnCorners.cornerID = \
-                        vision.visual_corner(i).corner_id.YELLOW_GOAL_LEFT_L
-                    VisualGoalieStates.centerAtGoalBasedOnCorners.cornerDirection = \
-                        vision.visual_corner(i).visual_detection.bearing
+    center = player.stateData.centerAtGoalBasedOnCorners
+    for corner in corners:
+        for cornerId in corner.poss_id:
+            if cornerId == corner.corner_id.YELLOW_GOAL_LEFT_L:
+                if corner.orientation < 0 and corner.bearing > 0:
+                    center.cornerID = corner.corner_id.YELLOW_GOAL_LEFT_L
+                    center.cornerDirection = corner.bearing
                     return True
-            if (vision.visual_corner(i).poss_id(j) ==
-                vision.visual_corner(i).corner_id.YELLOW_GOAL_RIGHT_L):
-                if(vision.visual_corner(i).orientation > 0 and
-                   vision.visual_corner(i).visual_detection.bearing < 0):
-                    VisualGoalieStates.centerAtGoalBasedOnCorners.cornerID = \
-                        vision.visual_corner(i).corner_id.YELLOW_GOAL_RIGHT_L
-                    VisualGoalieStates.centerAtGoalBasedOnCorners.cornerDirection = \
-                        vision.visual_corner(i).visual_detection.bearing
+            if cornerId == corner.corner_id.YELLOW_GOAL_RIGHT_L:
+                if corner.orientation > 0 and corner.bearing < 0:
+                    center.cornerID = corner.corner_id.YELLOW_GOAL_RIGHT_L
+                    center.cornerDirection = corner.bearing
                     return True
 
         return False
@@ -99,10 +95,10 @@ def facingForward(player):
     if it is in the goal.
     """
     #magic numbers
-    vision = player.brain.interface.visionField
-    return (vision.visual_field_edge.distance_m > 800.0
-            or(fabs(vision.visual_cross.bearing) < 10.0 and
-               vision.visual_cross.distance > 0.0))
+    world = player.brain.world
+    return (world.fieldEdgeMiddle > 800.0
+            or(fabs(world.crossBearing) < 10.0 and
+               world.crossDistance > 0.0))
 
 def facingBall(player):
     """
@@ -117,13 +113,10 @@ def onThisSideline(player):
     Looks for a T corner or far goals to determine which sideline it's
     standing on.
     """
-    vision = player.brain.interface.visionField
-    for i in range(0, vision.visual_corner_size()):
-        for j in range(0, vision.visual_corner(i).poss_id_size()):
-            if ((vision.visual_corner(i).poss_id(j) ==
-                 vision.visual_corner(i).corner_id.CENTER_TOP_T) or
-                (vision.visual_corner(i).poss_id(j) ==
-                 vision.visual_corner(i).corner_id.CENTER_BOTTOM_T)):
+    for corner in player.brain.world.corners:
+        for cornerId in corner.poss_id:
+            if (cornerId == corner.corner_id.CENTER_TOP_T or
+                cornerId == corner.corner_id.CENTER_BOTTOM_T):
               return True
     return ((player.brain.ygrp.on and
              #magic numbers
@@ -169,18 +162,6 @@ def shouldClearBall(player):
     """
     Checks that the ball is more or less in the goal box.
     """
-    # less than 1.5 minutes left or winning/losing badly
-    shouldBeAggressive = (player.brain.game.secs_remaining < 90 or
-                          (abs(player.brain.game.team(0).score -
-                               player.brain.game.team(1).score) > 1))
-
-    if shouldBeAggressive and not player.aggressive:
-        print "The goalie is now AGGRESSIVE"
-        player.aggressive = True
-    elif not shouldBeAggressive and player.aggressive:
-        print "The goalie is no longer AGGRESSIVE"
-        player.aggressive = False
-
     # ball must be visible
     if not player.brain.ball.vis.on:
         return False
@@ -230,8 +211,8 @@ def walkedTooFar(player):
     if player.aggressive:
         return False
 
-    return (player.brain.interface.odometry.x > 90.0 or
-            fabs(player.brain.interface.odometry.y) > 140.0)
+    return (player.brain.world.odometryX > 90.0 or
+            fabs(player.brain.world.odometryY) > 140.0)
 
 def reachedMyDestination(player):
     """
@@ -10,19 +10,20 @@ def kickBallExecute(player):
     """
     Kick the ball
     """
+    data = player.stateData.kickBallExecute
     if player.firstFrame():
         player.brain.tracker.trackBall()
 
-        kickBallExecute.sweetMove = player.kick.sweetMove
+        data.sweetMove = player.kick.sweetMove
 
-        kickBallExecute.preKickDelay = 30
+        data.preKickDelay = 30
         return player.stay()
 
     # wait a second for stability.
-    kickBallExecute.preKickDelay -= 1
+    data.preKickDelay -= 1
 
-    if kickBallExecute.preKickDelay == 0:
-        player.executeMove(kickBallExecute.sweetMove)
+    if data.preKickDelay == 0:
+        player.executeMove(data.sweetMove)
         return player.stay()
 
     if player.counter > 40 and player.brain.nav.isStopped():
@@ -30,8 +31,12 @@ def kickBallExecute(player):
 
     return player.stay()
 
-kickBallExecute.preKickDelay = 0
-kickBallExecute.sweetMove = None
+class KickBallExecuteData(object):
+    __slots__ = ('preKickDelay', 'sweetMove')
+
+    def __init__(self):
+        self.preKickDelay = 0
+        self.sweetMove = None
 
 def afterKick(player):
     """
@@ -85,3 +90,6 @@ def spinAfterBackKick(player):
         player.brain.tracker.spinPan()
 
     return player.stay()
+
+# Each player's data for the states above, see FSA.StateData
+STATE_DATA = {'kickBallExecute' : KickBallExecuteData}
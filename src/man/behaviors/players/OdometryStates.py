@@ -3,7 +3,6 @@ import copy
 from .. import SweetMoves
 from ..headTracker import HeadMoves
 from .. import StiffnessModes
-from ..navigator import NavStates
 from objects import RobotLocation, RelRobotLocation
 
 ####Change these for picture taking####
@@ -55,7 +54,7 @@ def gamePlaying(player):
         
         if (player.testCounter > 0):
             player.printf("Odometry: {0}".format(my_current_odo - player.my_last_odo))
-            player.printf("Delta Odo {0}".format(NavStates.walkingTo.deltaDest))
+            player.printf("Delta Odo {0}".format(player.brain.nav.stateData.walkingTo.deltaDest))
         
         player.my_last_loc = RobotLocation(my_current_loc.x, 
                                            my_current_loc.y,
@@ -32,10 +32,10 @@ def playbookPosition(player):
 
 def spinToField(player):
 
-    fieldEdge = player.brain.interface.visualField.visual_field_edge
+    world = player.brain.world
 
     if player.firstFrame():
-        if fieldEdge.distance_l > fieldEdge.distance_r:
+        if world.fieldEdgeLeft > world.fieldEdgeRight:
             player.brain.nav.walkTo(0,0,constants.SPIN_AROUND_LEFT)
             player.brain.tracker.spinPan()
         else:
@@ -22,7 +22,7 @@ def leavingTheField(player):
     # print "maxDist: " + str(fieldEdge.maxDist)
     # print "shape: " + str(fieldEdge.shape)
 
-    if (fabs(degrees(self.tracker.brain.interface.joints.head_yaw))
+    if (fabs(degrees(self.tracker.brain.world.headYaw))
         < constants.LOOK_FORWARD_THRESH):
         total = total + fieldEdge.maxDist
         count += 1
@@ -4,6 +4,7 @@
 #
 from ..headTracker import HeadMoves
 from ..util import FSA
+from ..util import FrameCache
 from . import CoreSoccerStates
 
 class SoccerFSA(FSA.FSA):
@@ -38,6 +39,14 @@ class SoccerFSA(FSA.FSA):
                self.currentState == 'gameFinished':
             if not self.wroteVarianceData:
                 #self.brain.sensors.writeVarianceData()
+                self.brain.frameTimer.dump(self.printf)
+                self.brain.scheduler.dump(self.printf)
+                FrameCache.dump(self.printf)
+                for fsa in (self, self.brain.tracker, self.brain.nav):
+                    fsa.dumpHops(self.printf)
+                    fsa.dumpStats(self.printf)
+                if self.brain.recorder is not None:
+                    self.brain.recorder.flush()
                 self.wroteVarianceData = True
         else:
             self.wroteVarianceData = False
@@ -32,9 +32,9 @@ def updatePostObservations(player):
             player.system.pushRightPostObservation(player.brain.ygrp.distance,
                                                    player.brain.ygrp.bearing)
             if DEBUG_OBSERVATIONS:
-                print "RIGHT: Saw right post."
-                print "  Avg right x is now " + str(player.system.rightPostRelX())
-                print "  Avg right y is now " + str(player.system.rightPostRelY())
+                player.printf("RIGHT: Saw right post.")
+                player.printf("  Avg right x is now " + str(player.system.rightPostRelX()))
+                player.printf("  Avg right y is now " + str(player.system.rightPostRelY()))
 
         if (player.brain.yglp.distance != 0.0 and
             #magic number
@@ -42,16 +42,18 @@ def updatePostObservations(player):
             player.system.pushLeftPostObservation(player.brain.yglp.distance,
                                                   player.brain.yglp.bearing)
             if DEBUG_OBSERVATIONS:
-                print "LEFT: Saw left post."
-                print "  Avg left x is now " + str(player.system.leftPostRelX())
-                print "  Avg left y is now " + str(player.system.leftPostRelY())
+                player.printf("LEFT: Saw left post.")
+                player.printf("  Avg left x is now " + str(player.system.leftPostRelX()))
+                player.printf("  Avg left y is now " + str(player.system.leftPostRelY()))
 
 def updateCrossObservations(player):
-    cross = player.brain.interface.visionField.visual_cross
-    if(cross.on and cross.distance != 0.0):
-        player.system.pushCrossObservation(cross.distance,cross.bearing)
+    world = player.brain.world
+    if(world.crossOn and world.crossDistance != 0.0):
+        player.system.pushCrossObservation(world.crossDistance,
+                                           world.crossBearing)
 
 def spinToFaceGoal(player):
+    data = player.stateData.spinToFaceGoal
     if player.firstFrame():
         player.brain.tracker.lookToAngle(0)
 
@@ -60,18 +62,24 @@ def spinToFaceGoal(player):
         else:
             player.side = LEFT
 
-        spinToFaceGoal.facingDest = RelRobotLocation(0.0, 0.0, 0.0)
+        data.facingDest = RelRobotLocation(0.0, 0.0, 0.0)
         if player.side == RIGHT:
-            spinToFaceGoal.facingDest.relH = 45
+            data.facingDest.relH = 45
         else:
-            spinToFaceGoal.facingDest.relH = -45
+            data.facingDest.relH = -45
 
     if player.counter == 20:
-        player.brain.nav.goTo(spinToFaceGoal.facingDest,
+        player.brain.nav.goTo(data.facingDest,
                               nav.CLOSE_ENOUGH, nav.CAREFUL_SPEED)
 
     return Transition.getNextState(player, spinToFaceGoal)
 
+class SpinToFaceGoalData(object):
+    __slots__ = ('facingDest',)
+
+    def __init__(self):
+        self.facingDest = None
+
 
 def walkToGoal(player):
     """
@@ -109,43 +117,58 @@ def walkToGoal(player):
     return Transition.getNextState(player, walkToGoal)
 
 def dodgeBall(player):
+    data = player.stateData.dodgeBall
     if player.firstFrame():
         if player.brain.ball.rel_y < 0.0:
             dodgeDestY = player.brain.ball.rel_y + 20.0
         else:
             dodgeDestY = player.brain.ball.rel_y - 20.0
         player.brain.tracker.trackBall()
-        dodgeBall.dodgeDest = RelRobotLocation(player.brain.ball.rel_x,
-                                               dodgeDestY,
-                                               0.0)
-        player.brain.nav.goTo(dodgeBall.dodgeDest)
+        data.dodgeDest = RelRobotLocation(player.brain.ball.rel_x,
+                                          dodgeDestY,
+                                          0.0)
+        player.brain.nav.goTo(data.dodgeDest)
 
     # update dest based on ball loc
     if player.brain.ball.rel_y < 0.0:
-        dodgeBall.dodgeDest.relY = player.brain.ball.rel_y + 20.0
+        data.dodgeDest.relY = player.brain.ball.rel_y + 20.0
     else:
-        dodgeBall.dodgeDest.relY = player.brain.ball.rel_y - 20.0
-    dodgeBall.dodgeDest.relX = player.brain.ball.rel_x
+        data.dodgeDest.relY = player.brain.ball.rel_y - 20.0
+    data.dodgeDest.relX = player.brain.ball.rel_x
 
     return Transition.getNextState(player, dodgeBall)
 
+class DodgeBallData(object):
+    __slots__ = ('dodgeDest',)
+
+    def __init__(self):
+        self.dodgeDest = None
+
 def spinAtGoal(player):
+    data = player.stateData.spinAtGoal
     if player.firstFrame():
-        spinAtGoal.home = RelRobotLocation(0, 0, 0)
+        data.home = RelRobotLocation(0, 0, 0)
         # Decide which way to rotate based on the way we came from
         if player.side == RIGHT:
-            spinAtGoal.home.relH = -90
+            data.home.relH = -90
         else:
-            spinAtGoal.home.relH = 90
-        player.brain.nav.goTo(spinAtGoal.home,
+            data.home.relH = 90
+        player.brain.nav.goTo(data.home,
                               nav.CLOSE_ENOUGH, nav.CAREFUL_SPEED)
 
         player.brain.tracker.lookToAngle(0.0)
 
     return Transition.getNextState(player, spinAtGoal)
 
+class SpinAtGoalData(object):
+    __slots__ = ('home',)
+
+    def __init__(self):
+        self.home = None
+
 # clearIt->kickBall->didIKickIt->returnToGoal
 def clearIt(player):
+    data = player.stateData.clearIt
     if player.firstFrame():
         player.brain.tracker.trackBall()
         if player.brain.ball.rel_y < 0.0:
@@ -156,30 +179,37 @@ def clearIt(player):
             player.kick = kicks.LEFT_STRAIGHT_KICK
 
         kickPose = player.kick.getPosition()
-        clearIt.ballDest = RelRobotLocation(player.brain.ball.rel_x -
-                                            kickPose[0],
-                                            player.brain.ball.rel_y -
-                                            kickPose[1],
-                                            0.0)
+        data.ballDest = RelRobotLocation(player.brain.ball.rel_x -
+                                         kickPose[0],
+                                         player.brain.ball.rel_y -
+                                         kickPose[1],
+                                         0.0)
 
         # reset odometry
         player.brain.interface.motionRequest.reset_odometry = True
         player.brain.interface.motionRequest.timestamp = int(player.brain.time * 1000)
-        clearIt.odoDelay = True
+        data.odoDelay = True
         return player.stay()
 
-    if clearIt.odoDelay:
-        clearIt.odoDelay = False
-        player.brain.nav.goTo(clearIt.ballDest,
+    if data.odoDelay:
+        data.odoDelay = False
+        player.brain.nav.goTo(data.ballDest,
                               nav.CLOSE_ENOUGH,
                               nav.FAST_SPEED)
 
     kickPose = player.kick.getPosition()
-    clearIt.ballDest.relX = player.brain.ball.rel_x - kickPose[0]
-    clearIt.ballDest.relY = player.brain.ball.rel_y - kickPose[1]
+    data.ballDest.relX = player.brain.ball.rel_x - kickPose[0]
+    data.ballDest.relY = player.brain.ball.rel_y - kickPose[1]
 
     return Transition.getNextState(player, clearIt)
 
+class ClearItData(object):
+    __slots__ = ('ballDest', 'odoDelay')
+
+    def __init__(self):
+        self.ballDest = None
+        self.odoDelay = False
+
 def shouldISaveIt(player):
     if player.firstFrame():
         player.brain.tracker.trackBall()
@@ -218,14 +248,15 @@ def decideRightSide(player):
     return Transition.getNextState(player, decideRightSide)
 
 def returnToGoal(player):
+    data = player.stateData.returnToGoal
     if player.firstFrame():
         if player.lastDiffState == 'didIKickIt':
             correctedDest =(RelRobotLocation(0.0, 0.0, 0.0 ) -
-                            returnToGoal.kickPose)
+                            data.kickPose)
         else:
             correctedDest = (RelRobotLocation(0.0, 0.0, 0.0) -
-                             RelRobotLocation(player.brain.interface.odometry.x,
-                                              player.brain.interface.odometry.y,
+                             RelRobotLocation(player.brain.world.odometryX,
+                                              player.brain.world.odometryY,
                                               0.0))
 
         if fabs(correctedDest.relX) < 5:
@@ -239,6 +270,12 @@ def returnToGoal(player):
 
     return Transition.getNextState(player, returnToGoal)
 
+class ReturnToGoalData(object):
+    __slots__ = ('kickPose',)
+
+    def __init__(self):
+        self.kickPose = None
+
 def findGoalboxCorner(player):
     if player.firstFrame():
         player.brain.tracker.repeatHeadMove(FIXED_PITCH_SLOW_GOALIE_PAN)
@@ -256,88 +293,95 @@ def getRobotRelY(alpha, distance, phys):
     return (-distance * sin(phys + radians(alpha)))
 
 def centerAtGoalBasedOnCorners(player):
+    data = player.stateData.centerAtGoalBasedOnCorners
     if player.firstFrame():
-        centerAtGoalBasedOnCorners.home = RelRobotLocation(-10.0, 0.0, 0.0)
-        player.brain.nav.goTo(centerAtGoalBasedOnCorners.home,
+        data.home = RelRobotLocation(-10.0, 0.0, 0.0)
+        player.brain.nav.goTo(data.home,
                               nav.GENERAL_AREA,
                               nav.FAST_SPEED)
 
-    vision = player.brain.interface.visionField
+    corners = player.brain.world.corners
 
     # this is a hack that could cause problems
-    if vision.visual_corner_size() == 0:
+    if not corners:
         return Transition.getNextState(player, centerAtGoalBasedOnCorners)
 
-    corner = vision.visual_corner(0)
+    corner = corners[0]
 
-    for i in range(0, vision.visual_corner_size()):
+    for candidate in corners:
         # if it is possible that this is the desired corner
-        for j in range(0, vision.visual_corner(i).poss_id_size()):
-            if (vision.visual_corner(i).poss_id(j) ==
-                centerAtGoalBasedOnCorners.cornerID):
-                if(centerAtGoalBasedOnCorners.cornerID ==
-                   vision.visual_corner(i).corner_id.YELLOW_GOAL_LEFT_L and
-                   vision.visual_corner(i).orientation < 0):
-                    corner = vision.visual_corner(i)
-                    centerAtGoalBasedOnCorners.cornerDirection = \
-                        corner.visual_detection.bearing
+        for cornerId in candidate.poss_id:
+            if cornerId == data.cornerID:
+                if(data.cornerID ==
+                   candidate.corner_id.YELLOW_GOAL_LEFT_L and
+                   candidate.orientation < 0):
+                    corner = candidate
+                    data.cornerDirection = \
+                        corner.bearing
                     heading = \
                         getRobotGlobalHeading(90,
-                                              corner.visual_detection.bearing,
+                                              corner.bearing,
                                               corner.physical_orientation)
                     relX = getRobotRelX(90,
-                                        corner.visual_detection.distance,
+                                        corner.distance,
                                         corner.physical_orientation)
                     relY = getRobotRelY(90,
-                                        corner.visual_detection.distance,
+                                        corner.distance,
                                         corner.physical_orientation)
 
-                elif(centerAtGoalBasedOnCorners.cornerID ==
-                   vision.visual_corner(i).corner_id.YELLOW_GOAL_RIGHT_L and
-                   vision.visual_corner(i).orientation > 0):
-                    corner = vision.visual_corner(i)
-                    centerAtGoalBasedOnCorners.cornerDirection = \
-                        corner.visual_detection.bearing
+                elif(data.cornerID ==
+                   candidate.corner_id.YELLOW_GOAL_RIGHT_L and
+                   candidate.orientation > 0):
+                    corner = candidate
+                    data.cornerDirection = \
+                        corner.bearing
                     heading = \
                         getRobotGlobalHeading(0,
-                                              corner.visual_detection.bearing,
+                                              corner.bearing,
                                               corner.physical_orientation)
                     relX = getRobotRelX(0,
-                                        corner.visual_detection.distance,
+                                        corner.distance,
                                         corner.physical_orientation)
                     relY = getRobotRelY(0,
-                                        corner.visual_detection.distance,
+                                        corner.distance,
                                         corner.physical_orientation)
                 else:
                     continue
 
-                centerAtGoalBasedOnCorners.home.relH = -heading
-                centerAtGoalBasedOnCorners.home.relX = -(GOALBOX_DEPTH + relX)
-                if (centerAtGoalBasedOnCorners.cornerID ==
+                data.home.relH = -heading
+                data.home.relX = -(GOALBOX_DEPTH + relX)
+                if (data.cornerID ==
                     corner.corner_id.YELLOW_GOAL_LEFT_L):
-                    centerAtGoalBasedOnCorners.home.relY = -(GOALBOX_WIDTH/2.0 +
-                                                             relY)
+                    data.home.relY = -(GOALBOX_WIDTH/2.0 + relY)
                 else:
-                    centerAtGoalBasedOnCorners.home.relY = (GOALBOX_WIDTH/2.0 -
-                                                            relY)
+                    data.home.relY = (GOALBOX_WIDTH/2.0 - relY)
 
-                player.brain.tracker.lookToAngle(centerAtGoalBasedOnCorners.cornerDirection)
+                player.brain.tracker.lookToAngle(data.cornerDirection)
 
                 break
 
     # corrections to make nav STOP!
-    if fabs(centerAtGoalBasedOnCorners.home.relH) < 5:
-        centerAtGoalBasedOnCorners.home.relH = 0
+    if fabs(data.home.relH) < 5:
+        data.home.relH = 0
 
-    if fabs(centerAtGoalBasedOnCorners.home.relX) < 10:
-        centerAtGoalBasedOnCorners.home.relX = 0
+    if fabs(data.home.relX) < 10:
+        data.home.relX = 0
 
-    if fabs(centerAtGoalBasedOnCorners.home.relY) < 10:
-        centerAtGoalBasedOnCorners.home.relY = 0
+    if fabs(data.home.relY) < 10:
+        data.home.relY = 0
 
     return Transition.getNextState(player, centerAtGoalBasedOnCorners)
 
+class CenterAtGoalBasedOnCornersData(object):
+    __slots__ = ('home', 'cornerID', 'cornerDirection')
+
+    def __init__(self):
+        self.home = None
+        self.cornerID = None
+        self.cornerDirection = None
+
 def repositionAfterWhiff(player):
+    data = player.stateData.repositionAfterWhiff
     if player.firstFrame():
         # reset odometry
         player.brain.interface.motionRequest.reset_odometry = True
@@ -349,27 +393,43 @@ def repositionAfterWhiff(player):
             player.kick = kicks.LEFT_STRAIGHT_KICK
 
         kickPose = player.kick.getPosition()
-        repositionAfterWhiff.ballDest = RelRobotLocation(player.brain.ball.rel_x -
-                                                         kickPose[0],
-                                                         player.brain.ball.rel_y -
-                                                         kickPose[1],
-                                                         0.0)
-        player.brain.nav.goTo(repositionAfterWhiff.ballDest,
+        data.ballDest = RelRobotLocation(player.brain.ball.rel_x -
+                                         kickPose[0],
+                                         player.brain.ball.rel_y -
+                                         kickPose[1],
+                                         0.0)
+        player.brain.nav.goTo(data.ballDest,
                               nav.CLOSE_ENOUGH,
                               nav.FAST_SPEED)
 
     # if it took more than 5 seconds, forget it
     if player.counter > 150:
-        returnToGoal.kickPose.relX += player.brain.interface.odometry.x
-        returnToGoal.kickPose.relY += player.brain.interface.odometry.y
-        returnToGoal.kickPose.relH += player.brain.interface.odometry.h
+        kickPose = player.stateData.returnToGoal.kickPose
+        kickPose.relX += player.brain.world.odometryX
+        kickPose.relY += player.brain.world.odometryY
+        kickPose.relH += player.brain.world.odometryH
 
         return player.goLater('returnToGoal')
 
     kickPose = player.kick.getPosition()
-    repositionAfterWhiff.ballDest.relX = (player.brain.ball.rel_x -
-                                          kickPose[0])
-    repositionAfterWhiff.ballDest.relY = (player.brain.ball.rel_y -
-                                          kickPose[1])
+    data.ballDest.relX = (player.brain.ball.rel_x -
+                          kickPose[0])
+    data.ballDest.relY = (player.brain.ball.rel_y -
+                          kickPose[1])
 
     return Transition.getNextState(player, repositionAfterWhiff)
+
+class RepositionAfterWhiffData(object):
+    __slots__ = ('ballDest',)
+
+    def __init__(self):
+        self.ballDest = None
+
+# Each player's data for the states above, see FSA.StateData
+STATE_DATA = {'spinToFaceGoal' : SpinToFaceGoalData,
+              'dodgeBall' : DodgeBallData,
+              'spinAtGoal' : SpinAtGoalData,
+              'clearIt' : ClearItData,
+              'returnToGoal' : ReturnToGoalData,
+              'centerAtGoalBasedOnCorners' : CenterAtGoalBasedOnCornersData,
+              'repositionAfterWhiff' : RepositionAfterWhiffData}
@@ -3,12 +3,8 @@ import time
 from . import SoccerFSA
 from . import ChaseBallStates
 from . import PositionStates
-from . import PenaltyStates
 from . import FindBallStates
 from . import KickingStates
-from . import PenaltyKickStates
-from . import GoaliePositionStates
-from . import GoalieSaveStates
 from . import BrunswickStates
 
 import noggin_constants as NogginConstants
@@ -21,15 +17,16 @@ COUNT_FPS = False
 class SoccerPlayer(SoccerFSA.SoccerFSA):
     def __init__(self, brain):
         SoccerFSA.SoccerFSA.__init__(self,brain)
-        self.addStates(PenaltyKickStates)
-        self.addStates(GoaliePositionStates)
-        self.addStates(GoalieSaveStates)
         self.addStates(PositionStates)
-        self.addStates(PenaltyStates)
         self.addStates(FindBallStates)
         self.addStates(KickingStates)
         self.addStates(ChaseBallStates)
         self.addStates(BrunswickStates)
+        # Only needed after a penalty, in penalty shots or as goalie
+        self.addStatesLater('PenaltyStates')
+        self.addStatesLater('PenaltyKickStates')
+        self.addStatesLater('GoaliePositionStates')
+        self.addStatesLater('GoalieSaveStates')
 
         self.setName('pBrunswick')
 
@@ -9,6 +9,150 @@ from GoalieConstants import RIGHT, LEFT
 
 from objects import Location
 
+# All transitions are defined here, each state's checked in this order.
+# Their conditions are in GoalieTransitions
+TRANSITIONS = (
+    (VisualGoalieStates.spinToFaceGoal, (
+        (GoalieTransitions.facingGoal,
+         Transition.SOME_OF_THE_TIME, Transition.LOW_PRECISION,
+         VisualGoalieStates.walkToGoal),)),
+
+    (VisualGoalieStates.walkToGoal, (
+        (GoalieTransitions.atGoalArea,
+         Transition.MOST_OF_THE_TIME, Transition.LOW_PRECISION,
+         VisualGoalieStates.spinAtGoal),
+
+        (GoalieTransitions.ballIsInMyWay,
+         Transition.MOST_OF_THE_TIME, Transition.OK_PRECISION,
+         VisualGoalieStates.dodgeBall))),
+
+    (VisualGoalieStates.spinAtGoal, (
+        (GoalieTransitions.facingForward,
+         Transition.SOME_OF_THE_TIME, Transition.LOW_PRECISION,
+         VisualGoalieStates.findGoalboxCorner),
+
+        (GoalieTransitions.ballMoreImportant,
+         Transition.SOME_OF_THE_TIME, Transition.OK_PRECISION,
+         VisualGoalieStates.clearIt))),
+
+    (VisualGoalieStates.decideLeftSide, (
+        (GoalieTransitions.onThisSideline,
+         Transition.MOST_OF_THE_TIME, Transition.HIGH_PRECISION,
+         VisualGoalieStates.spinToFaceGoal),
+
+        (GoalieTransitions.unsure,
+         Transition.MOST_OF_THE_TIME, Transition.OK_PRECISION,
+         VisualGoalieStates.decideRightSide))),
+
+    (VisualGoalieStates.decideRightSide, (
+        (GoalieTransitions.onThisSideline,
+         Transition.MOST_OF_THE_TIME, Transition.OK_PRECISION,
+         VisualGoalieStates.spinToFaceGoal),
+
+        (GoalieTransitions.unsure,
+         Transition.MOST_OF_THE_TIME, Transition.OK_PRECISION,
+         VisualGoalieStates.decideLeftSide))),
+
+    (GoalieStates.watch, (
+        (GoalieTransitions.shouldGetReadyToSave,
+         Transition.SOME_OF_THE_TIME, Transition.LOW_PRECISION,
+         VisualGoalieStates.shouldISaveIt),
+
+        (GoalieTransitions.shouldClearBall,
+         Transition.SOME_OF_THE_TIME, Transition.OK_PRECISION,
+         VisualGoalieStates.clearIt),
+
+        (GoalieTransitions.facingSideways,
+         Transition.MOST_OF_THE_TIME, Transition.LOW_PRECISION,
+         VisualGoalieStates.spinAtGoal))),
+
+    (VisualGoalieStates.shouldISaveIt, (
+        (GoalieTransitions.shouldPerformSave,
+         Transition.SOME_OF_THE_TIME, Transition.LOW_PRECISION,
+         GoalieStates.saveIt),
+
+        (GoalieTransitions.shouldClearBall,
+         Transition.SOME_OF_THE_TIME, Transition.OK_PRECISION,
+         VisualGoalieStates.clearIt),
+
+        (GoalieTransitions.noSave,
+         Transition.ALL_OF_THE_TIME, Transition.INSTANT,
+         GoalieStates.watch))),
+
+    (VisualGoalieStates.spinToFaceBall, (
+        (GoalieTransitions.facingBall,
+         Transition.SOME_OF_THE_TIME, Transition.LOW_PRECISION,
+         VisualGoalieStates.clearIt),)),
+
+    (VisualGoalieStates.clearIt, (
+        (GoalieTransitions.reachedMyDestination,
+         Transition.ALL_OF_THE_TIME, Transition.INSTANT,
+         GoalieStates.kickBall),
+
+        (GoalieTransitions.ballLostStopChasing,
+         Transition.ALL_OF_THE_TIME, 90,
+         VisualGoalieStates.returnToGoal),
+
+        (GoalieTransitions.ballMovedStopChasing,
+         Transition.MOST_OF_THE_TIME, Transition.OK_PRECISION,
+         VisualGoalieStates.returnToGoal),
+
+        (GoalieTransitions.walkedTooFar,
+         Transition.MOST_OF_THE_TIME, Transition.OK_PRECISION,
+         VisualGoalieStates.returnToGoal))),
+
+    (VisualGoalieStates.repositionAfterWhiff, (
+        (GoalieTransitions.reachedMyDestination,
+         Transition.ALL_OF_THE_TIME, Transition.INSTANT,
+         GoalieStates.kickBall),)),
+
+    (VisualGoalieStates.returnToGoal, (
+        (GoalieTransitions.doneWalking,
+         Transition.ALL_OF_THE_TIME, Transition.OK_PRECISION,
+         VisualGoalieStates.findGoalboxCorner),)),
+
+    (VisualGoalieStates.didIKickIt, (
+        (GoalieTransitions.whiffed,
+         Transition.SOME_OF_THE_TIME, Transition.OK_PRECISION,
+         VisualGoalieStates.repositionAfterWhiff),
+
+        (GoalieTransitions.successfulKick,
+         Transition.ALL_OF_THE_TIME, Transition.INSTANT,
+         VisualGoalieStates.returnToGoal))),
+
+    (VisualGoalieStates.findGoalboxCorner, (
+        (GoalieTransitions.foundACorner,
+         Transition.SOME_OF_THE_TIME, Transition.LOW_PRECISION,
+         VisualGoalieStates.centerAtGoalBasedOnCorners),
+
+        (GoalieTransitions.noCorner,
+         Transition.MOST_OF_THE_TIME, Transition.HIGH_PRECISION,
+         GoalieStates.watch),
+
+        (GoalieTransitions.ballMoreImportant,
+         Transition.SOME_OF_THE_TIME, Transition.OK_PRECISION,
+         VisualGoalieStates.clearIt))),
+
+    (VisualGoalieStates.centerAtGoalBasedOnCorners, (
+        (GoalieTransitions.lostCorner,
+         Transition.ALL_OF_THE_TIME, Transition.OK_PRECISION,
+         GoalieStates.watch),
+
+        (GoalieTransitions.reachedMyDestination,
+         Transition.ALL_OF_THE_TIME, Transition.OK_PRECISION,
+         GoalieStates.watch))),
+
+    (GoalieStates.penaltyShotsGamePlaying, (
+        (GoalieTransitions.shouldGetReadyToSave,
+         Transition.SOME_OF_THE_TIME, Transition.LOW_PRECISION,
+         GoalieStates.waitForPenaltySave),)),
+
+    (GoalieStates.waitForPenaltySave, (
+        (GoalieTransitions.shouldPerformSave,
+         Transition.SOME_OF_THE_TIME, Transition.LOW_PRECISION,
+         GoalieStates.diveForPenaltySave),)),
+    )
+
 class SoccerPlayer(SoccerFSA.SoccerFSA):
     def __init__(self, brain):
         SoccerFSA.SoccerFSA.__init__(self,brain)
@@ -20,193 +164,7 @@ class SoccerPlayer(SoccerFSA.SoccerFSA):
         self.penaltyKicking = False
         self.aggressive = False
 
-        # All transitions are defined here. Their conditions are in
-        # GoalieTransitions
-        VisualGoalieStates.spinToFaceGoal.transitions = {
-            Transition.CountTransition(GoalieTransitions.facingGoal,
-                                       Transition.SOME_OF_THE_TIME,
-                                       Transition.LOW_PRECISION)
-            : VisualGoalieStates.walkToGoal
-            }
-        VisualGoalieStates.walkToGoal.transitions = {
-            Transition.CountTransition(GoalieTransitions.atGoalArea,
-                                       Transition.MOST_OF_THE_TIME,
-                                       Transition.LOW_PRECISION)
-            : VisualGoalieStates.spinAtGoal,
-
-            Transition.CountTransition(GoalieTransitions.ballIsInMyWay,
-                                       Transition.MOST_OF_THE_TIME,
-                                       Transition.OK_PRECISION)
-            : VisualGoalieStates.dodgeBall
-            }
-
-        VisualGoalieStates.spinAtGoal.transitions = {
-            Transition.CountTransition(GoalieTransitions.facingForward,
-                                       Transition.SOME_OF_THE_TIME,
-                                       Transition.LOW_PRECISION)
-            : VisualGoalieStates.findGoalboxCorner,
-
-            Transition.CountTransition(GoalieTransitions.ballMoreImportant,
-                                       Transition.SOME_OF_THE_TIME,
-                                       Transition.OK_PRECISION)
-            : VisualGoalieStates.clearIt
-            }
-
-        VisualGoalieStates.decideLeftSide.transitions = {
-            Transition.CountTransition(GoalieTransitions.onThisSideline,
-                                       Transition.MOST_OF_THE_TIME,
-                                       Transition.HIGH_PRECISION)
-            : VisualGoalieStates.spinToFaceGoal,
-
-            Transition.CountTransition(GoalieTransitions.unsure,
-                                       Transition.MOST_OF_THE_TIME,
-                                       Transition.OK_PRECISION)
-            : VisualGoalieStates.decideRightSide
-            }
-
-        VisualGoalieStates.decideRightSide.transitions = {
-            Transition.CountTransition(GoalieTransitions.onThisSideline,
-                                       Transition.MOST_OF_THE_TIME,
-                                       Transition.OK_PRECISION)
-            : VisualGoalieStates.spinToFaceGoal,
-
-            Transition.CountTransition(GoalieTransitions.unsure,
-                                       Transition.MOST_OF_THE_TIME,
-                                       Transition.OK_PRECISION)
-            : VisualGoalieStates.decideLeftSide
-            }
-
-        GoalieStates.watch.transitions = {
-            Transition.CountTransition(GoalieTransitions.shouldGetReadyToSave,
-                                       Transition.SOME_OF_THE_TIME,
-                                       Transition.LOW_PRECISION)
-            : VisualGoalieStates.shouldISaveIt,
-
-            Transition.CountTransition(GoalieTransitions.shouldClearBall,
-                                       Transition.SOME_OF_THE_TIME,
-                                       Transition.OK_PRECISION)
-            : VisualGoalieStates.clearIt,
-
-            Transition.CountTransition(GoalieTransitions.facingSideways,
-                                       Transition.MOST_OF_THE_TIME,
-                                       Transition.LOW_PRECISION)
-            : VisualGoalieStates.spinAtGoal
-            }
-
-        VisualGoalieStates.shouldISaveIt.transitions = {
-            Transition.CountTransition(GoalieTransitions.shouldPerformSave,
-                                       Transition.SOME_OF_THE_TIME,
-                                       Transition.LOW_PRECISION)
-            : GoalieStates.saveIt,
-
-            Transition.CountTransition(GoalieTransitions.shouldClearBall,
-                                       Transition.SOME_OF_THE_TIME,
-                                       Transition.OK_PRECISION)
-            : VisualGoalieStates.clearIt,
-
-            Transition.CountTransition(GoalieTransitions.noSave,
-                                       Transition.ALL_OF_THE_TIME,
-                                       Transition.INSTANT)
-            : GoalieStates.watch
-            }
-
-        VisualGoalieStates.spinToFaceBall.transitions = {
-            Transition.CountTransition(GoalieTransitions.facingBall,
-                                       Transition.SOME_OF_THE_TIME,
-                                       Transition.LOW_PRECISION)
-            : VisualGoalieStates.clearIt
-            }
-
-        VisualGoalieStates.clearIt.transitions = {
-            Transition.CountTransition(GoalieTransitions.reachedMyDestination,
-                                       Transition.ALL_OF_THE_TIME,
-                                       Transition.INSTANT)
-            : GoalieStates.kickBall,
-
-            Transition.CountTransition(GoalieTransitions.ballLostStopChasing,
-                                       Transition.ALL_OF_THE_TIME,
-                                       90)
-            : VisualGoalieStates.returnToGoal,
-
-            Transition.CountTransition(GoalieTransitions.ballMovedStopChasing,
-                                       Transition.MOST_OF_THE_TIME,
-                                       Transition.OK_PRECISION)
-            : VisualGoalieStates.returnToGoal,
-
-            Transition.CountTransition(GoalieTransitions.walkedTooFar,
-                                       Transition.MOST_OF_THE_TIME,
-                                       Transition.OK_PRECISION)
-            : VisualGoalieStates.returnToGoal
-            }
-
-        VisualGoalieStates.repositionAfterWhiff.transitions = {
-            Transition.CountTransition(GoalieTransitions.reachedMyDestination,
-                                       Transition.ALL_OF_THE_TIME,
-                                       Transition.INSTANT)
-            : GoalieStates.kickBall
-            }
-
-        VisualGoalieStates.returnToGoal.transitions = {
-            Transition.CountTransition(GoalieTransitions.doneWalking,
-                                       Transition.ALL_OF_THE_TIME,
-                                       Transition.OK_PRECISION)
-            : VisualGoalieStates.findGoalboxCorner
-            }
-
-        VisualGoalieStates.didIKickIt.transitions = {
-            Transition.CountTransition(GoalieTransitions.whiffed,
-                                       Transition.SOME_OF_THE_TIME,
-                                       Transition.OK_PRECISION)
-            : VisualGoalieStates.repositionAfterWhiff,
-
-            Transition.CountTransition(GoalieTransitions.successfulKick,
-                                       Transition.ALL_OF_THE_TIME,
-                                       Transition.INSTANT)
-            : VisualGoalieStates.returnToGoal
-            }
-
-        VisualGoalieStates.findGoalboxCorner.transitions = {
-            Transition.CountTransition(GoalieTransitions.foundACorner,
-                                       Transition.SOME_OF_THE_TIME,
-                                       Transition.LOW_PRECISION)
-            : VisualGoalieStates.centerAtGoalBasedOnCorners,
-
-            Transition.CountTransition(GoalieTransitions.noCorner,
-                                       Transition.MOST_OF_THE_TIME,
-                                       Transition.HIGH_PRECISION)
-            : GoalieStates.watch,
-
-            Transition.CountTransition(GoalieTransitions.ballMoreImportant,
-                                       Transition.SOME_OF_THE_TIME,
-                                       Transition.OK_PRECISION)
-            : VisualGoalieStates.clearIt
-            }
-
-        VisualGoalieStates.centerAtGoalBasedOnCorners.transitions = {
-            Transition.CountTransition(GoalieTransitions.lostCorner,
-                                       Transition.ALL_OF_THE_TIME,
-                                       Transition.OK_PRECISION)
-            : GoalieStates.watch,
-
-            Transition.CountTransition(GoalieTransitions.reachedMyDestination,
-                                       Transition.ALL_OF_THE_TIME,
-                                       Transition.OK_PRECISION)
-            : GoalieStates.watch
-            }
-
-        GoalieStates.penaltyShotsGamePlaying.transitions = {
-            Transition.CountTransition(GoalieTransitions.shouldGetReadyToSave,
-                                       Transition.SOME_OF_THE_TIME,
-                                       Transition.LOW_PRECISION)
-            : GoalieStates.waitForPenaltySave
-            }
-
-        GoalieStates.waitForPenaltySave.transitions = {
-            Transition.CountTransition(GoalieTransitions.shouldPerformSave,
-                                       Transition.SOME_OF_THE_TIME,
-                                       Transition.LOW_PRECISION)
-            : GoalieStates.diveForPenaltySave
-            }
+        self.addTransitions(TRANSITIONS)
 
     def run(self):
         gcState = self.brain.gameController.currentState
@@ -216,4 +174,22 @@ class SoccerPlayer(SoccerFSA.SoccerFSA):
         #     if (self.brain.gameController.counter == 2):
         #         self.switchTo('watch')
 
+        self.updateAggressiveness()
         SoccerFSA.SoccerFSA.run(self)
+
+    def updateAggressiveness(self):
+        """
+        The goalie clears the ball from farther out with less than 1.5
+        minutes left or when winning or losing badly. Done once a frame,
+        before the states, so the transitions only read it.
+        """
+        world = self.brain.world
+        shouldBeAggressive = (world.secsRemaining < 90 or
+                              abs(world.scores[0] - world.scores[1]) > 1)
+
+        if shouldBeAggressive and not self.aggressive:
+            self.printf("The goalie is now AGGRESSIVE")
+            self.aggressive = True
+        elif not shouldBeAggressive and self.aggressive:
+            self.printf("The goalie is no longer AGGRESSIVE")
+            self.aggressive = False
@@ -1,4 +1,5 @@
 from objects import (RobotLocation, Location)
+from ..util import Log
 from math import fabs, degrees
 import noggin_constants as NogginConstants
 
@@ -29,6 +30,8 @@ BALL_TEAMMATE_DIST_DRIBBLING = 20
 # Ball on?
 BALL_FRAMES = 20
 
+log = Log.getLogger('TeamMember')
+
 class TeamMember(RobotLocation):
     """class for keeping track of teammates' info """
 
@@ -132,7 +135,7 @@ class TeamMember(RobotLocation):
         t = (self.ballDist / CHASE_SPEED)
 
         if DEBUG_DETERMINE_CHASE_TIME:
-            print "\tChase time base is " + str(t)
+            log.info("\tChase time base is %s", t)
 
         # Give a penalty for not seeing the ball if we aren't in a kickingState
         if (not self.brain.ball.vis.frames_on > 3 and
@@ -140,7 +143,7 @@ class TeamMember(RobotLocation):
             t += BALL_OFF_PENALTY
 
         if DEBUG_DETERMINE_CHASE_TIME:
-            print "\tChase time after ball on bonus " + str(t)
+            log.info("\tChase time after ball on bonus %s", t)
 
         # Commented out Summer 2012 due to unreliable Localization.
         # # Give penalties for not lining up along the ball-goal line
@@ -161,7 +164,7 @@ class TeamMember(RobotLocation):
         t += 20 * (self.brain.player.currentState == 'fallen')
 
         if DEBUG_DETERMINE_CHASE_TIME:
-            print "\tChase time after fallen over penalty " + str(t)
+            log.info("\tChase time after fallen over penalty %s", t)
 
         t *= CHASE_SPEED
 
@@ -169,8 +172,8 @@ class TeamMember(RobotLocation):
         t = t * CHASE_TIME_SCALE + (1.0 -CHASE_TIME_SCALE) * self.chaseTime
 
         if DEBUG_DETERMINE_CHASE_TIME:
-            print "\tChase time after filter " +str(t)
-            print ""
+            log.info("\tChase time after filter %s", t)
+            log.info("")
 
         return t
 
@@ -199,7 +202,7 @@ class TeamMember(RobotLocation):
         """
         this checks GameController to see if a player is penalized.
         """
-        return self.brain.interface.gameState.team(self.brain.gameController.teamColor).player(self.playerNumber-1).penalty
+        return self.brain.world.penalties[self.brain.gameController.teamColor][self.playerNumber-1]
 
     def __str__(self):
         return "I am player number " + self.playerNumber
@@ -0,0 +1,86 @@
+"""
+Clock.py - the time source shared by Brain, its FSAs and the playbook
+
+Brain ticks its clock once at the start of every frame, and everything
+else reads that frame time: Brain.time, or clock.now() for the FSAs. So a
+frame costs one read of the underlying time source, and every behavior in
+it agrees on what time it is.
+
+    RealTimeClock       wall time, what runs on the robot
+    SimulatedClock      moves a fixed step per frame, or wherever set()
+                        puts it, e.g. to recorded frame times in a replay
+    AcceleratedClock    wall time sped up (or slowed down) by a factor
+
+Calling a clock gives now(), so a clock works anywhere a time function
+like time.time is expected.
+"""
+import time
+
+# Vision runs at 30 fps
+FRAME_LENGTH = 1.0/30.0
+
+class Clock(object):
+    """
+    Subclasses provide read(), the current time in seconds; tick() latches
+    it as the frame time now() returns.
+    """
+    def __init__(self):
+        self.time = self.read()
+
+    def read(self):
+        raise NotImplementedError
+
+    def tick(self):
+        """Called once per frame by Brain; returns the new frame time."""
+        self.time = self.read()
+        return self.time
+
+    def now(self):
+        return self.time
+
+    def __call__(self):
+        return self.time
+
+class RealTimeClock(Clock):
+    def read(self):
+        return time.time()
+
+class SimulatedClock(Clock):
+    """
+    Advances by step every tick. With a step of 0 it only moves through
+    set() and advance().
+    """
+    def __init__(self, start = 0.0, step = FRAME_LENGTH):
+        self.step = step
+        self.time = start
+
+    def read(self):
+        return self.time + self.step
+
+    def set(self, now):
+        self.time = now
+
+    def advance(self, seconds):
+        self.time += seconds
+
+class AcceleratedClock(Clock):
+    """
+    Runs factor times faster than wall time, starting from start (by
+    default the current wall time).
+    """
+    def __init__(self, factor = 1.0, start = None):
+        self.factor = factor
+        self.realStart = time.time()
+        if start is None:
+            start = self.realStart
+        self.start = start
+        Clock.__init__(self)
+
+    def read(self):
+        return self.start + (time.time() - self.realStart)*self.factor
+
+    def setFactor(self, factor):
+        """Changes speed without jumping the time."""
+        self.start = self.read()
+        self.realStart = time.time()
+        self.factor = factor
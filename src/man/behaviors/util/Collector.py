@@ -0,0 +1,101 @@
+"""
+Collector.py - garbage collection on Brain's schedule
+
+CPython's cyclic collector runs whenever allocations pass a threshold,
+which can put a full collection in the middle of a frame. FrameCollector
+turns automatic collection off and collects at the end of each frame
+instead:
+
+ - the young generation, once it is over gc's own threshold and the frame
+   has at least GEN0_SLACK left of its budget
+ - the middle generation as well, when it is due and there is GEN1_SLACK
+ - everything, once on entering a state where the robot is not moving
+   (SAFE_STATES), or during play if MAX_GEN1_RUNS middle collections have
+   piled up without one
+
+Collections are timed into the FrameTimer as 'gc0', 'gc1' and 'gc2'.
+"""
+import gc
+import time
+
+from . import FrameTimer
+
+# Player states where a full collection cannot disturb anything
+SAFE_STATES = ('gamePenalized', 'gameFinished', 'gameInitial')
+
+# Seconds left in the frame needed to collect each generation
+GEN0_SLACK = 0.002
+GEN1_SLACK = 0.008
+
+# Young collections skipped for lack of time before one is forced
+MAX_POSTPONED = 30
+
+# Middle collections since the last full one before one is forced
+MAX_GEN1_RUNS = 1000
+
+PHASES = ('gc0', 'gc1', 'gc2')
+
+class FrameCollector(object):
+    def __init__(self, timer, budget = FrameTimer.FRAME_BUDGET,
+                 timeFunction = time.time):
+        self.timer = timer
+        self.budget = budget
+        self.getTime = timeFunction
+        self.thresholds = gc.get_threshold()
+        self.enabled = False
+        self.inSafeState = False
+
+        self.collections = [0, 0, 0]
+        self.collected = 0
+        self.postponed = 0
+
+    def start(self):
+        """Takes collection over from the interpreter."""
+        self.thresholds = gc.get_threshold()
+        gc.disable()
+        self.enabled = True
+
+    def stop(self):
+        """Hands collection back to the interpreter."""
+        gc.enable()
+        self.enabled = False
+
+    def collect(self, generation):
+        start = self.getTime()
+        self.collected += gc.collect(generation)
+        self.timer.record(PHASES[generation], self.getTime() - start)
+        self.collections[generation] += 1
+
+    def endFrame(self, state):
+        """Called by Brain once the frame's work is done."""
+        if not self.enabled:
+            return
+
+        if state in SAFE_STATES:
+            if not self.inSafeState:
+                self.inSafeState = True
+                self.collect(2)
+                return
+        else:
+            self.inSafeState = False
+
+        count0, count1, count2 = gc.get_count()
+        if count0 < self.thresholds[0]:
+            return
+
+        if count2 >= MAX_GEN1_RUNS:
+            self.collect(2)
+            return
+
+        slack = self.budget
+        if self.timer.enabled:
+            slack -= self.timer.frameElapsed()
+        if slack < GEN0_SLACK and self.postponed < MAX_POSTPONED:
+            self.postponed += 1
+            return
+        self.postponed = 0
+
+        if count1 >= self.thresholds[1] and slack >= GEN1_SLACK:
+            self.collect(1)
+        else:
+            self.collect(0)
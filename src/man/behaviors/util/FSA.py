@@ -1,7 +1,13 @@
 """
 This file contains an implementation of a finite state automaton.
 """
+import importlib
 import time
+from types import FunctionType
+
+from . import Log
+from . import StateStats
+from . import Transition
 
 DEBUG = False
 
@@ -9,6 +15,12 @@ DEBUG = False
 THIS_FRAME = True
 NEXT_FRAME = False
 
+# State id of any name that is not a registered state
+NO_STATE = -1
+
+# States run() may go through in one frame before it ends the frame
+MAX_HOPS = 10
+
 # ANSI terminal color codes
 # http://pueblo.sourceforge.net/doc/manual/ansi_color_codes.html
 RESET_COLORS_CODE = '\033[0m'
@@ -30,12 +42,30 @@ CYAN_BG_COLOR_CODE = '\033[46m'
 WHITE_BG_COLOR_CODE = '\033[47m'
 BLACK_BG_COLOR_CODE = '\033[49m'
 
+class StateData:
+    """
+    An FSA's per state data, by state name: fsa.stateData.walking is the
+    walking state's. Each is an instance of the class the state's module
+    lists in its STATE_DATA, made when the module's states are added.
+    """
+    pass
+
 class FSA:
     """ Finite State Automaton implementation.
 
     Direct subclasses of this class should be made for the create application.
     (i.e. behaviors, motion, etc.).
 
+    States are registered into a table and run by integer id; state names
+    are kept for switchTo(), goNow()/goLater() and printing.
+
+    Data a state keeps between frames lives in stateData, one object per
+    state and FSA, so that FSAs running the same states don't share it.
+
+    A frame runs at most maxHops states. A goNow() that takes a hop, from
+    one state to another, already taken this frame is a cycle: the frame
+    ends there, the chain is reported once, and the state it went to runs
+    next frame. Going back to a state by another hop (A -> B -> A) is not.
     """
     def __init__(self, owner):
         self.owner = owner
@@ -50,60 +80,252 @@ class FSA:
         self.startTime = 0
         self.stateTime = 0
         self.lastStateTime = 0
-        self.states = dict()
+
+        # name : id, and id : function, name
+        self.stateIds = dict()
+        self.stateTable = []
+        self.stateNames = []
+        self.currentStateId = NO_STATE
+        self.lastStateId = NO_STATE
+        # state modules imported when one of their states is first needed
+        self.laterModules = []
+        # state name : its compiled transitions, see addTransitions()
+        self.transitionTable = dict()
+        # the transition that made the last switch and the state it left
+        self.incomingTransition = None
+        self.incomingState = None
+        # per state data, see StateData
+        self.stateData = StateData()
+
+        # states run per frame; hopCounts[n] counts frames that ran n
+        self.maxHops = MAX_HOPS
+        self.hops = 0
+        self.hopCounts = [0]*(MAX_HOPS + 1)
+        self.cycles = 0
+        self.overHops = 0
+        self.reportedChains = set()
+
+        # per state frames, residency and cost, and the transitions
+        self.stats = StateStats.StateStats()
 
         self.getTime = time.time
+        # times the state functions themselves in CPU seconds, unlike the
+        # frame clock, so time the process spends descheduled isn't charged
+        # to whichever state was running (time.clock is CPU time on Linux)
+        self.getCostTime = time.clock
 
         #debug switches
         self.stateChangeColor = ''
         self.printStateChanges = False
 
     def addStates(self,module):
-        # gives a list of all methods and attributes of a module
+        """
+        Adds the states of a module: the names listed in its STATES if it
+        declares them, otherwise every function defined in it (but not
+        the helpers and classes it imports). A module whose states keep
+        data lists {state name : data class} in STATE_DATA.
+        """
         if DEBUG: print "Listing states loaded:"
-        for candidate in dir(module):
-            attribute = getattr(module,candidate)
-            if callable(attribute):
-                if DEBUG: print candidate
-                self.states[candidate] = attribute
+        names = getattr(module, 'STATES', None)
+        if names is None:
+            names = sorted(name for name, attribute in vars(module).iteritems()
+                           if isinstance(attribute, FunctionType) and
+                           attribute.__module__ == module.__name__)
+        for name in names:
+            if DEBUG: print name
+            self.addState(name, getattr(module, name))
+        for name, dataClass in getattr(module, 'STATE_DATA', {}).iteritems():
+            if not hasattr(self.stateData, name):
+                setattr(self.stateData, name, dataClass())
 
     def addState(self, name, method):
+        """A state added again under the same name replaces the old one."""
         if callable(method):
             if DEBUG: print "Additional state loaded:", name
-            self.states[name] = method
+            stateId = self.stateIds.get(name)
+            if stateId is None:
+                self.stateIds[name] = len(self.stateTable)
+                self.stateTable.append(method)
+                self.stateNames.append(name)
+                self.stats.addState()
+            else:
+                self.stateTable[stateId] = method
+
+    def addTransitions(self, spec):
+        """
+        Adds the transitions of a spec, see Transition.compileTransitions().
+        A state given transitions again has them replaced.
+        """
+        self.transitionTable.update(Transition.compileTransitions(spec))
+
+    def addStatesLater(self, moduleName):
+        """
+        Adds the states of moduleName, a module in the same package as
+        this FSA's class, but only imports it when a state that is not
+        registered yet is first asked for. Its states must not share names
+        with states added before it.
+        """
+        self.laterModules.append(moduleName)
+
+    def loadStatesFor(self, name):
+        """
+        Imports the modules given to addStatesLater(), in order, until
+        one of them has the state name; returns its id.
+        """
+        package = self.__class__.__module__.rpartition('.')[0]
+        while self.laterModules:
+            moduleName = self.laterModules.pop(0)
+            self.addStates(importlib.import_module('.' + moduleName, package))
+            if name in self.stateIds:
+                return self.stateIds[name]
+        return NO_STATE
+
+    def stateId(self, name):
+        stateId = self.stateIds.get(name, NO_STATE)
+        if stateId == NO_STATE and self.laterModules and name:
+            stateId = self.loadStatesFor(name)
+        return stateId
+
+    def syncStateId(self):
+        """
+        Returns the id of currentState, looking it up only when the name
+        was changed without going through run() or switchTo().
+        """
+        stateId = self.currentStateId
+        if (stateId == NO_STATE or
+            self.stateNames[stateId] is not self.currentState):
+            stateId = self.currentStateId = self.stateId(self.currentState)
+        return stateId
 
     def run(self):
         """ Called once every frame by Brain.
         Controls the flow of states for the current frame."""
 
+        table = self.stateTable
+        stateIds = self.stateIds
+        costTime = self.getCostTime
+        ranState = self.stats.ran
+        stateId = self.syncStateId()
+        # ids of the states run this frame, in order, and the hops between
+        ran = []
+        hops = set()
+
         stayInFrame = True
         # Switches through states until one relinquishes control of the frame
         # by returning NEXT_FRAME
         while stayInFrame:
+            if ran:
+                hop = (ran[-1], stateId)
+                if hop in hops:
+                    self.cycles += 1
+                    self.reportHops("goNow cycle", ran, stateId)
+                    break
+                hops.add(hop)
+                if len(ran) >= self.maxHops:
+                    self.overHops += 1
+                    self.reportHops("Ran out of hops", ran, stateId)
+                    break
+
             # grab the method which describes what the current state does
-            try:
-                methodCall = self.states[self.currentState]
-            except KeyError:
+            if stateId == NO_STATE:
                 self.printf("Attempted to change to non-existent state: \"" +
                             self.currentState + "\" from state \"" +
                             self.lastState + "\"!")
-                raise
+                raise KeyError(self.currentState)
+            methodCall = table[stateId]
+            ran.append(stateId)
             # execute the state
             if DEBUG:
                 print self.name
                 print " DEBUG: current state = ",self.currentState
 
+            start = costTime()
             try:
                 (stayInFrame, nextState) = methodCall(self)
             except TypeError:
                 self.printf("Forgot to return next state in state \"" +
                             self.currentState + "\"!")
                 raise
+            ranState(stateId, costTime() - start)
 
             self.lastState = self.currentState
+            self.lastStateId = stateId
+            # stay() hands back the current name itself
+            if nextState is not self.lastState:
+                stateId = stateIds.get(nextState)
+                if stateId is None:
+                    stateId = self.stateId(nextState)
             self.currentState = nextState
+            self.currentStateId = stateId
             self.updateStateInfo()
 
+        self.hops = count = len(ran)
+        hopCounts = self.hopCounts
+        if count >= len(hopCounts):
+            hopCounts.extend([0]*(count + 1 - len(hopCounts)))
+        hopCounts[count] += 1
+
+    def reportHops(self, problem, ran, stateId):
+        """Logs the chain of states that ended a frame, once per chain."""
+        chain = tuple(ran) + (stateId,)
+        if chain in self.reportedChains:
+            return
+        self.reportedChains.add(chain)
+        names = self.stateNames
+        Log.getLogger(self.name).warning(
+            "%s: %s, next frame starts in '%s': %s", self.name, problem,
+            names[stateId], ' -> '.join([names[i] for i in chain]))
+
+    def dumpHops(self, outputFunction = None):
+        """Writes how many frames ran each number of states."""
+        if outputFunction is None:
+            outputFunction = Log.printLine
+        outputFunction("%s: %d goNow cycles, %d frames out of hops (max %d)" %
+                       (self.name, self.cycles, self.overHops, self.maxHops))
+        for hops, frames in enumerate(self.hopCounts):
+            if frames:
+                outputFunction("  %2d states %7d frames" % (hops, frames))
+
+    def exportStats(self):
+        """
+        The FSA's accounting in one dict: per state frames, residency and
+        cost in seconds, transition counts and costs by from and to state,
+        the recent transitions as (time, from, to), and the hop counts.
+        """
+        stats = self.stats.export(self.stateNames, self.syncStateId(),
+                                  self.getTime() - self.startTime)
+        stats['name'] = self.name
+        stats['hopCounts'] = list(self.hopCounts)
+        stats['cycles'] = self.cycles
+        stats['overHops'] = self.overHops
+        return stats
+
+    def dumpStats(self, outputFunction = None, limit = 10):
+        """Writes the costliest states and the most taken transitions."""
+        if outputFunction is None:
+            outputFunction = Log.printLine
+        stats = self.exportStats()
+        states = sorted(stats['states'].iteritems(),
+                        key = lambda item: -item[1]['cost'])
+        outputFunction("%s: states by cost" % self.name)
+        for name, state in states[:limit]:
+            if state['frames']:
+                outputFunction("  %-28s frames %7d in state %9.2fs "
+                               "cost %8.3fms" %
+                               (name, state['frames'], state['residency'],
+                                state['cost']*1000))
+        transitions = sorted(((count, fromName, toName)
+                              for fromName, to in
+                              stats['transitions'].iteritems()
+                              for toName, count in to.iteritems()),
+                             reverse = True)
+        outputFunction("%s: transitions" % self.name)
+        for count, fromName, toName in transitions[:limit]:
+            outputFunction("  %7d  %s -> %s" % (count, fromName, toName))
+
+    def setMaxHops(self, maxHops):
+        self.maxHops = maxHops
+
     def stay(self):
         """
         Used by states to indicate that the FSA should stay in its
@@ -137,13 +359,7 @@ class FSA:
         '''
         allows changing the getTime function to something like time.time()
         '''
-        self.timeTime = newTimeFunction
-
-    def setPrintFunction(self,newPrintFunction):
-        '''
-        allows changing the printing to use new function like printf(string)
-        '''
-        self.outputFunction = newPrintFunction
+        self.getTime = newTimeFunction
 
     def setName(self,string):
         self.name = string
@@ -151,32 +367,13 @@ class FSA:
     def setHelperName(self,string):
         self.helperName = string
 
-    def outputFunction(self, str):
-        ''' default print method for the FSA '''
-        print str
-
-    def printf(self,outputString, printingColor='green'):
-        '''FSA print function that allows colors to be specified'''
-        if printingColor == 'red':
-            self.outputFunction(RED_COLOR_CODE + str(outputString) + RESET_COLORS_CODE)
-        elif printingColor == 'blue':
-            self.outputFunction(BLUE_COLOR_CODE + str(outputString) + RESET_COLORS_CODE)
-        elif printingColor == 'yellow':
-            self.outputFunction(YELLOW_COLOR_CODE + str(outputString) + RESET_COLORS_CODE)
-        elif printingColor == 'cyan':
-            self.outputFunction(CYAN_COLOR_CODE + str(outputString) + RESET_COLORS_CODE)
-        elif printingColor == 'purple':
-            self.outputFunction(PURPLE_COLOR_CODE + str(outputString) + RESET_COLORS_CODE)
-        elif printingColor == 'purplebg':
-            self.outputFunction(PURPLE_BG_COLOR_CODE + str(outputString) + RESET_COLORS_CODE)
-        elif printingColor == 'whitebg':
-            self.outputFunction(WHITE_BG_COLOR_CODE + str(outputString) + RESET_COLORS_CODE)
-        elif printingColor == 'greenbg':
-            self.outputFunction(GREEN_BG_COLOR_CODE + str(outputString) + RESET_COLORS_CODE)
-        else: #elif printingColor == 'green':
-            self.outputFunction(GREEN_COLOR_CODE + str(outputString) + RESET_COLORS_CODE)
-        # else:
-        #     self.outputFunction(str(outputString))
+    def printf(self, outputString, printingColor='green'):
+        '''
+        FSA print function that allows colors to be specified. Goes through
+        the log (see util/Log), under this FSA's name.
+        '''
+        Log.getLogger(self.name).log(Log.INFO, str(outputString),
+                                     color = printingColor or 'green')
 
     def updateStateInfo(self):
         """
@@ -184,18 +381,26 @@ class FSA:
         we store in this class is up to date.
         """
         # reseting the state counter + state timer when we switch states.
-        if self.currentState != self.lastState:
+        changed = self.currentStateId != self.lastStateId
+        if self.currentStateId == NO_STATE:
+            changed = self.currentState != self.lastState
+        if changed:
             #debug prints
             if self.printStateChanges:
-                self.printf(self.name+": switched to '"+
-                            self.currentState+"\' after " +
-                            str(self.counter + 1) +
-                            " frames in state \'"+self.lastState+"\'",
-                            self.stateChangeColor)
+                # formatted by the log's writer thread
+                Log.getLogger(self.name).log(
+                    Log.INFO,
+                    "%s: switched to '%s' after %d frames in state '%s'",
+                    (self.name, self.currentState, self.counter + 1,
+                     self.lastState),
+                    self.stateChangeColor or 'green')
+            now = self.getTime()
+            self.stats.switched(self.lastStateId, self.currentStateId, now,
+                                now - self.startTime)
             self.lastDiffState = self.lastState
             self.counter = 0
             self.lastStateTime = self.stateTime
-            self.startTime = self.getTime()
+            self.startTime = now
             self.stateTime = 0
         else:
             self.counter +=1
@@ -224,7 +429,11 @@ class FSA:
 
         elif self.currentState == newState:
             return
+        self.lastStateId = self.syncStateId()
         self.lastState = self.currentState
         self.currentState = newState
+        self.currentStateId = self.stateId(newState)
+        # no state function made this switch
+        self.stats.hopCost = 0.0
 
         self.updateStateInfo()
@@ -0,0 +1,534 @@
+"""
+FieldIndex.py - the field's lines, posts and robots, indexed by place
+
+A FieldIndex files every feature under the cells of a uniform grid over
+the field that its bounding box covers. A query walks only the cells its
+segment passes through, in order, or the rings of cells around its
+point, so it tests the few features near it instead of all of them, and
+a first hit ends the walk.
+
+Features are segments (the white lines), discs (posts, robots, obstacles)
+and rings (the center circle, which only its outline can hit). Each
+belongs to a group, and queries can be limited to some groups:
+
+    index = FieldIndex.field()
+    index.segmentHits(my.x, my.y, ball.x, ball.y, FieldIndex.MY_GOALBOX)
+
+field() is the static field, built from noggin_constants once and shared.
+Teammates and obstacles move, so they go in an index of one's own that
+shares the static part, refreshed with setDynamic() when they do:
+
+    index = FieldIndex.FieldIndex(FieldIndex.field())
+    index.setDynamic(FieldIndex.TEAMMATE, [(name, x, y, radius), ...])
+"""
+import math
+
+import noggin_constants as NogginConstants
+
+from Geometry import segmentsIntersect
+
+# Groups of features
+LINE = 'line'
+MY_GOALBOX = 'myGoalbox'
+OPP_GOALBOX = 'oppGoalbox'
+CENTER_CIRCLE = 'centerCircle'
+POST = 'post'
+TEAMMATE = 'teammate'
+OBSTACLE = 'obstacle'
+
+# Kinds of features
+SEGMENT = 0
+DISC = 1
+RING = 2
+
+# Side of a grid cell, cm
+CELL_SIZE = 50.0
+
+# Radius a robot takes up, cm
+ROBOT_RADIUS = 15.0
+
+# Features are filed in every cell within this of their bounding boxes, so
+# rounding as a query walks the grid can't skip one at a cell's edge
+FILE_MARGIN = 0.01
+
+class Feature(object):
+    """
+    A segment from (x1, y1) to (x2, y2), or a disc or ring of radius
+    around (x1, y1), named name and in group.
+    """
+    __slots__ = ('name', 'group', 'kind', 'x1', 'y1', 'x2', 'y2', 'radius',
+                 'box')
+
+    def __init__(self, name, group, kind, x1, y1, x2, y2, radius = 0.0):
+        self.name = name
+        self.group = group
+        self.kind = kind
+        self.x1 = x1
+        self.y1 = y1
+        self.x2 = x2
+        self.y2 = y2
+        self.radius = radius
+        if kind == SEGMENT:
+            self.box = (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+        else:
+            self.box = (x1 - radius, y1 - radius, x1 + radius, y1 + radius)
+
+    def __repr__(self):
+        return "Feature(%s)" % self.name
+
+    def hit(self, x1, y1, x2, y2):
+        """
+        Where the segment from (x1, y1) to (x2, y2) first meets this, as a
+        fraction of the way along it, or None if it doesn't.
+        """
+        dx = x2 - x1
+        dy = y2 - y1
+        if self.kind == SEGMENT:
+            if not segmentsIntersect(x1, y1, x2, y2,
+                                     self.x1, self.y1, self.x2, self.y2):
+                return None
+            ex = self.x2 - self.x1
+            ey = self.y2 - self.y1
+            denominator = dx*ey - dy*ex
+            if denominator != 0.:
+                return max(0., min(1., ((self.x1 - x1)*ey -
+                                        (self.y1 - y1)*ex)/denominator))
+            # in line: the nearer end of the overlap
+            length2 = dx*dx + dy*dy
+            if length2 == 0.:
+                return 0.
+            return max(0., min(((self.x1 - x1)*dx + (self.y1 - y1)*dy),
+                               ((self.x2 - x1)*dx + (self.y2 - y1)*dy))/
+                       length2)
+
+        # where the segment meets the circle: a*t^2 + 2*b*t + c = 0
+        fx = x1 - self.x1
+        fy = y1 - self.y1
+        a = dx*dx + dy*dy
+        b = fx*dx + fy*dy
+        c = fx*fx + fy*fy - self.radius*self.radius
+        if c == 0. or (c < 0. and self.kind == DISC):
+            return 0.
+        discriminant = b*b - a*c
+        if a == 0. or discriminant < 0.:
+            return None
+        if c < 0.:
+            # from inside a ring, out through it
+            t = (-b + math.sqrt(discriminant))/a
+        else:
+            t = (-b - math.sqrt(discriminant))/a
+        if not 0. <= t <= 1.:
+            return None
+        return t
+
+    def distanceTo(self, x, y):
+        """The distance from (x, y) to the nearest point of this."""
+        if self.kind == SEGMENT:
+            ex = self.x2 - self.x1
+            ey = self.y2 - self.y1
+            length2 = ex*ex + ey*ey
+            if length2 == 0.:
+                t = 0.
+            else:
+                t = max(0., min(1., ((x - self.x1)*ex + (y - self.y1)*ey)/
+                                length2))
+            return math.hypot(x - self.x1 - t*ex, y - self.y1 - t*ey)
+        distance = math.hypot(x - self.x1, y - self.y1) - self.radius
+        if self.kind == DISC:
+            return max(0., distance)
+        return math.fabs(distance)
+
+def _accepts(groups, feature):
+    return groups is None or feature.group in groups
+
+def _overlap(box, other):
+    return not (other[0] > box[2] or other[2] < box[0] or
+                other[1] > box[3] or other[3] < box[1])
+
+def _boxDistance(box, x, y):
+    """A lower bound on the distance from (x, y) to anything in box."""
+    return max(box[0] - x, x - box[2], box[1] - y, y - box[3], 0.)
+
+def _boxGap(box, other):
+    """The distance between the nearest points of two boxes."""
+    return math.hypot(max(other[0] - box[2], box[0] - other[2], 0.),
+                      max(other[1] - box[3], box[1] - other[3], 0.))
+
+class FieldIndex(object):
+    """
+    Features on a grid of CELL_SIZE cells over the green field. A new
+    index is empty, or shares the static features of base.
+    """
+    def __init__(self, base = None, cellSize = CELL_SIZE,
+                 width = NogginConstants.FIELD_GREEN_WIDTH,
+                 height = NogginConstants.FIELD_GREEN_HEIGHT):
+        if base is not None:
+            cellSize, width, height = base.cellSize, base.width, base.height
+        self.cellSize = cellSize
+        self.width = width
+        self.height = height
+        self.columns = max(1, int(math.ceil(width/cellSize)))
+        self.rows = max(1, int(math.ceil(height/cellSize)))
+
+        if base is not None:
+            self.features = base.features
+            self.groups = base.groups
+            self._cells = base._cells
+            self._outside = base._outside
+            self._near = base._near
+        else:
+            self.features = []
+            # the static features' groups
+            self.groups = []
+            # (column, row) : [features]
+            self._cells = dict()
+            # features not wholly on the grid, tested by every query
+            self._outside = []
+            # (cell, group) : static features that can be nearest in cell
+            self._near = dict()
+
+        # group : [features], and the dynamic features' own cells
+        self.dynamic = dict()
+        self._dynamicCells = dict()
+        self._dynamicOutside = []
+
+    # Building
+
+    def _file(self, feature, cells, outside):
+        left, bottom, right, top = feature.box
+        if (left < 0. or bottom < 0. or
+            right > self.width or top > self.height):
+            outside.append(feature)
+        firstColumn, firstRow = self._cell(left - FILE_MARGIN,
+                                           bottom - FILE_MARGIN)
+        lastColumn, lastRow = self._cell(right + FILE_MARGIN,
+                                         top + FILE_MARGIN)
+        for column in xrange(firstColumn, lastColumn + 1):
+            for row in xrange(firstRow, lastRow + 1):
+                cells.setdefault((column, row), []).append(feature)
+
+    def add(self, feature):
+        """Adds a static feature, to every index sharing them."""
+        self.features.append(feature)
+        if feature.group not in self.groups:
+            self.groups.append(feature.group)
+        self._near.clear()
+        self._file(feature, self._cells, self._outside)
+        return feature
+
+    def addSegment(self, name, group, x1, y1, x2, y2):
+        return self.add(Feature(name, group, SEGMENT, x1, y1, x2, y2))
+
+    def addDisc(self, name, group, x, y, radius):
+        return self.add(Feature(name, group, DISC, x, y, x, y, radius))
+
+    def addRing(self, name, group, x, y, radius):
+        return self.add(Feature(name, group, RING, x, y, x, y, radius))
+
+    def setDynamic(self, group, discs):
+        """
+        Replaces the dynamic features of group with discs, a list of
+        (name, x, y, radius).
+        """
+        self.dynamic[group] = [Feature(name, group, DISC, x, y, x, y, radius)
+                               for name, x, y, radius in discs]
+        self._dynamicCells = dict()
+        self._dynamicOutside = []
+        for features in self.dynamic.itervalues():
+            for feature in features:
+                self._file(feature, self._dynamicCells, self._dynamicOutside)
+
+    def setRobots(self, group, robots):
+        """setDynamic with a ROBOT_RADIUS disc at each robot's x and y."""
+        self.setDynamic(group, [(getattr(robot, 'playerNumber', None),
+                                 robot.x, robot.y, ROBOT_RADIUS)
+                                for robot in robots])
+
+    def clearDynamic(self):
+        self.dynamic = dict()
+        self._dynamicCells = dict()
+        self._dynamicOutside = []
+
+    # Grid
+
+    def _cell(self, x, y):
+        """The cell (x, y) is in, or the nearest one."""
+        column = int(x/self.cellSize)
+        row = int(y/self.cellSize)
+        return (min(max(column, 0), self.columns - 1),
+                min(max(row, 0), self.rows - 1))
+
+    def _inCell(self, cell):
+        return self._cells.get(cell, ()), self._dynamicCells.get(cell, ())
+
+    def _clip(self, x1, y1, x2, y2):
+        """
+        The fractions of the way from (x1, y1) to (x2, y2) between which
+        it is on the grid, or None if it never is.
+        """
+        start, end = 0., 1.
+        for delta, low, high, origin in ((x2 - x1, 0., self.width, x1),
+                                         (y2 - y1, 0., self.height, y1)):
+            if delta == 0.:
+                if not low <= origin <= high:
+                    return None
+                continue
+            near = (low - origin)/delta
+            far = (high - origin)/delta
+            if near > far:
+                near, far = far, near
+            start = max(start, near)
+            end = min(end, far)
+            if start > end:
+                return None
+        return start, end
+
+    def _walk(self, x1, y1, x2, y2):
+        """
+        The cells the segment from (x1, y1) to (x2, y2) passes through, in
+        order, each with the fraction of the way along at which it leaves.
+        """
+        clipped = self._clip(x1, y1, x2, y2)
+        if clipped is None:
+            return
+        start, end = clipped
+        dx = x2 - x1
+        dy = y2 - y1
+        size = self.cellSize
+        column, row = self._cell(x1 + start*dx, y1 + start*dy)
+        lastColumn, lastRow = self._cell(x1 + end*dx, y1 + end*dy)
+
+        if dx > 0.:
+            stepX, nextX = 1, ((column + 1)*size - x1)/dx
+        elif dx < 0.:
+            stepX, nextX = -1, (column*size - x1)/dx
+        else:
+            stepX, nextX = 0, float('inf')
+        if dy > 0.:
+            stepY, nextY = 1, ((row + 1)*size - y1)/dy
+        elif dy < 0.:
+            stepY, nextY = -1, (row*size - y1)/dy
+        else:
+            stepY, nextY = 0, float('inf')
+        deltaX = size/abs(dx) if dx else float('inf')
+        deltaY = size/abs(dy) if dy else float('inf')
+
+        while True:
+            leave = min(nextX, nextY, end)
+            yield (column, row), leave
+            if (column, row) == (lastColumn, lastRow) or leave >= end:
+                return
+            if nextX < nextY:
+                column += stepX
+                nextX += deltaX
+            else:
+                row += stepY
+                nextY += deltaY
+            if not (0 <= column < self.columns and 0 <= row < self.rows):
+                return
+
+    # Queries
+
+    def firstHit(self, x1, y1, x2, y2, groups = None):
+        """
+        (distance, feature) of the first feature along the segment from
+        (x1, y1) to (x2, y2), or None if it meets none of groups.
+        """
+        best = None
+        bestT = 2.
+        box = (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+        tested = set()
+        for feature in self._outside + self._dynamicOutside:
+            tested.add(feature)
+            if _accepts(groups, feature) and _overlap(box, feature.box):
+                t = feature.hit(x1, y1, x2, y2)
+                if t is not None and t < bestT:
+                    best, bestT = feature, t
+
+        for cell, leave in self._walk(x1, y1, x2, y2):
+            for features in self._inCell(cell):
+                for feature in features:
+                    if feature in tested:
+                        continue
+                    tested.add(feature)
+                    if (not _accepts(groups, feature) or
+                        not _overlap(box, feature.box)):
+                        continue
+                    t = feature.hit(x1, y1, x2, y2)
+                    if t is not None and t < bestT:
+                        best, bestT = feature, t
+            # nothing in a later cell can be hit sooner
+            if bestT <= leave:
+                break
+
+        if best is None:
+            return None
+        return bestT*math.hypot(x2 - x1, y2 - y1), best
+
+    def segmentHits(self, x1, y1, x2, y2, groups = None):
+        """Whether the segment from (x1, y1) to (x2, y2) meets any feature."""
+        box = (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+        tested = set()
+        for feature in self._outside + self._dynamicOutside:
+            tested.add(feature)
+            if (_accepts(groups, feature) and _overlap(box, feature.box) and
+                feature.hit(x1, y1, x2, y2) is not None):
+                return True
+
+        for cell, leave in self._walk(x1, y1, x2, y2):
+            for features in self._inCell(cell):
+                for feature in features:
+                    if feature in tested:
+                        continue
+                    tested.add(feature)
+                    if (_accepts(groups, feature) and
+                        _overlap(box, feature.box) and
+                        feature.hit(x1, y1, x2, y2) is not None):
+                        return True
+        return False
+
+    def rayHit(self, x, y, heading, maxDistance = None, groups = None):
+        """
+        firstHit along the ray from (x, y) heading degrees, out to
+        maxDistance or off the grid.
+        """
+        if maxDistance is None:
+            maxDistance = math.hypot(self.width, self.height) + \
+                math.hypot(x, y)
+        radians = math.radians(heading)
+        return self.firstHit(x, y,
+                             x + maxDistance*math.cos(radians),
+                             y + maxDistance*math.sin(radians), groups)
+
+    def nearest(self, x, y, groups = None):
+        """
+        (distance, feature) of the feature of groups nearest to (x, y), or
+        None if there are none.
+        """
+        best = None
+        bestDistance = float('inf')
+        if 0. <= x <= self.width and 0. <= y <= self.height:
+            cell = self._cell(x, y)
+            static = []
+            for group in (self.groups if groups is None else groups):
+                static.extend(self._nearCandidates(cell, group))
+        else:
+            static = self.features
+
+        for features in (static, self._dynamicFeatures()):
+            for feature in features:
+                if (not _accepts(groups, feature) or
+                    _boxDistance(feature.box, x, y) >= bestDistance):
+                    continue
+                distance = feature.distanceTo(x, y)
+                if distance < bestDistance:
+                    best, bestDistance = feature, distance
+
+        if best is None:
+            return None
+        return bestDistance, best
+
+    def _dynamicFeatures(self):
+        return [feature for features in self.dynamic.itervalues()
+                for feature in features]
+
+    def _nearCandidates(self, cell, group):
+        """
+        The static features of group that can be nearest to some point of
+        cell: those that can come closer to it than the farthest any one
+        of them gets. Worked out once per cell and group.
+        """
+        candidates = self._near.get((cell, group))
+        if candidates is not None:
+            return candidates
+        column, row = cell
+        left, bottom = column*self.cellSize, row*self.cellSize
+        cellBox = (left, bottom, left + self.cellSize, bottom + self.cellSize)
+        corners = ((cellBox[0], cellBox[1]), (cellBox[0], cellBox[3]),
+                   (cellBox[2], cellBox[1]), (cellBox[2], cellBox[3]))
+
+        features = [feature for feature in self.features
+                    if feature.group == group]
+        farthest = float('inf')
+        for feature in features:
+            if feature.kind == RING:
+                # far from the outline is at most far from the center,
+                # plus the radius
+                reach = max(math.hypot(x - feature.x1, y - feature.y1)
+                            for x, y in corners) + feature.radius
+            else:
+                # distance to a segment or disc is convex, so it is
+                # greatest at a corner
+                reach = max(feature.distanceTo(x, y) for x, y in corners)
+            farthest = min(farthest, reach)
+        candidates = [feature for feature in features
+                      if _boxGap(cellBox, feature.box) <= farthest]
+        self._near[(cell, group)] = candidates
+        return candidates
+
+    # Batches
+
+    def segmentsHit(self, segments, groups = None):
+        """segmentHits for each (x1, y1, x2, y2) of segments."""
+        return [self.segmentHits(x1, y1, x2, y2, groups)
+                for x1, y1, x2, y2 in segments]
+
+    def firstHits(self, x, y, ends, groups = None):
+        """firstHit from (x, y) to each (x, y) of ends, as from a ball."""
+        return [self.firstHit(x, y, endX, endY, groups)
+                for endX, endY in ends]
+
+    def nearestEach(self, points, groups = None):
+        """nearest for each (x, y) of points."""
+        return [self.nearest(x, y, groups) for x, y in points]
+
+def _buildField():
+    C = NogginConstants
+    index = FieldIndex()
+    left = C.FIELD_WHITE_LEFT_SIDELINE_X
+    right = C.FIELD_WHITE_RIGHT_SIDELINE_X
+    bottom = C.FIELD_WHITE_BOTTOM_SIDELINE_Y
+    top = C.FIELD_WHITE_TOP_SIDELINE_Y
+
+    index.addSegment('topSideline', LINE, left, top, right, top)
+    index.addSegment('bottomSideline', LINE, left, bottom, right, bottom)
+    index.addSegment('myEndline', LINE, left, bottom, left, top)
+    index.addSegment('oppEndline', LINE, right, bottom, right, top)
+    index.addSegment('midline', LINE, C.MIDFIELD_X, bottom, C.MIDFIELD_X, top)
+
+    # the goalboxes' sides off the endlines
+    for name, group, endX, frontX, boxBottom, boxTop in (
+        ('my', MY_GOALBOX, C.MY_GOALBOX_LEFT_X, C.MY_GOALBOX_RIGHT_X,
+         C.MY_GOALBOX_BOTTOM_Y, C.MY_GOALBOX_TOP_Y),
+        ('opp', OPP_GOALBOX, C.OPP_GOALBOX_RIGHT_X, C.OPP_GOALBOX_LEFT_X,
+         C.OPP_GOALBOX_BOTTOM_Y, C.OPP_GOALBOX_TOP_Y)):
+        index.addSegment(name + 'GoalboxTop', group,
+                         endX, boxTop, frontX, boxTop)
+        index.addSegment(name + 'GoalboxBottom', group,
+                         endX, boxBottom, frontX, boxBottom)
+        index.addSegment(name + 'GoalboxFront', group,
+                         frontX, boxBottom, frontX, boxTop)
+
+    index.addRing('centerCircle', CENTER_CIRCLE, C.CENTER_FIELD_X,
+                  C.CENTER_FIELD_Y, C.CENTER_CIRCLE_RADIUS)
+
+    for name, x, y in (
+        ('myLeftPost', C.LANDMARK_MY_GOAL_LEFT_POST_X,
+         C.LANDMARK_MY_GOAL_LEFT_POST_Y),
+        ('myRightPost', C.LANDMARK_MY_GOAL_RIGHT_POST_X,
+         C.LANDMARK_MY_GOAL_RIGHT_POST_Y),
+        ('oppLeftPost', C.LANDMARK_OPP_GOAL_LEFT_POST_X,
+         C.LANDMARK_OPP_GOAL_LEFT_POST_Y),
+        ('oppRightPost', C.LANDMARK_OPP_GOAL_RIGHT_POST_X,
+         C.LANDMARK_OPP_GOAL_RIGHT_POST_Y)):
+        index.addDisc(name, POST, x, y, C.GOAL_POST_RADIUS)
+    return index
+
+_field = None
+
+def field():
+    """The static field's features, shared; add no dynamic ones to it."""
+    global _field
+    if _field is None:
+        _field = _buildField()
+    return _field
@@ -0,0 +1,82 @@
+"""
+FrameCache.py - transition conditions computed at most once per frame
+
+Many transition conditions depend only on the frame's inputs (the ball,
+vision, loc), yet get asked for several times a frame: by several
+transitions, by other conditions, and again on every goNow hop.
+
+    @FrameCache.perFrame
+    def foundACorner(player):
+        ...
+
+The first call in a frame runs the condition; later calls in the same
+frame with the same argument return its value. Brain calls newFrame()
+when it takes the frame's snapshot, which invalidates every cached value.
+Only cache conditions that depend on nothing but the frame's inputs: not
+on player.counter, stateTime or anything the states change during the
+frame, and don't cache a single comparison like shouldChaseBall, which
+costs less than the cache. Each cached condition counts its hits and
+misses; see report().
+"""
+from . import Log
+
+# Bumped by Brain at the start of every frame
+frame = 0
+
+class Counts(object):
+    __slots__ = ('name', 'hits', 'misses')
+
+    def __init__(self, name):
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+
+counts = []
+
+def newFrame():
+    global frame
+    frame += 1
+
+def perFrame(function):
+    """Decorates a condition of one argument (the player or the nav)."""
+    stats = Counts(function.__module__.split('.')[-1] + '.' +
+                   function.__name__)
+    counts.append(stats)
+    # frame, argument and value of the last call
+    last = [-1, None, None]
+
+    def cached(argument):
+        if last[0] == frame and last[1] is argument:
+            stats.hits += 1
+            return last[2]
+        stats.misses += 1
+        value = function(argument)
+        last[0] = frame
+        last[1] = argument
+        last[2] = value
+        return value
+
+    cached.__name__ = function.__name__
+    cached.__doc__ = function.__doc__
+    cached.__module__ = function.__module__
+    cached.uncached = function
+    return cached
+
+def report():
+    """{condition name : (hits, misses)}"""
+    return dict((stats.name, (stats.hits, stats.misses)) for stats in counts)
+
+def dump(outputFunction = None):
+    """Writes the conditions that were called, most called first."""
+    if outputFunction is None:
+        outputFunction = Log.printLine
+    used = sorted([stats for stats in counts if stats.hits + stats.misses],
+                  key = lambda stats: -(stats.hits + stats.misses))
+    outputFunction("FrameCache: %d frames" % frame)
+    for stats in used:
+        outputFunction("  %-40s hits %7d misses %7d" %
+                       (stats.name, stats.hits, stats.misses))
+
+def reset():
+    for stats in counts:
+        stats.hits = stats.misses = 0
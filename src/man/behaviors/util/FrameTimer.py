@@ -0,0 +1,223 @@
+"""
+FrameTimer.py - low overhead timing of the phases of Brain.run
+
+Each phase of a frame is timed into a fixed size ring buffer of recent
+samples and a fixed bucket latency histogram, so nothing is allocated
+while the robot is playing. Percentiles are read off the histogram, which
+keeps queries cheap enough to make at runtime.
+"""
+import time
+from array import array
+from bisect import bisect_left
+
+from . import Log
+
+# Vision runs at 30 fps, so this is the whole frame
+FRAME_BUDGET = 1.0/30.0
+
+# Number of recent samples kept per phase
+RING_SIZE = 300
+
+# Histogram buckets are geometric from 10us to ~2s
+NUM_BUCKETS = 64
+MIN_BUCKET = 0.00001
+BUCKET_GROWTH = 1.21
+BUCKET_EDGES = [MIN_BUCKET * BUCKET_GROWTH**i for i in xrange(NUM_BUCKETS)]
+
+PERCENTILES = (0.5, 0.95, 0.99)
+
+class PhaseStats(object):
+    """
+    Latency record of one phase: a ring buffer of the most recent samples
+    and a histogram of every sample seen.
+    """
+    __slots__ = ('name', 'ring', 'index', 'buckets',
+                 'count', 'total', 'max', 'last')
+
+    def __init__(self, name, ringSize = RING_SIZE):
+        self.name = name
+        self.ring = array('d', [0.0]*ringSize)
+        self.index = 0
+        self.buckets = [0]*(NUM_BUCKETS + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def add(self, sample):
+        self.ring[self.index] = sample
+        self.index += 1
+        if self.index == len(self.ring):
+            self.index = 0
+        self.buckets[bisect_left(BUCKET_EDGES, sample)] += 1
+        self.count += 1
+        self.total += sample
+        self.last = sample
+        if sample > self.max:
+            self.max = sample
+
+    def percentile(self, p):
+        """
+        Upper edge of the bucket holding the p-th sample, so the true value
+        is at most one bucket (~20%) lower than what is returned.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = p * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                if i == NUM_BUCKETS:
+                    return self.max
+                return min(BUCKET_EDGES[i], self.max)
+        return self.max
+
+    def mean(self):
+        if self.count == 0:
+            return 0.0
+        return self.total / self.count
+
+    def recent(self):
+        """Returns the ring buffer contents, oldest first."""
+        size = min(self.count, len(self.ring))
+        if self.count <= len(self.ring):
+            return self.ring[:size].tolist()
+        return (self.ring[self.index:] + self.ring[:self.index]).tolist()
+
+    def summary(self):
+        stats = {'count' : self.count,
+                 'mean' : self.mean(),
+                 'max' : self.max,
+                 'last' : self.last}
+        for p in PERCENTILES:
+            stats['p' + str(int(p*100))] = self.percentile(p)
+        return stats
+
+    def reset(self):
+        for i in xrange(len(self.buckets)):
+            self.buckets[i] = 0
+        self.index = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+class FrameTimer(object):
+    """
+    Times the named phases of every frame.
+
+    Usage, once per frame:
+        timer.startFrame()
+        doSomething()
+        timer.mark('doSomething')
+        ...
+        timer.endFrame()
+
+    Each mark() charges the time since the previous mark (or the start of
+    the frame) to the named phase. Phases are created the first time they
+    are marked, after which a mark is a dict lookup and a few adds.
+    """
+
+    def __init__(self, budget = FRAME_BUDGET, ringSize = RING_SIZE,
+                 timeFunction = time.time):
+        self.budget = budget
+        self.ringSize = ringSize
+        self.getTime = timeFunction
+
+        self.enabled = True
+        self.phases = dict()
+        self.phaseOrder = []
+        self.frame = PhaseStats('frame', ringSize)
+
+        self.frames = 0
+        self.overBudget = 0
+        self.frameStart = 0.0
+        self.lastMark = 0.0
+
+    def setBudget(self, budget):
+        self.budget = budget
+
+    def startFrame(self):
+        if not self.enabled:
+            return
+        self.frameStart = self.lastMark = self.getTime()
+
+    def mark(self, name):
+        if not self.enabled:
+            return
+        now = self.getTime()
+        try:
+            phase = self.phases[name]
+        except KeyError:
+            phase = self.phases[name] = PhaseStats(name, self.ringSize)
+            self.phaseOrder.append(name)
+        phase.add(now - self.lastMark)
+        self.lastMark = now
+
+    def record(self, name, elapsed):
+        """
+        Adds a sample timed elsewhere to the named phase, without moving
+        the mark; for things that only happen on some frames.
+        """
+        if not self.enabled:
+            return
+        try:
+            phase = self.phases[name]
+        except KeyError:
+            phase = self.phases[name] = PhaseStats(name, self.ringSize)
+            self.phaseOrder.append(name)
+        phase.add(elapsed)
+
+    def endFrame(self):
+        if not self.enabled:
+            return
+        elapsed = self.getTime() - self.frameStart
+        self.frame.add(elapsed)
+        self.frames += 1
+        if elapsed > self.budget:
+            self.overBudget += 1
+
+    def frameElapsed(self):
+        """Time spent so far in the current frame."""
+        return self.getTime() - self.frameStart
+
+    def phase(self, name):
+        return self.phases.get(name)
+
+    def report(self):
+        """
+        Returns a dict of per phase latency summaries (seconds), plus the
+        whole frame under 'frame' and the over budget frame count.
+        """
+        report = dict((name, self.phases[name].summary())
+                      for name in self.phaseOrder)
+        report['frame'] = self.frame.summary()
+        report['frames'] = self.frames
+        report['overBudget'] = self.overBudget
+        report['budget'] = self.budget
+        return report
+
+    def dump(self, outputFunction = None):
+        """
+        Writes one line per phase in milliseconds. Meant for states where
+        the robot is not moving, like gamePenalized and gameFinished.
+        """
+        if outputFunction is None:
+            outputFunction = Log.printLine
+        outputFunction("FrameTimer: %d frames, %d over %.1fms budget" %
+                       (self.frames, self.overBudget, self.budget*1000))
+        for phase in [self.phases[n] for n in self.phaseOrder] + [self.frame]:
+            outputFunction("  %-20s p50 %7.3f p95 %7.3f p99 %7.3f max %7.3f" %
+                           (phase.name,
+                            phase.percentile(0.5)*1000,
+                            phase.percentile(0.95)*1000,
+                            phase.percentile(0.99)*1000,
+                            phase.max*1000))
+
+    def reset(self):
+        for phase in self.phases.itervalues():
+            phase.reset()
+        self.frame.reset()
+        self.frames = 0
+        self.overBudget = 0
@@ -0,0 +1,203 @@
+"""
+Geometry.py - angle and field geometry, one value or many at a time
+
+The scalar kernels behind MyMath, with angles in degrees:
+- wrap180 and closestAngle wrap an angle in constant time, where a loop
+  of 360 degree steps costs more the farther the angle is off.
+- getRelativeX/Y and rotate take care of the polar and heading
+  conversions.
+
+The batched functions hoist each conversion out of the loop and work on
+sequences of points:
+- worldToRelative and relativeToWorld move points between field
+  coordinates and a robot's frame.
+- pairwiseDistances and pairwiseHeadings give every distance and heading
+  from one set of points to another.
+- headingDifferences and relativeBearings compare many headings with
+  one.
+
+segmentsIntersect is the exact segment test under MyMath.linesIntersect
+and FieldIndex.
+
+Points are (x, y) pairs. The batched functions return lists. When NumPy
+imports, giving them NumPy arrays instead (an n by 2 array of points, 1D
+arrays of values) computes everything in vectorized calls and returns
+arrays.
+"""
+import math
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+TO_RAD = math.pi/180.0
+TO_DEG = 180.0/math.pi
+
+def _isArray(values):
+    return numpy is not None and isinstance(values, numpy.ndarray)
+
+def wrap180(angle):
+    """
+    The angle equal to angle, modulo 360, between -180 and 180 degrees.
+    An angle already in that range, including -180 and 180, is returned
+    as it is.
+    """
+    if angle > 180.:
+        return angle - 360.*math.ceil((angle - 180.)/360.)
+    if angle < -180.:
+        return angle + 360.*math.ceil((-180. - angle)/360.)
+    return angle
+
+def closestAngle(angle, from_angle):
+    """The angle equal to angle, modulo 360, within 180 degrees of from_angle."""
+    if math.fabs(angle - from_angle) <= 180.:
+        return angle
+    return from_angle + wrap180(angle - from_angle)
+
+def wrap180s(angles):
+    """wrap180 of each of angles."""
+    if _isArray(angles):
+        # as wrap180: angles over 180 land in (-180, 180], angles under -180
+        # in [-180, 180), and angles in range are left alone
+        return numpy.where(angles > 180.,
+                           180. - numpy.mod(180. - angles, 360.),
+                           numpy.where(angles < -180.,
+                                       numpy.mod(angles + 180., 360.) - 180.,
+                                       angles))
+    return [wrap180(angle) for angle in angles]
+
+def headingDifferences(headings, from_heading):
+    """How far each of headings is from from_heading, between -180 and 180."""
+    if _isArray(headings):
+        return wrap180s(headings - from_heading)
+    return [wrap180(heading - from_heading) for heading in headings]
+
+def getRelativeX(dist, bearing):
+    """Relative x of a distance (cm) and bearing (deg)."""
+    return math.fabs(dist)*math.cos(bearing*TO_RAD)
+
+def getRelativeY(dist, bearing):
+    """Relative y of a distance (cm) and bearing (deg)."""
+    return math.fabs(dist)*math.sin(bearing*TO_RAD)
+
+def polarToRelative(distances, bearings):
+    """([relative x], [relative y]) of distances (cm) at bearings (deg)."""
+    if _isArray(distances) or _isArray(bearings):
+        distances = numpy.abs(distances)
+        radians = numpy.asarray(bearings)*TO_RAD
+        return distances*numpy.cos(radians), distances*numpy.sin(radians)
+    xs, ys = [], []
+    for dist, bearing in zip(distances, bearings):
+        dist = math.fabs(dist)
+        bearing *= TO_RAD
+        xs.append(dist*math.cos(bearing))
+        ys.append(dist*math.sin(bearing))
+    return xs, ys
+
+def rotate(heading, x, y):
+    """(x, y) rotated counterclockwise by heading degrees."""
+    radians = heading*TO_RAD
+    cosh = math.cos(radians)
+    sinh = math.sin(radians)
+    return x*cosh - y*sinh, x*sinh + y*cosh
+
+def worldToRelative(x, y, h, points):
+    """
+    Field points in the frame of a robot at (x, y) facing h degrees:
+    x ahead of it and y to its left.
+    """
+    radians = h*TO_RAD
+    cosh = math.cos(radians)
+    sinh = math.sin(radians)
+    if _isArray(points):
+        dx = points[:, 0] - x
+        dy = points[:, 1] - y
+        return numpy.column_stack((cosh*dx + sinh*dy, cosh*dy - sinh*dx))
+    relative = []
+    for px, py in points:
+        dx = px - x
+        dy = py - y
+        relative.append((cosh*dx + sinh*dy, cosh*dy - sinh*dx))
+    return relative
+
+def relativeToWorld(x, y, h, points):
+    """Points relative to a robot at (x, y) facing h degrees, on the field."""
+    radians = h*TO_RAD
+    cosh = math.cos(radians)
+    sinh = math.sin(radians)
+    if _isArray(points):
+        rx = points[:, 0]
+        ry = points[:, 1]
+        return numpy.column_stack((x + cosh*rx - sinh*ry,
+                                   y + sinh*rx + cosh*ry))
+    return [(x + cosh*rx - sinh*ry, y + sinh*rx + cosh*ry)
+            for rx, ry in points]
+
+def pairwiseDistances(fromPoints, toPoints):
+    """distances[i][j] from fromPoints[i] to toPoints[j]."""
+    if _isArray(fromPoints):
+        dx = toPoints[numpy.newaxis, :, 0] - fromPoints[:, numpy.newaxis, 0]
+        dy = toPoints[numpy.newaxis, :, 1] - fromPoints[:, numpy.newaxis, 1]
+        return numpy.hypot(dx, dy)
+    hypot = math.hypot
+    return [[hypot(tx - fx, ty - fy) for tx, ty in toPoints]
+            for fx, fy in fromPoints]
+
+def pairwiseHeadings(fromPoints, toPoints):
+    """headings[i][j], in degrees, from fromPoints[i] to toPoints[j]."""
+    if _isArray(fromPoints):
+        dx = toPoints[numpy.newaxis, :, 0] - fromPoints[:, numpy.newaxis, 0]
+        dy = toPoints[numpy.newaxis, :, 1] - fromPoints[:, numpy.newaxis, 1]
+        return numpy.arctan2(dy, dx)*TO_DEG
+    atan2 = math.atan2
+    return [[atan2(ty - fy, tx - fx)*TO_DEG for tx, ty in toPoints]
+            for fx, fy in fromPoints]
+
+def relativeBearings(x, y, h, points):
+    """
+    Bearings, in degrees between -180 and 180, of points from a robot at
+    (x, y) facing h degrees.
+    """
+    return headingDifferences(pairwiseHeadings(
+            _points([(x, y)], points), points)[0], h)
+
+def _points(points, like):
+    """points as an array if like is one, else as they are."""
+    if _isArray(like):
+        return numpy.asarray(points, numpy.float64)
+    return points
+
+def _orientation(ax, ay, bx, by, cx, cy):
+    """1 if a, b, c turn counterclockwise, -1 if clockwise, 0 if in line."""
+    cross = (bx - ax)*(cy - ay) - (by - ay)*(cx - ax)
+    return (cross > 0.) - (cross < 0.)
+
+def _inBox(ax, ay, bx, by, px, py):
+    return (min(ax, bx) <= px <= max(ax, bx) and
+            min(ay, by) <= py <= max(ay, by))
+
+def segmentsIntersect(x1, y1, x2, y2, u1, v1, u2, v2):
+    """
+    Whether the segment from (x1, y1) to (x2, y2) meets the one from
+    (u1, v1) to (u2, v2). Touching counts, and so does overlapping in
+    line; either segment may be vertical or a single point.
+    """
+    d1 = _orientation(u1, v1, u2, v2, x1, y1)
+    d2 = _orientation(u1, v1, u2, v2, x2, y2)
+    d3 = _orientation(x1, y1, x2, y2, u1, v1)
+    d4 = _orientation(x1, y1, x2, y2, u2, v2)
+    if d1*d2 < 0 and d3*d4 < 0:
+        return True
+    # an end of one segment lying on the other
+    return ((d1 == 0 and _inBox(u1, v1, u2, v2, x1, y1)) or
+            (d2 == 0 and _inBox(u1, v1, u2, v2, x2, y2)) or
+            (d3 == 0 and _inBox(x1, y1, x2, y2, u1, v1)) or
+            (d4 == 0 and _inBox(x1, y1, x2, y2, u2, v2)))
+
+def distanceNd(ptA, ptB):
+    """
+    The euclidian distance between two n dimensional points, over the
+    dimensions of the smaller one.
+    """
+    return math.sqrt(sum((a - b)*(a - b) for a, b in zip(ptA, ptB)))
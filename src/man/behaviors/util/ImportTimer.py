@@ -0,0 +1,91 @@
+"""
+ImportTimer.py - what each module costs to import
+
+install() wraps __import__ so that every module loaded from then on is
+timed: its cumulative time, including the modules it imported in turn,
+and its self time, without them. Set BEHAVIORS_IMPORT_TIMES in the
+environment and the behaviors package installs it before importing Brain,
+and Brain logs the costliest imports once it is built.
+
+    BEHAVIORS_IMPORT_TIMES=1 python Harness.py pBrunswick 1
+
+A module's time includes compiling it when it has no up to date .pyc,
+which is most of what a big module like SweetMoves costs. Run it once
+without PYTHONDONTWRITEBYTECODE first to see the times the robot sees.
+"""
+import __builtin__
+import sys
+import time
+
+from . import Log
+
+# Modules dump() lists by default
+DUMP_LIMIT = 25
+
+_import = None
+_stack = []
+
+# module name : (cumulative, self) seconds
+times = dict()
+
+def _timedImport(name, globals = None, locals = None, fromlist = None,
+                 level = -1):
+    # modules being imported are in sys.modules before they finish, so
+    # only what appears during this call is its own
+    before = set(sys.modules)
+    # time spent and modules loaded by the imports this one makes
+    frame = [0.0, set()]
+    _stack.append(frame)
+    start = time.time()
+    try:
+        return _import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = time.time() - start
+        _stack.pop()
+        if len(sys.modules) != len(before):
+            loaded = set(sys.modules).difference(before)
+            # failed implicit relative imports leave None entries
+            own = [module for module in loaded.difference(frame[1])
+                   if sys.modules[module] is not None]
+            if own:
+                # a package and its module load together; name the module
+                times[max(own, key = len)] = (elapsed, elapsed - frame[0])
+            if _stack:
+                _stack[-1][0] += elapsed
+                _stack[-1][1].update(loaded)
+        elif _stack:
+            _stack[-1][0] += elapsed
+
+def installed():
+    return _import is not None
+
+def install():
+    global _import
+    if _import is not None:
+        return
+    _import = __builtin__.__import__
+    __builtin__.__import__ = _timedImport
+
+def uninstall():
+    global _import
+    if _import is None:
+        return
+    __builtin__.__import__ = _import
+    _import = None
+
+def report():
+    """(name, cumulative, self) of every timed module, costliest first."""
+    return sorted(((name, cumulative, own)
+                   for name, (cumulative, own) in times.iteritems()),
+                  key = lambda item: -item[2])
+
+def dump(outputFunction = None, limit = DUMP_LIMIT):
+    if outputFunction is None:
+        outputFunction = Log.printLine
+    modules = report()
+    outputFunction("ImportTimer: %d modules in %.1fms" %
+                   (len(modules), sum(own for name, cumulative, own
+                                      in modules)*1000))
+    for name, cumulative, own in modules[:limit]:
+        outputFunction("  %-50s self %7.2fms total %7.2fms" %
+                       (name, own*1000, cumulative*1000))
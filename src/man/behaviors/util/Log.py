@@ -0,0 +1,193 @@
+"""
+Log.py - non-blocking logging for the behaviors
+
+Printing from the frame loop is synchronous console I/O. Loggers instead
+append a record (time, level, module, color, message, args) to an in
+memory ring, and a background thread formats and writes the records in
+batches, then flushes the output. Formatting (message % args) happens on
+that thread, so pass immutable arguments (numbers, strings) and let the
+logger format them; anything mutable should be formatted by the caller.
+
+    log = Log.getLogger('KickDecider')
+    log.info("Chose kick %s at %.1f", name, heading)
+    Log.setLevel('KickDecider', Log.WARNING)
+
+Each module has its own level, INFO unless set. When the ring is full the
+oldest records are dropped rather than blocking the frame; the count is in
+Log.ring.dropped. Output goes to stdout unless setOutput() picks a file.
+"""
+import atexit
+import sys
+import threading
+import time
+from collections import deque
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG : 'DEBUG',
+               INFO : 'INFO',
+               WARNING : 'WARNING',
+               ERROR : 'ERROR'}
+
+DEFAULT_LEVEL = INFO
+
+# Records kept before the oldest are dropped
+RING_SIZE = 4096
+
+# Seconds between the writer's batches
+FLUSH_INTERVAL = 0.1
+
+# ANSI terminal color codes, by the names FSA.printf takes
+# http://pueblo.sourceforge.net/doc/manual/ansi_color_codes.html
+RESET_COLORS_CODE = '\033[0m'
+COLORS = {'red' : '\033[31m',
+          'green' : '\033[32m',
+          'yellow' : '\033[33m',
+          'blue' : '\033[34m',
+          'purple' : '\033[35m',
+          'cyan' : '\033[36m',
+          'purplebg' : '\033[45m',
+          'whitebg' : '\033[47m',
+          'greenbg' : '\033[42m\033[37m'} # White text
+
+class _Ring(object):
+    """
+    Appends from the frame loop and pops from the writer. deque's append
+    and popleft are atomic, so neither side takes a lock.
+    """
+    def __init__(self, size):
+        self.records = deque(maxlen = size)
+        self.size = size
+        self.dropped = 0
+
+    def append(self, record):
+        if len(self.records) == self.size:
+            self.dropped += 1
+        self.records.append(record)
+
+    def drain(self):
+        records = []
+        popleft = self.records.popleft
+        try:
+            while True:
+                records.append(popleft())
+        except IndexError:
+            pass
+        return records
+
+def _format(record):
+    stamp, level, name, color, message, args = record
+    message = str(message)
+    if args:
+        try:
+            message = message % args
+        except (TypeError, ValueError), e:
+            message = "%s %r (bad log format: %s)" % (message, args, e)
+    if level >= WARNING:
+        message = LEVEL_NAMES[level] + ": " + message
+    if color in COLORS:
+        return COLORS[color] + message + RESET_COLORS_CODE + '\n'
+    return message + '\n'
+
+class _Writer(threading.Thread):
+    """Drains the ring every FLUSH_INTERVAL and writes what it found."""
+    def __init__(self, ring, interval):
+        threading.Thread.__init__(self, name='Log')
+        self.setDaemon(True)
+        self.ring = ring
+        self.interval = interval
+        self.output = sys.stdout
+        self.outputLock = threading.Lock()
+
+    def write(self):
+        with self.outputLock:
+            records = self.ring.drain()
+            if records:
+                self.output.write(''.join([_format(record)
+                                           for record in records]))
+            # also pushes out anything printed directly
+            self.output.flush()
+
+    def run(self):
+        while True:
+            time.sleep(self.interval)
+            self.write()
+
+class Logger(object):
+    """Logs for one module; get these from getLogger()."""
+    def __init__(self, name, level = None):
+        self.name = name
+        self.level = DEFAULT_LEVEL if level is None else level
+
+    def isEnabledFor(self, level):
+        return level >= self.level
+
+    def log(self, level, message, args = (), color = None):
+        if level < self.level:
+            return
+        ring.append((time.time(), level, self.name, color, message, args))
+        if writer is None:
+            _start()
+
+    def debug(self, message, *args):
+        self.log(DEBUG, message, args)
+
+    def info(self, message, *args):
+        self.log(INFO, message, args)
+
+    def warning(self, message, *args):
+        self.log(WARNING, message, args, 'yellow')
+
+    def error(self, message, *args):
+        self.log(ERROR, message, args, 'red')
+
+ring = _Ring(RING_SIZE)
+writer = None
+_loggers = dict()
+_startLock = threading.Lock()
+
+def _start():
+    global writer
+    with _startLock:
+        if writer is None:
+            writer = _Writer(ring, FLUSH_INTERVAL)
+            writer.start()
+
+def getLogger(name):
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers.setdefault(name, Logger(name))
+    return logger
+
+def setLevel(name, level):
+    getLogger(name).level = level
+
+def setOutput(output):
+    """
+    Sends the log to output, a path or a file like object. Records
+    already queued go to the old output first.
+    """
+    if isinstance(output, basestring):
+        output = open(output, 'a')
+    if writer is None:
+        _start()
+    writer.write()
+    with writer.outputLock:
+        old = writer.output
+        writer.output = output
+    if old not in (sys.stdout, sys.stderr):
+        old.close()
+
+def flush():
+    """Writes out everything queued so far, on the calling thread."""
+    if writer is not None:
+        writer.write()
+
+atexit.register(flush)
+
+def printLine(line):
+    """Prints line to stdout now, not through the ring; the dumps' default."""
+    print line
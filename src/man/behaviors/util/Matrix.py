@@ -1,440 +1,192 @@
+"""
+Matrix.py - matrices, regressions and interpolations
+
+The same API comes from one of two engines: NumpyMatrix, on contiguous
+float arrays, whenever NumPy imports, and PyMatrix, lists of lists in
+pure Python, otherwise. ENGINE names the one in use. test() checks
+that the two agree, and benchMatrix.py compares their speed.
+
+RecursiveLeastSquares keeps a least squares polynomial fit of a stream of
+(x, y) samples up to date one sample at a time, at a cost that does not
+grow with the number of samples, where leastSquares() fits a whole data
+set at once.
+"""
 import math
 import sys
 
-__author__ = "Mark McGranaghan, Jeremy Fishman"
-
-print >>sys.stderr, "****************************************************"
-print >>sys.stderr, "** WARNING - Importing pure-Python Matrix library **"
-print >>sys.stderr, "**    Performance may, no, will, be degraded      **"
-print >>sys.stderr, "****************************************************"
-
-
-class Matrix:
-    """Lightweight, native Python matrix class supporting the creation of constant-valued, identity, and arbitrary-valued matricies, and their copying, scaling, addition, multiplication, transpose, and inverse.  Also preforms arbitrarily-high-dimension regurlar and inverse least-squares regressions and inverse interpolations for 2-dimensional data.  In general this class does not sanity-check, so if something on the dog breaks you should probably check what its doing with this class.  This non-regression aspects of this class borrow very heavily from the JAMA Java Matrix library's interface and implementation."
-    __init__()  ( Matrix() )
-    withValues()
-    identity()
-    copy()
-    get()
-    getArrayCopy()
-    getMatrix()
-    set()
-    setValues()
-    scale()
-    scaleEquals()
-    plus()
-    plusArray()
-    plusEquals()
-    minus()
-    matrixSum()
-    matrixDifference()
-    times()
-    transpose()
-    inverse()
-    // wrapper methods to present identical API as C++/python implementation
-    withvalues()
-    add()
-    subtract()
-    multiply()
-    invert()
-
-    __computeLeastSquaresCoefs()
-    __applyRegressionCoefs()
-    leastSquares()
-    inverseLeastSquares()
-    interpolation()
-    inverseInterpolation()
-    __interpolate()
-    __between()
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+if numpy is not None:
+    from NumpyMatrix import *
+    ENGINE = 'numpy'
+else:
+    from PyMatrix import *
+    ENGINE = 'python'
+    print >>sys.stderr, "****************************************************"
+    print >>sys.stderr, "** WARNING - Importing pure-Python Matrix library **"
+    print >>sys.stderr, "**    Performance may, no, will, be degraded      **"
+    print >>sys.stderr, "****************************************************"
+
+# Starting covariance of a fit without warm start data, per term at the
+# scale of the first x: large, so the first samples outweigh the zero
+# coefficients it starts from
+INITIAL_COVARIANCE = 1.0e8
+
+class RecursiveLeastSquares(object):
     """
-
-    #  m     number of rows in matrix
-    #  n     number of columns in matrix
-    #  rows  list of individual rows in matrix, which are in turn lists
-
-    def __init__(self, num_rows, num_columns = 1, initialize_value = 0.0):
-        """Matrix.__init__(rows, columns): if called with 2 arguments, constructs a 0.0-valued matrix with the specified number of rows and columns.  If a 3rd argument is provided and that value is a scalar, constructs a matrix with all entries set to the constant value.  If the provided 3rd argument is a list, constructs a matrix with the entries drawn from that list, filling the entries in from left to right and then from top to bottom.  If the first argument is a matrix instance, creates a copy of that instance.  Usage: my_new_0_valued_matrix = Matrix(my_num_rows, my_num_columns)  OR  my_new_constant_valued_matrix = Matrix(my_num_rows, my_num_columns, my_constant_value)"""
-        # Assumes that initialize_value is either a list or a scalar, and that num_rows is a scalar or a matrix object
-        # The unfortunate overloading of num_rows is due to the need to conform to the API specified by the C++/python implementation
-        if isinstance(num_rows, Matrix):
-            # num_rows is a Matrix instance
-            self.m = num_rows.m
-            self.n = num_rows.n
-            self.rows = num_rows.getArrayCopy()
-        elif isinstance(initialize_value, list):
-            self.m = num_rows
-            self.n = num_columns
-            self.rows = [ [initialize_value]*self.n for i in xrange(self.m)]
-            for i in xrange(min(len(initialize_value), num_rows*num_columns)):
-                setting_at_column = i % num_columns
-                setting_at_row = i / num_columns
-                self.set(setting_at_row, setting_at_column, initialize_value[i])
+    The least squares polynomial of regression_dimension through a stream
+    of (x, y) samples, refreshed by update(x, y) in O(d^2) for d
+    coefficients instead of solving the normal equations of every sample
+    so far again.
+
+    forgetting, at most 1.0, weighs each sample forgetting times as much
+    as the next one, so a fit below 1.0 follows a drifting relation; the
+    samples it remembers number about 1/(1 - forgetting). x_values and
+    y_values, if given, warm start the fit with a batch leastSquares() of
+    them, which needs more points than regression_dimension. Without them
+    the fit starts from zero coefficients, with a covariance scaled to the
+    powers of the first x, and after a few samples agrees with
+    leastSquares() of the same samples to within a few parts in 1e7 of y.
+
+    coefs, constant term first, and applyRegression() match
+    leastSquaresCoefs() and leastSquares(); regression() returns the same
+    [function, lowest x, highest x] triple. With inverse set the fit of x
+    by y is kept as well, for inverseRegression(). Unlike
+    inverseLeastSquares() it covers every sample, not just those between
+    the lowest and highest y.
+    """
+    def __init__(self, regression_dimension, forgetting = 1.0,
+                 x_values = None, y_values = None, inverse = False):
+        assert 0.0 < forgetting <= 1.0, "forgetting must be in (0, 1]"
+        self.regression_dimension = regression_dimension
+        self.forgetting = forgetting
+        self.numSamples = 0
+        self.min_x = self.max_x = None
+        self.min_y = self.max_y = None
+        self._fit = _RecursiveFit(regression_dimension, forgetting)
+        if inverse:
+            self._inverseFit = _RecursiveFit(regression_dimension, forgetting)
         else:
-            self.m = num_rows
-            self.n = num_columns
-            self.rows = [ [initialize_value]*self.n for i in xrange(self.m)]
-
-    def copy(self):
-        """copy(): returns a deep copy of self"""
-        return self.scale(1.0)
-
-    def copyValues(self, from_matrix):
-        """
-        copyValues(): copies the values from the argument matrix into self's rows
-        """
-        for row_index in xrange(self.m):
-            for column_index in xrange(self.n):
-                self.rows[row_index][column_index] = from_matrix.rows[row_index][column_index]
-
-    def get(self, row_index, column_index):
-        """get(row, column): returns the value at a specific location in the matrix"""
-        return self.rows[row_index][column_index]
-
-    def getArrayCopy(self):
-        return [self.rows[r][:] for r in xrange(self.m)]
-
-    def getMatrix(self, r, j0, j1):
-        """Get a copy of a submatrix of self, from the list or row indices r and the initial and final column indicies j0 and j1."""
-        X = Matrix(len(r), j1-j0+1)
-        for i in xrange(0, len(r)):
-            for j in xrange(j0, j1 + 1):
-                X.set(i, j-j0, self.rows[r[i]][j])
-        return X
-
-    def set(self, row_index, column_index, to_value):
-        """set(row, column, value): sets the value at a specific location in the matrix"""
-        self.rows[row_index][column_index] = to_value
-
-    def setValues(self, matrix_values):
-        """set(values[][]): sets the matrix values to those contained in the 2D list argument"""
-        for row_index in xrange(self.m):
-            for column_index in xrange(self.n):
-                self.rows[row_index][column_index] = matrix_values[row_index][column_index]
-
-
-    def scale(self, scalar):
-        """sclae(c): returns B such that B = c * self"""
-        scaled_matrix = Matrix(self.m, self.n)
-        for row_index in xrange(self.m):
-            for column_index in xrange(self.n):
-                scaled_matrix.rows[row_index][column_index] = self.rows[row_index][column_index] * scalar
-        return scaled_matrix
-
-    def scaleEquals(self, scalar):
-        """
-        scaleEquals(c): scale in place, changing the values in self such that equal the previous values times the scalar
-        """
-        for row_index in xrange(self.m):
-            for column_index in xrange(self.n):
-                self.rows[row_index][column_index] *= scalar
-
-    def plus(self, adding_matrix):
-        """plus(A): returns B such that B = self - A"""
-        sum_matrix = Matrix(self.m, self.n)
-        for row_index in xrange(self.m):
-            for column_index in xrange(self.n):
-                sum_matrix.rows[row_index][column_index] = self.rows[row_index][column_index] + adding_matrix.rows[row_index][column_index]
-        return sum_matrix
-
-
-    def plusArray(self, adding_array):
-        """
-        plusArray(adding_array): adds the values in the 2D list adding_array to self.  Doesen't have the overhead of creating a new matrix like plus() does.
-        """
-        for row_index in xrange(self.m):
-            for column_index in xrange(self.n):
-                self.rows[row_index][column_index] += adding_array[row_index][column_index]
-
-    def plusEquals(self, adding_matrix):
-        """
-        plusEquals(adding_matrix): adds adding_matrix to self in place, overwriting the previous values of self.
-        """
-        for row_index in xrange(self.m):
-            for column_index in xrange(self.n):
-                self.rows[row_index][column_index] += adding_matrix.rows[row_index][column_index]
-
-
-    def matrixSum(self, adding_matrix1, adding_matrix2):
-        """
-        matrixSum(adding_matrix1, adding_matrix2): updates the values of self to be the the sum of the respective values in the two matrix addends.
-        """
-        for row_index in xrange(self.m):
-            for column_index in xrange(self.n):
-                self.rows[row_index][column_index] = adding_matrix1.rows[row_index][column_index] + adding_matrix2.rows[row_index][column_index]
-
-
-    def minus(self, subtracting_matrix):
-        """minus(A): returns B such that B = self - A"""
-        return (self.plus(subtracting_matrix.scale(-1.0)))
-
-    def matrixDifference(self, from_matrix, subtract_matrix):
-        """matrixDifferenc(from_matrix, subtract_matrix): similarly to matrixSum(), updates the values of self to be the difference between the respective values of the two argument matricies.
-        """
-        for row_index in xrange(self.m):
-            for column_index in xrange(self.n):
-                self.rows[row_index][column_index] = from_matrix.rows[row_index][column_index] - subtract_matrix.rows[row_index][column_index]
-
-
-    def times(self, multiplying_matrix):
-        """times(A): returns B such that B = self * A, in the matrix algebraic sense"""
-        B = [ [0.0]*multiplying_matrix.n for i in xrange(self.m)]
-        mult_matr_colj = [0.0] * self.n
-        for j in xrange(multiplying_matrix.n):
-            for k in xrange(self.n):
-                mult_matr_colj[k] = multiplying_matrix.rows[k][j]
-            for i in xrange(self.m):
-                selfrowi = self.rows[i]
-                s = 0
-                for k in xrange(self.n):
-                    s += selfrowi[k] * mult_matr_colj[k]
-                B[i][j] = s
-        return withValues(self.m, multiplying_matrix.n, B)
-
-    def transpose(self):
-        """transpose(A): returns the matrix B that is the transpose of A"""
-        transposed_matrix = Matrix(self.n, self.m)
-        for orig_row_index in xrange(self.m):
-            for orig_column_index in xrange(self.n):
-                transposed_matrix.rows[orig_column_index][orig_row_index] = self.rows[orig_row_index][orig_column_index]
-        return transposed_matrix
-
-    def inverse(self):
-        """self(A): returns B such that B = A^-1"""
-        # First make sure that all of the entries are in decimal, and not integer, form
-        # The algorithms below do not neccisarily work with integral entries
-        for i in xrange(self.m):
-            for j in xrange(self.n):
-                self.rows[i][j] *= 1.0
-        # The calculation is simpler if the array is 2x2.  This is usefull becuase it simplifies linear regression calculations
-        # http://www.analyzemath.com/Calculators/InverseMatrixCalculator.html
-        if self.m == 2 and self.n == 2:
-            temp = Matrix(2,2)
-            temp.set(0,0, self.get(1,1))
-            temp.set(0,1, self.get(0,1)*-1)
-            temp.set(1,0, self.get(1,0)*-1)
-            temp.set(1,1, self.get(0,0))
-            return temp.scale(1.0/((self.get(0,0) * self.get(1,1)) - (self.get(0,1) * self.get(1,0))))
+            self._inverseFit = None
+
+        if x_values:
+            self._fit.warmStart(x_values, y_values)
+            if self._inverseFit is not None:
+                self._inverseFit.warmStart(y_values, x_values)
+            self.numSamples = len(x_values)
+            self.min_x, self.max_x = min(x_values), max(x_values)
+            self.min_y, self.max_y = min(y_values), max(y_values)
+
+    @property
+    def coefs(self):
+        return self._fit.coefs
+
+    def update(self, x_value, y_value):
+        """Adds one sample to the fit."""
+        self._fit.update(x_value, y_value)
+        if self._inverseFit is not None:
+            self._inverseFit.update(y_value, x_value)
+        if self.numSamples == 0:
+            self.min_x = self.max_x = x_value
+            self.min_y = self.max_y = y_value
         else:
-            identity_matrix = identity(self.m)
-            return self.solve(identity_matrix)
-
-    def solve(self, B):
-        """solve(B) returns A such that A * self = B"""
-        decomposition = LUDecomposition(self)
-        return decomposition.solveLU(B)
-
-    # Wrapper methods to present identical API as C++/python implementation
-    def add(self, adding_matrix):
-        return self.plus(adding_matrix)
-    def subtract(self, subtracting_matrix):
-        return self.minus(subtracting_matrix)
-    def multiply(self, multiplying_matrix):
-        return self.times(multiplying_matrix)
-    def invert(self):
-        return self.inverse()
-
-
-class LUDecomposition:
-    """An LU matrix decomposition helps us to solve systems of linear equations.  If you don't know why that is the case but would like to, please consult a Linear Algebra text book.  See also the notes under the Matrix class heading.
-    __init__()
-    solveLU()"""
-
-    # m        number of rows
-    # n        number of columns
-    # LU       list of individual rows in LU matrix
-    # piv      pivot vector
-    # pivsign  pivot sign
-
-    def __init__(self, A):
-        """Preform an LU decomposition on the matrix argument, using Gaussian elimination.  Usage: my_LU_decomposition = LUDecomposition(matrix_to_decompose)"""
-        self.LU = A.getArrayCopy()
-        self.m = A.m
-        self.n = A.n
-        self.piv = []
-        self.piv = [i for i in xrange(self.m)]
-        pivsign = 1
-
-        for k in xrange(self.n):
-            p = k
-            for i in xrange(k+1, self.m):
-                if abs(self.LU[i][k]) > abs(self.LU[p][k]):
-                    p = i
-
-            if p != k:
-                for j in xrange(self.n):
-                    t = self.LU[p][j]
-                    self.LU[p][j] = self.LU[k][j]
-                    self.LU[k][j] = t
-                t = self.piv[p]
-                self.piv[p] = self.piv[k]
-                self.piv[k] = t
-                pivsign = -pivsign
-            if self.LU[k][k] != 0.0:
-                for i in xrange(k + 1, self.m):
-                    self.LU[i][k] /= self.LU[k][k]
-                    for j in xrange(k +1, self.n):
-                        self.LU[i][j] -= self.LU[i][k]*self.LU[k][j]
-
-    def solveLU(self, B):
-        """solveLU(B) Use the LU decomposition to solve the system of linear equations"""
-        nx = B.n
-        Xmat = B.getMatrix(self.piv, 0, nx-1)
-        X = Xmat.getArrayCopy()
-
-        for k in xrange(self.n):
-            for i in xrange(k+1, self.n):
-                for j in xrange(0, nx):
-                    X[i][j] -= X[k][j]*self.LU[i][k]
-
-        for k in xrange(self.n - 1, -1, -1):
-            for j in xrange(B.n):
-                X[k][j] /= self.LU[k][k]
-            for i in xrange(0, k):
-                for j in xrange(B.n):
-                    X[i][j] -= X[k][j]*self.LU[i][k]
-        Xmat.setValues(X)
-        return Xmat
-
-def withValues(num_rows, num_cols, values):
-    """withValues(rows, columns, values): convenience method that constructs a matrix of the specified size and populates it with the entry values from the 3rd argument, which should be a list of lists which contain the values for each row."""
-    X = Matrix(0,0)
-    X.m = num_rows
-    X.n = num_cols
-    X.rows = values
-    return X
-
-def withvalues(num_rows, num_cols, values):
-    """Similar to origional withValues, only here the argument values is in the form of a single, list of scalar values.  See the called function for more information."""
-    return Matrix(num_rows, num_cols, values)
-
-def identity(num_rows):
-    """identity(rows): convenience method that constructs a square identity matrix with the specified number of rows."""
-    identity_matrix = Matrix(num_rows, num_rows)
-    for diagonal_index in xrange(identity_matrix.n):
-        identity_matrix.rows[diagonal_index][diagonal_index] = 1.0
-    return identity_matrix
-
-def __computeLeastSquaresCoefs(x_values, y_values, regression_dimension):
-    """__computeLeastSquaresCoefs(x_data, y_data, regression_dimension): returns a list of regression_dimension+1 coefficients for a leastSquares regression of the specified dimension, with the first coefficient in the list being the constant term, the second in the list being for the x^1 term, the third for the x^2 term, etc.  Usage for, e.g., a cubic regression on 5 (x,y) points: my_4_coefficients = leastSquares([x1,x2,x3,x4,x5],[y1,y2,y3,y4,y5],3)."""
-    observation_vector = Matrix(len(y_values), 1)
-    for obs_row in xrange(0, len(y_values)):
-        observation_vector.set(obs_row, 0, y_values[obs_row])
-    input_matrix = Matrix(len(x_values), regression_dimension + 1)
-    for input_row in xrange(0, len(x_values)):
-        for input_column in xrange(0, regression_dimension + 1):
-            input_matrix.set(input_row, input_column, pow(x_values[input_row], input_column))
-    regression_coefs = ((input_matrix.transpose().times(input_matrix)).inverse()).times((input_matrix.transpose()).times(observation_vector))
-    return regression_coefs.transpose().getArrayCopy()[0]
-
-def leastSquaresCoefs(x_values, y_values, regression_dimension):
+            self.min_x = min(self.min_x, x_value)
+            self.max_x = max(self.max_x, x_value)
+            self.min_y = min(self.min_y, y_value)
+            self.max_y = max(self.max_y, y_value)
+        self.numSamples += 1
+
+    def applyRegression(self, input_value):
+        """The fit's y at input_value."""
+        return self._fit.apply(input_value)
+
+    def applyInverseRegression(self, input_value):
+        """The inverse fit's x at the y input_value."""
+        assert self._inverseFit is not None, "Not keeping an inverse fit"
+        return self._inverseFit.apply(input_value)
+
+    def regression(self):
+        """[function from x to y, lowest x, highest x], as leastSquares()"""
+        return [self.applyRegression, self.min_x, self.max_x]
+
+    def inverseRegression(self):
+        """[function from y to x, lowest y, highest y]"""
+        assert self._inverseFit is not None, "Not keeping an inverse fit"
+        return [self.applyInverseRegression, self.min_y, self.max_y]
+
+class _RecursiveFit(object):
     """
-    Included for compatibility with the C matrix API.
-
-    __computeLeastSquaresCoefs(x_data, y_data, regression_dimension):
-    returns a list of length regression_dimension+1 coefficients for a
-    leastSquares regression of the specified dimension, with the first
-    coefficient in the list being the constant term, the second in the list
-    being for the x^1 term, the third for the x^2 term, etc.
-    Usage for, e.g., a cubic regression on 5 (x,y) points:
-    my_4_coefficients = leastSquares([x1,x2,x3,x4,x5],[y1,y2,y3,y4,y5],3).
+    One direction of a RecursiveLeastSquares: the coefficients and the
+    covariance, the inverse of the weighted normal matrix, as plain lists
+    of floats. A few coefficients are cheaper that way than through either
+    engine's Matrix.
     """
-    observation_vector = Matrix(len(y_values), 1, 0.)
-    for obs_row in xrange(0, len(y_values)):
-        observation_vector.set(obs_row, 0, y_values[obs_row])
-    input_matrix = Matrix(len(x_values), regression_dimension + 1, 0.)
-    for input_row in xrange(0, len(x_values)):
-        for input_column in xrange(0, regression_dimension + 1):
-            input_matrix.set(input_row, input_column,
-                             pow(x_values[input_row], input_column))
-    regression_coefs_vector = ((input_matrix.transpose().multiply(
-        input_matrix)).invert()).multiply(
-        (input_matrix.transpose()).multiply(observation_vector))
-
-    # Extract the coefficients from the matrix into a list
-    regression_coefs_list = \
-        [regression_coefs_vector.get(c,0) for c in range(0,regression_dimension + 1)]
-    return regression_coefs_list
-
-def __applyRegressionCoefs(coefs, input_value):
-    """applyRegressionCoefs(): Computes the value at input_value of a polynomial function characatersized be the coefficients in the first argument"""
-    output_value = 0
-    for power in xrange(0, len(coefs)):
-        output_value += coefs[power] * pow(input_value, power)
-    return output_value
-
-def leastSquares(x_values, y_values, regression_dimension):
-    """leastSquares(x_values, y_values, regression_dimension): Provides a funciton mapping from x values to y values based on a regression of the provided data points.  to assure that you only ask for the image of reasonable x values, the funciton also returned list also includes the minumum and maxium x values for which the function is valid.  """
-    # Compute the regression coefs from the provided data points
-    coefs = __computeLeastSquaresCoefs(x_values, y_values, regression_dimension)
-    # Generate and return the regression function and minumum and maximum valid x values
-    regression = [lambda input_value:__applyRegressionCoefs(coefs, input_value), min(x_values), max(x_values)]
-    return regression
-
-def inverseLeastSquares(x_values, y_values, regression_dimension):
-    """inverseLeastSquares(): Provides an inverse function mapping from y values to x values based on a regresion of the provided data points.  For example, if the x_values represent odemetry raw values and the y_values represent actual speeds, inverseLeastSquares() provides a function mapping from actual speeds to y_value.   To assure that you only ask for inverse of reasonable y values, the function also provides the minimum and maximum y values that the mapping should be valid for."""
-    # Find the minumum and maximum y values in the data set, and the list indecies for their data points
-    min_y, min_y_index = y_values[0], 0
-    max_y, min_y_index = y_values[0], 0
-    for data_index in xrange(1, len(y_values)):
-        if y_values[data_index] < min_y:
-            min_y, min_y_index = y_values[data_index], data_index
-        if y_values[data_index] > max_y:
-            max_y, max_y_index = y_values[data_index], data_index
-    # Slice the data lists to include only those points between the min and max y values
-    # First, check if the min y value has a higher list index than the max y value
-    min_list_index = min(min_y_index, max_y_index)
-    max_list_index = max(min_y_index, max_y_index)
-    use_x_values, use_y_values = x_values[min_list_index:max_list_index+1], y_values[min_list_index:max_list_index+1]
-    # Return the triple, switch the x and y values in the applyRegressionCoefs() arguments becuase we want to get an inverse function
-    coefs = __computeLeastSquaresCoefs(use_y_values, use_x_values, regression_dimension)
-    inverseRegression = [lambda input_value:__applyRegressionCoefs(coefs, input_value), min_y, max_y]
-    return inverseRegression
-
-def interpolation(x_values, y_values):
-    """interpolation(x_values, y_values): provies a function mapping from x values to y values based on linear interpolation between the provided data points.  Additionaly returns the minumum and maximum x values for witch the funciton is valid."""
-    interp = [lambda input_value: __interpolate(x_values, y_values, input_value), min(x_values), max(x_values)]
-    return interp
-
-def inverseInterpolation(x_values, y_values):
-    """inverseInterpolation(): provides an inverse function mapping from y vlaues to x values based on linear interpolation between the provided data points.  Like inverseLeastSquares(), inverseInterpolate() returns the suggested minimum and maximum y values to ask for the inverse of, along with the inverse funciton itself."""
-    # Find the minumum and maximum y values in the data set, and the list indicies for their data points
-    min_y, min_y_index = y_values[0], 0
-    max_y, max_y_index = y_values[0], 0
-    for data_index in xrange(1, len(y_values)):
-        if y_values[data_index] < min_y:
-            min_y, min_y_index = y_values[data_index], data_index
-        if y_values[data_index] > max_y:
-            max_y, max_y_index = y_values[data_index], data_index
-    # Slice the data lists to include only those points between the min and max y values
-    # First, check if the min y value has a higher list index than the max y value
-    min_list_index = min(min_y_index, max_y_index)
-    max_list_index = max(min_y_index, max_y_index)
-    use_x_values, use_y_values = x_values[min_list_index:max_list_index+1], y_values[min_list_index:max_list_index+1]
-    # Return the triple, switching the x and y values in the interpolate() arguments becuase we want to get an inverse function
-    inverseInterpolation = [lambda input_value: __interpolate(use_y_values, use_x_values, input_value), min_y, max_y]
-    return inverseInterpolation
-
-def __interpolate(x_values, y_values, for_x_value):
-    """__interpolate(): uses the (x, y) data points given by the first two arguments to linearly interpolate the y value for the argument for_x_value.  Note that this approximation method is only valid when the given data points are reasonably reflective of the underlying function and do not include excessive noise.  For approximating data points given many noisy values, a least squares regression is more appropriate.  Note that it is only possible to interpolate for x values that lie between 2 x values given in the data arguments"""
-    #Ensure that the x input is valid
-    assert (for_x_value >= min(x_values)) and (for_x_value <= max(x_values)), "Cannot interpolate: input value not within data domain"
-    #Find a pair of data points to intepolate between
-    left_index = 0
-    while not __between(for_x_value, x_values[left_index], x_values[left_index + 1]):
-        left_index += 1
-    # Interpolate
-    interpolated_slope = (y_values[left_index] - y_values[left_index + 1]) / (x_values[left_index] - x_values[left_index + 1])
-    x_displacement = for_x_value - x_values[left_index]
-    return y_values[left_index] + (interpolated_slope * x_displacement)
-
-def __between(for_value, a, b):
-    """ __between(for_value, a, b): Checks if for_value is between the values a and b.  Note that a is not neccisarily smaller than b.  If for_value = a or =b, then we consider it to be between."""
-    if (for_value >= a) and (for_value <=b):
-        return True
-    elif (for_value <= a) and (for_value >=b):
-        return True
-    else:
-        return False
+    def __init__(self, regression_dimension, forgetting):
+        self.size = regression_dimension + 1
+        self.forgetting = forgetting
+        self.coefs = [0.0]*self.size
+        # set by warmStart() or the first update()
+        self.covariance = None
+
+    def warmStart(self, x_values, y_values):
+        self.coefs = [float(coef) for coef in
+                      leastSquaresCoefs(x_values, y_values, self.size - 1)]
+        inputs = withValues(len(x_values), self.size,
+                            [self._powers(x) for x in x_values])
+        self.covariance = \
+            inputs.transpose().times(inputs).inverse().getArrayCopy()
+
+    def _start(self, x_value):
+        """
+        A cold start's covariance. A fixed one would weigh the prior very
+        differently on each power of x: at x of a thousand, x^3 is 1e9.
+        Each term gets INITIAL_COVARIANCE at the scale of the first x
+        instead.
+        """
+        scale = max(abs(x_value), 1.0)
+        self.covariance = [[INITIAL_COVARIANCE/scale**(2*i) if i == j else 0.0
+                            for j in xrange(self.size)]
+                           for i in xrange(self.size)]
+
+    def _powers(self, x_value):
+        powers = [1.0]*self.size
+        for power in xrange(1, self.size):
+            powers[power] = powers[power - 1]*x_value
+        return powers
+
+    def update(self, x_value, y_value):
+        if self.covariance is None:
+            self._start(x_value)
+        powers = self._powers(x_value)
+        covariance = self.covariance
+        size = self.size
+        # covariance * powers, which is also powers * covariance, as the
+        # covariance is symmetric
+        weighted = [sum(row[j]*powers[j] for j in xrange(size))
+                    for row in covariance]
+        denominator = self.forgetting + sum(powers[i]*weighted[i]
+                                            for i in xrange(size))
+        gain = [value/denominator for value in weighted]
+
+        error = y_value - sum(self.coefs[i]*powers[i] for i in xrange(size))
+        self.coefs = [self.coefs[i] + gain[i]*error for i in xrange(size)]
+
+        forget = 1.0/self.forgetting
+        for i in xrange(size):
+            row = covariance[i]
+            g = gain[i]
+            for j in xrange(size):
+                row[j] = (row[j] - g*weighted[j])*forget
+
+    def apply(self, input_value):
+        # Horner's rule, highest power first
+        value = 0.0
+        for coef in reversed(self.coefs):
+            value = value*input_value + coef
+        return value
 
 # Tests
 # To check the state of any of the test matricies, insert print(vars(<matrix_name>)) after the operation in question
@@ -582,8 +334,108 @@ def test(verbose=False):
         lin_func, min_x, max_x = leastSquares(x_values, y_values, 1)
         for x in x_values:
             print lin_func(x)
+    if verbose:
+        print 'Streaming the same points into a recursive least squares fit'
+    x_values = [1290., 1350., 1470., 1600., 1710., 1840., 1980., 2230., 2400., 2930.]
+    y_values = [1182., 1172., 1264., 1493., 1571., 1711., 1804., 1840., 1956., 1954.]
+    streaming = RecursiveLeastSquares(1, x_values = x_values[:3],
+                                      y_values = y_values[:3], inverse = True)
+    for x, y in zip(x_values[3:], y_values[3:]):
+        streaming.update(x, y)
+    batch_function, min_x, max_x = leastSquares(x_values, y_values, 1)
+    if verbose:
+        print 'The image of 1600 is', streaming.applyRegression(1600), \
+            'and by batch regression', batch_function(1600)
+        print 'The inverse of 1600 is', streaming.inverseRegression()[0](1600), '\n'
+    assert abs(streaming.applyRegression(1600) - batch_function(1600)) < 1e-6
+    assert streaming.regression()[1:] == [min_x, max_x]
+    if verbose:
+        print 'Streaming them into fits without a warm start'
+    for dimension in xrange(1, 4):
+        streaming = RecursiveLeastSquares(dimension)
+        for x, y in zip(x_values, y_values):
+            streaming.update(x, y)
+        batch_function = leastSquares(x_values, y_values, dimension)[0]
+        for x in x_values:
+            assert abs(streaming.applyRegression(x) - batch_function(x)) < 1e-2
+    testEngines(verbose)
     if verbose:
         print '---No crashes - Yeah!---\n\n'
 
+def _agrees(a, b, tolerance = 1e-6):
+    """Whether two Matrices, or 2D lists, hold the same values."""
+    a = getattr(a, 'rows', a)
+    b = getattr(b, 'rows', b)
+    return (len(a) == len(b) and
+            all(len(rowA) == len(rowB) and
+                all(abs(x - y) <= tolerance*max(1.0, abs(x))
+                    for x, y in zip(rowA, rowB))
+                for rowA, rowB in zip(a, b)))
+
+def testEngines(verbose=False):
+    """
+    Runs the same operations through PyMatrix and, when NumPy imports,
+    NumpyMatrix, whichever of them is ENGINE, and checks they agree.
+    """
+    import PyMatrix
+    engines = [('python', PyMatrix)]
+    if numpy is not None:
+        import NumpyMatrix
+        engines.append(('numpy', NumpyMatrix))
+    elif verbose:
+        print 'NumPy is not available, checking PyMatrix alone'
+
+    a = [[1., -1., 3.], [2., 1., 2.], [-2., -2., 1.]]
+    b = [[6., -2., 0.], [9., -1., 1.], [3., 7., 5.]]
+    wide = [[1., 2., 3., 4.], [5., 6., 7., 8.]]
+    x_values = [1290., 1350., 1470., 1600., 1710., 1840., 1980., 2230., 2400., 2930.]
+    y_values = [1182., 1172., 1264., 1493., 1571., 1711., 1804., 1840., 1956., 1954.]
+
+    results = []
+    for name, engine in engines:
+        if verbose:
+            print 'Checking the', name, 'engine'
+        A = engine.withValues(3, 3, [row[:] for row in a])
+        B = engine.withValues(3, 3, [row[:] for row in b])
+        identity3 = engine.identity(3)
+        inverse = A.inverse()
+        assert _agrees(A.times(inverse), identity3)
+        assert _agrees(B.times(B.solve(identity3)), identity3)
+        # the LU factors themselves are pivoted the same way
+        assert engine.LUDecomposition(B).piv == [1, 2, 0]
+        try:
+            engine.withValues(2, 2, [[1., 2.], [2., 4.]]).solve(
+                engine.identity(2))
+        except ZeroDivisionError:
+            pass
+        else:
+            assert False, name + ' solved a singular matrix'
+
+        regression = engine.leastSquares(x_values, y_values, 3)
+        inverseRegression = engine.inverseLeastSquares(x_values, y_values, 3)
+        interpolate = engine.interpolation(x_values, y_values)
+        inverseInterpolate = engine.inverseInterpolation(x_values, y_values)
+        results.append((
+            A.plus(B), A.minus(B), A.times(B), A.scale(2.5), inverse,
+            engine.withValues(2, 4, [row[:] for row in wide]).transpose(),
+            [[float(coef)] for coef in
+             engine.leastSquaresCoefs(x_values, y_values, 3)],
+            [[regression[0](x) for x in (1300., 1600., 2900.)] +
+             regression[1:]],
+            [[inverseRegression[0](y) for y in (1200., 1600., 1950.)] +
+             inverseRegression[1:]],
+            [[interpolate[0](x) for x in (1290., 1500., 2930.)] +
+             interpolate[1:]],
+            [[inverseInterpolate[0](y) for y in (1172., 1500., 1956.)] +
+             inverseInterpolate[1:]]))
+
+    for name, engineResults in zip([name for name, engine in engines[1:]],
+                                   results[1:]):
+        for python, other in zip(results[0], engineResults):
+            assert _agrees(python, other), \
+                '%s disagrees with python: %s, %s' % (name, python, other)
+    if verbose:
+        print 'The engines agree\n'
+
 if __name__ == '__main__':
     test(True)
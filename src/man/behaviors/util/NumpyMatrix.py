@@ -0,0 +1,286 @@
+"""
+NumpyMatrix.py - the NumPy engine behind Matrix
+
+The API of PyMatrix, with each Matrix's values in one contiguous float64
+array, rows, so every operation is a single vectorized call instead of
+nested loops over lists. rows still indexes as rows[i][j], and m and n
+are still the number of rows and columns.
+
+Differences from PyMatrix: values are always floats, withValues() copies
+its list instead of keeping it, and a singular matrix raises
+ZeroDivisionError from inverse() and solve() as PyMatrix's arithmetic
+does, never a NumPy LinAlgError. The functions returned by
+leastSquares() and inverseLeastSquares() also take arrays of inputs.
+"""
+import bisect
+
+import numpy
+
+__all__ = ['Matrix', 'LUDecomposition', 'withValues', 'withvalues',
+           'identity', 'leastSquaresCoefs', 'leastSquares',
+           'inverseLeastSquares', 'interpolation', 'inverseInterpolation']
+
+FLOAT = numpy.float64
+
+def _fromArray(values):
+    """A Matrix that owns values, a 2D float array, without copying it."""
+    X = Matrix.__new__(Matrix)
+    X.rows = values
+    X.m, X.n = values.shape
+    return X
+
+def _singular():
+    return ZeroDivisionError("matrix is singular")
+
+class Matrix(object):
+    """
+    Matrix(rows, columns) of zeros, Matrix(rows, columns, value) of one
+    value, Matrix(rows, columns, [values]) filled row by row from a flat
+    list, or Matrix(other) as a copy of other. See PyMatrix.Matrix.
+    """
+    __slots__ = ('m', 'n', 'rows')
+
+    def __init__(self, num_rows, num_columns = 1, initialize_value = 0.0):
+        if isinstance(num_rows, Matrix):
+            self.m = num_rows.m
+            self.n = num_rows.n
+            self.rows = num_rows.rows.copy()
+        elif isinstance(initialize_value, list):
+            self.m = num_rows
+            self.n = num_columns
+            self.rows = numpy.zeros((num_rows, num_columns), FLOAT)
+            count = min(len(initialize_value), num_rows*num_columns)
+            self.rows.flat[:count] = initialize_value[:count]
+        else:
+            self.m = num_rows
+            self.n = num_columns
+            self.rows = numpy.empty((num_rows, num_columns), FLOAT)
+            self.rows.fill(initialize_value)
+
+    def copy(self):
+        return _fromArray(self.rows.copy())
+
+    def copyValues(self, from_matrix):
+        self.rows[...] = from_matrix.rows
+
+    def get(self, row_index, column_index):
+        return self.rows.item(row_index, column_index)
+
+    def getArrayCopy(self):
+        return self.rows.tolist()
+
+    def getMatrix(self, r, j0, j1):
+        """The rows listed in r, columns j0 through j1, as a new Matrix."""
+        return _fromArray(self.rows[list(r), j0:j1 + 1])
+
+    def set(self, row_index, column_index, to_value):
+        self.rows[row_index, column_index] = to_value
+
+    def setValues(self, matrix_values):
+        self.rows[...] = _block(matrix_values, self.m, self.n)
+
+    def scale(self, scalar):
+        return _fromArray(self.rows * scalar)
+
+    def scaleEquals(self, scalar):
+        self.rows *= scalar
+
+    def plus(self, adding_matrix):
+        return _fromArray(self.rows + adding_matrix.rows)
+
+    def plusArray(self, adding_array):
+        self.rows += _block(adding_array, self.m, self.n)
+
+    def plusEquals(self, adding_matrix):
+        self.rows += adding_matrix.rows
+
+    def matrixSum(self, adding_matrix1, adding_matrix2):
+        numpy.add(adding_matrix1.rows, adding_matrix2.rows, self.rows)
+
+    def minus(self, subtracting_matrix):
+        return _fromArray(self.rows - subtracting_matrix.rows)
+
+    def matrixDifference(self, from_matrix, subtract_matrix):
+        numpy.subtract(from_matrix.rows, subtract_matrix.rows, self.rows)
+
+    def times(self, multiplying_matrix):
+        return _fromArray(numpy.dot(self.rows, multiplying_matrix.rows))
+
+    def transpose(self):
+        return _fromArray(numpy.ascontiguousarray(self.rows.T))
+
+    def inverse(self):
+        try:
+            return _fromArray(numpy.linalg.inv(self.rows))
+        except numpy.linalg.LinAlgError:
+            raise _singular()
+
+    def solve(self, B):
+        """solve(B) returns X such that self * X = B"""
+        try:
+            return _fromArray(numpy.linalg.solve(self.rows, B.rows))
+        except numpy.linalg.LinAlgError:
+            raise _singular()
+
+    # Wrapper methods to present identical API as C++/python implementation
+    def add(self, adding_matrix):
+        return self.plus(adding_matrix)
+    def subtract(self, subtracting_matrix):
+        return self.minus(subtracting_matrix)
+    def multiply(self, multiplying_matrix):
+        return self.times(multiplying_matrix)
+    def invert(self):
+        return self.inverse()
+
+def _block(values, m, n):
+    """The top left m by n block of a 2D list or array, as floats."""
+    return numpy.asarray(values, FLOAT)[:m, :n]
+
+class LUDecomposition(object):
+    """
+    LU decomposition of a square matrix with partial pivoting, eliminating
+    a whole column per step. See PyMatrix.LUDecomposition.
+    """
+    def __init__(self, A):
+        LU = numpy.array(A.rows, FLOAT)
+        self.m = A.m
+        self.n = A.n
+        piv = numpy.arange(self.m)
+
+        for k in xrange(self.n):
+            p = k + int(numpy.argmax(numpy.abs(LU[k:, k])))
+            if p != k:
+                LU[[k, p]] = LU[[p, k]]
+                piv[[k, p]] = piv[[p, k]]
+            pivot = LU[k, k]
+            if pivot != 0.0:
+                LU[k + 1:, k] /= pivot
+                LU[k + 1:, k + 1:] -= numpy.outer(LU[k + 1:, k],
+                                                  LU[k, k + 1:])
+        self.LU = LU
+        self.piv = piv.tolist()
+        # the factors apart, for solveLU
+        self._U = numpy.triu(LU)
+        self._L = numpy.tril(LU, -1)
+        self._L.flat[::self.n + 1] = 1.0
+
+    def solveLU(self, B):
+        """Solves self * X = B for X, a Matrix the shape of B."""
+        if not self._U.diagonal().all():
+            raise _singular()
+        # LAPACK substitutes through the triangular factors exactly, and
+        # beats a step per column at every size
+        Y = numpy.linalg.solve(self._L, B.rows[self.piv])
+        return _fromArray(numpy.linalg.solve(self._U, Y))
+
+def withValues(num_rows, num_cols, values):
+    """A num_rows by num_cols Matrix of a list of rows (copied)."""
+    return _fromArray(numpy.array(_block(values, num_rows, num_cols)))
+
+def withvalues(num_rows, num_cols, values):
+    """A Matrix of a flat list of values, filled in row by row."""
+    return Matrix(num_rows, num_cols, values)
+
+def identity(num_rows):
+    return _fromArray(numpy.identity(num_rows, FLOAT))
+
+def leastSquaresCoefs(x_values, y_values, regression_dimension):
+    """
+    The regression_dimension + 1 coefficients of a least squares
+    polynomial through the (x, y) points, constant term first. Solves
+    the same normal equations as PyMatrix, so the coefficients agree.
+    """
+    x = numpy.asarray(x_values, FLOAT)
+    y = numpy.asarray(y_values, FLOAT)
+    inputs = numpy.power.outer(x, numpy.arange(regression_dimension + 1))
+    try:
+        coefs = numpy.linalg.solve(numpy.dot(inputs.T, inputs),
+                                   numpy.dot(inputs.T, y))
+    except numpy.linalg.LinAlgError:
+        raise _singular()
+    return coefs.tolist()
+
+def _polynomial(coefs):
+    """
+    The polynomial with coefs, constant term first, as a function. Arrays
+    of inputs are evaluated in one call; a single input is cheaper by
+    Horner's rule on floats than through NumPy.
+    """
+    highestFirst = [float(coef) for coef in reversed(coefs)]
+    highestFirstArray = numpy.array(highestFirst, FLOAT)
+
+    def polynomial(input_value):
+        if isinstance(input_value, numpy.ndarray):
+            return numpy.polyval(highestFirstArray, input_value)
+        value = 0.0
+        for coef in highestFirst:
+            value = value*input_value + coef
+        return value
+    return polynomial
+
+def _betweenExtremes(x_values, y_values):
+    """x_values and y_values from the lowest to the highest y, in order."""
+    y = numpy.asarray(y_values)
+    low = int(numpy.argmin(y))
+    high = int(numpy.argmax(y))
+    first, last = min(low, high), max(low, high)
+    return (x_values[first:last + 1], y_values[first:last + 1],
+            y_values[low], y_values[high])
+
+def leastSquares(x_values, y_values, regression_dimension):
+    """[function from x to y, lowest x, highest x]; see PyMatrix"""
+    coefs = leastSquaresCoefs(x_values, y_values, regression_dimension)
+    return [_polynomial(coefs), min(x_values), max(x_values)]
+
+def inverseLeastSquares(x_values, y_values, regression_dimension):
+    """[function from y to x, lowest y, highest y]; see PyMatrix"""
+    use_x_values, use_y_values, min_y, max_y = _betweenExtremes(x_values,
+                                                                 y_values)
+    coefs = leastSquaresCoefs(use_y_values, use_x_values,
+                              regression_dimension)
+    return [_polynomial(coefs), min_y, max_y]
+
+def _interpolator(x_values, y_values):
+    """
+    Linear interpolation along the (x, y) points in order: an x is placed
+    in the first segment whose ends it lies between. When the x values
+    only rise, or only fall, that segment is found by bisection.
+    """
+    x = numpy.array(x_values, FLOAT)
+    y = numpy.array(y_values, FLOAT)
+    steps = numpy.diff(x)
+    with numpy.errstate(divide = 'ignore', invalid = 'ignore'):
+        slopes = numpy.diff(y) / steps
+    lowest, highest = x.min(), x.max()
+
+    if (steps > 0.0).all():
+        keys, sign = x.tolist(), 1.0
+    elif (steps < 0.0).all():
+        keys, sign = (-x).tolist(), -1.0
+    else:
+        keys = None
+        low = numpy.minimum(x[:-1], x[1:])
+        high = numpy.maximum(x[:-1], x[1:])
+    # plain floats are quicker to index than arrays, one value at a time
+    x, y, slopes = x.tolist(), y.tolist(), slopes.tolist()
+
+    def interpolate(for_x_value):
+        assert lowest <= for_x_value <= highest, \
+            "Cannot interpolate: input value not within data domain"
+        if keys is not None:
+            left = max(bisect.bisect_left(keys, sign*for_x_value) - 1, 0)
+        else:
+            left = int(numpy.argmax((low <= for_x_value) &
+                                    (for_x_value <= high)))
+        return y[left] + slopes[left]*(for_x_value - x[left])
+    return interpolate
+
+def interpolation(x_values, y_values):
+    """[function from x to y, lowest x, highest x]; see PyMatrix"""
+    return [_interpolator(x_values, y_values), min(x_values), max(x_values)]
+
+def inverseInterpolation(x_values, y_values):
+    """[function from y to x, lowest y, highest y]; see PyMatrix"""
+    use_x_values, use_y_values, min_y, max_y = _betweenExtremes(x_values,
+                                                                 y_values)
+    return [_interpolator(use_y_values, use_x_values), min_y, max_y]
@@ -20,13 +20,21 @@
 # PSO.py: an implementation of a Particle-Swarm Optimizer
 #       will search through an N-dimensional space
 # @author Nathan Merritt
+#
+# The Swarm keeps its whole population as numParticles x nSpace arrays,
+# NumPy arrays when NumPy imports and lists of rows otherwise, and moves
+# every particle in one step at the end of each iteration. A particle's
+# move only depends on its own best and the gBest it was scored against,
+# which doesn't change until the iteration ends, so this is the same
+# search as ticking them one at a time. Particle is a view of one row.
 
 import random
-from math import (fabs,
-                  sqrt,
-                  cos,
-                  pi)
-from MyMath import clip
+from math import sqrt
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 DEBUG = False # shuts on/off all debug statements
 DEBUG_POSITION = False
@@ -53,195 +61,104 @@ VELOCITY_MINIMUM_MAGNITUDE = 0.00001
 
 INFINITY = float(1e3000)
 
-class Particle:
-    def __init__(self, nSpace, searchMins, searchMaxs):
-        self.dimension = nSpace
-
-        self.pBest = -INFINITY
-        self.gBest = -INFINITY
-
-        self.position = [0]*nSpace
-        self.velocity = [0]*nSpace
-
-        self.setBounds(searchMins, searchMaxs)
-
-        # initialized randomly per-particle as suggested by PSO wikipedia article
-        self.INERTIAL = MAX_INERTIAL * random.random()
-
-        self.heuristic = 0
-        self.moves = 0
-
-        for j in range(0, self.dimension):
-            # don't optimize any parameter where min == max
-            if self.searchMins[j] == self.searchMaxs[j]:
-                self.position[j] = self.searchMins[j]
-                self.velocity[j] = 0
-            else:
-                self.position[j] = random.uniform(self.searchMins[j],
-                                                  self.searchMaxs[j])
-                self.velocity[j] = random.uniform(-self.velocityCap[j],
-                                                   self.velocityCap[j])
-
-        # disable cog/soc biases until we have real data
-        self.pBest_position = self.getPosition()
-        self.gBest_position = self.getPosition()
-
-    def tick(self, gBest, gBest_position):
-        # several test cases using common PSO benchmark functions
-        # note that functions are put in negative since our PSO maximizes
-        #x = self.position[0]
-        #y = self.position[1]
-        # saddle
-        #self.setHeuristic(-(x**2 - y**2))
-        # parabaloid
-        #self.setHeuristic(-(x**2 + y**2))
-        # rastigirin's non-continuous (run x,y on [-5,5]) << THIS ONE IS HARDo
-        #
-        #rastigirins = 20 + x**2 + y**2 - 10*(cos(2*pi*x)+ cos(2*pi*y))
-        #self.setHeuristic(-rastigirins)
-
-        # Update local best and its fitness
-        if self.heuristic > self.pBest:
-            self.pBest = self.heuristic
-            self.pBest_position = self.getPosition()
-
-        # Update the global best and its fitness
-        self.gBest = gBest
-        self.gBest_position = gBest_position
-
-        self.updateParticleVelocity()
-        self.updateParticlePosition()
-
-        self.moves += 1
-
-        # pass our gBest, gBest_position back to the swarm controller
-        if self.pBest > gBest:
-            return (self.pBest, self.pBest_position)
-        else:
-            return (self.gBest, self.gBest_position)
-
-    def updateParticleVelocity(self):
-        for i in range(0, self.dimension):
-            # if mins[i] == maxs[i] then ignore, we aren't optimizing it
-            if self.searchMins[i] == self.searchMaxs[i]:
-                continue
+# The swarm's pickled state: these attributes as they are, and the
+# population as lists, so a swarm pickled with NumPy loads without it
+STATE = ('numParticles', 'nSpace', 'partIndex', 'iterations',
+         'gBest', 'gBest_position', 'new_gBest', 'new_gBest_position',
+         'currSearchMins', 'currSearchMaxs',
+         'initialSearchMins', 'initialSearchMaxs', 'searchSpaceSize')
+# numParticles x nSpace
+POPULATION = ('positions', 'velocities', 'pBestPositions')
+# one per particle
+PER_PARTICLE = ('pBests', 'heuristics', 'inertias', 'moves')
+
+def _toList(values):
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        return values.tolist()
+    return list(values)
 
-            # Random component to avoid local minima
-            R1 = random.random()
-            R2 = random.random()
-
-            newVelocity = self.INERTIAL*self.velocity[i] \
-                + COG * R1 * (self.pBest_position[i] - self.position[i]) \
-                + SOC * R2 * (self.gBest_position[i] - self.position[i])
-
-            self.velocity[i] = clip(newVelocity,
-                                    -self.velocityCap[i],
-                                    self.velocityCap[i])
-
-            if fabs(self.velocity[i]) < VELOCITY_MINIMUM_MAGNITUDE:
-                self.velocity[i] = 0
-
-    def updateParticlePosition(self):
-        for i in range(0, self.dimension):
-            newPosition = self.position[i] + self.velocity[i]
-
-            if ((newPosition > self.searchMaxs[i]) or
-                (newPosition < self.searchMins[i]) and
-                RANDOMIZE_LOST_PARTICLES):
-                if DEBUG:
-                    print 'Randomized a lost particle (dimension {0})'.format(i)
-                self.position[i] = random.uniform(self.searchMins[i],
-                                                  self.searchMaxs[i])
-                self.velocity[i] = 0
-            else:
-                self.position[i] = clip(newPosition,
-                                        self.searchMins[i],
-                                        self.searchMaxs[i])
+class Particle:
+    """
+    One particle of a Swarm: a view of its row of the swarm's arrays.
+    """
+    def __init__(self, swarm, index):
+        self.swarm = swarm
+        self.index = index
+        self.dimension = swarm.nSpace
 
     # used to decide how stable our most recent set of parameters were
     def getHeuristic(self):
-        return self.heuristic
+        return self.swarm.heuristics[self.index]
 
     # when we set heuristic from outside the swarm, use this
     def setHeuristic(self, outside_heuristic):
-        self.heuristic = outside_heuristic
+        self.swarm.heuristics[self.index] = outside_heuristic
 
-    # DON'T CALL THIS PUBLICALLY
-    def _setVelocityCap(self):
-        self.velocityCap = [MAX_VEL_PERCENT*(sMax - sMin) for sMax, sMin in zip(self.searchMaxs, self.searchMins)]
+    def getPBest(self):
+        return self.swarm.pBests[self.index]
 
-    # for use after REGROUPING
-    def setBounds(self, searchMins, searchMaxs):
-        self.searchMins = searchMins
-        self.searchMaxs = searchMaxs
+    def getPosition(self):
+        """A copy of the particle's position, as a list."""
+        return _toList(self.swarm.positions[self.index])
 
-        self._setVelocityCap()
+    def getVelocity(self):
+        return _toList(self.swarm.velocities[self.index])
 
     # for use after REGROUPING
     def setPosition(self, position):
-        self.position = position
+        if numpy is not None:
+            self.swarm.positions[self.index] = position
+        else:
+            self.swarm.positions[self.index] = [float(value)
+                                                for value in position]
 
     # for use after REGROUPING
     def zeroVelocity(self):
-        self.velocity = [0]*self.dimension
-
-    def getPosition(self):
-        return self.position
+        if numpy is not None:
+            self.swarm.velocities[self.index] = 0.
+        else:
+            self.swarm.velocities[self.index] = [0.]*self.dimension
 
     def avgAbsVelocity(self):
-        velocitySum = optimizeDimensions = 0
-        i = -1
-
-        for velocity in self.velocity:
-            i += 1
-            if self.searchMins[i] == self.searchMaxs[i]:
-                continue
-
-            optimizeDimensions += 1
-            velocitySum += fabs(velocity)
-
-        if optimizeDimensions == 0:
+        velocity = self.getVelocity()
+        optimized = self.swarm.optimizedDimensions()
+        if not optimized:
             return 0
-
-        return velocitySum / optimizeDimensions
+        return sum(abs(velocity[i]) for i in optimized) / len(optimized)
 
     def distanceNd(self, ptB):
         '''
         Unlike the MyMath version, this one skips terms where searchMaxs==searchMins
         This is necessary to make distance calculations with regard to regrouping work
         '''
-        # add up all the terms of form (ptA[i] - ptB[i])^2
+        position = self.getPosition()
         dimensionality = min(self.dimension, len(ptB))
-        differences_squared = 0
-
-        for i in range(0, dimensionality):
-            if self.searchMins[i] == self.searchMaxs[i]:
-                continue
-
-            differences_squared += (self.position[i] - ptB[i])**2
-
-        return sqrt(differences_squared)
+        return sqrt(sum((position[i] - ptB[i])**2
+                        for i in self.swarm.optimizedDimensions()
+                        if i < dimensionality))
 
     # debug output for a particle
     def printState(self):
         if DEBUG_PROGRESS:
-            print "pBest: %s gBest: %s nSpace: %s" % (self.pBest, self.gBest, self.dimension)
+            print "pBest: %s gBest: %s nSpace: %s" % (self.getPBest(),
+                                                      self.swarm.gBest,
+                                                      self.dimension)
             print "  particle's average abs(velocity) is %s" % self.avgAbsVelocity()
-            print "  particle has moved %s times" % self.moves
+            print "  particle has moved %s times" % self.swarm.moves[self.index]
         if DEBUG_POSITION:
-            print "  Positions in N-Space: %s" % self.position
-            print "  Velocity: %s" % self.velocity
+            print "  Positions in N-Space: %s" % self.getPosition()
+            print "  Velocity: %s" % self.getVelocity()
 
 class Swarm:
     """
-    Manages a list of particles, ticks them and keeps track of the global
-    best solution found. If REGROUPING = True, will scatter particles after
-    premature convergence on a local minimum
+    Manages a population of particles, ticks them and keeps track of the
+    global best solution found. If REGROUPING = True, will scatter
+    particles after premature convergence on a local minimum
     """
     def __init__(self, numParticles, nSpace, searchMins, searchMaxs):
-        self.particles = []
         self.partIndex = 0
         self.numParticles = numParticles
+        self.nSpace = nSpace
 
         self.gBest = -INFINITY
         self.gBest_position = [0]*nSpace
@@ -249,24 +166,104 @@ class Swarm:
         self.new_gBest = -INFINITY
         self.new_gBest_position = [0]*nSpace
 
-        self.currSearchMaxs = searchMaxs
-        self.currSearchMins = searchMins
+        self.currSearchMaxs = list(searchMaxs)
+        self.currSearchMins = list(searchMins)
 
-        self.initialSearchMins = searchMins
-        self.initialSearchMaxs = searchMaxs
+        self.initialSearchMins = list(searchMins)
+        self.initialSearchMaxs = list(searchMaxs)
 
-        self.nSpace = nSpace
         self.searchSpaceSize = self.calculateSearchSize()
 
         self.iterations = 0 # how many times every particle has moved
 
-        for i in range(0, numParticles):
-            self.particles.append(Particle(nSpace, searchMins, searchMaxs))
+        # don't optimize any parameter where min == max
+        positions = []
+        velocities = []
+        for i in xrange(numParticles):
+            position = []
+            velocity = []
+            for sMin, sMax in zip(searchMins, searchMaxs):
+                if sMin == sMax:
+                    position.append(float(sMin))
+                    velocity.append(0.)
+                else:
+                    cap = MAX_VEL_PERCENT*(sMax - sMin)
+                    position.append(random.uniform(sMin, sMax))
+                    velocity.append(random.uniform(-cap, cap))
+            positions.append(position)
+            velocities.append(velocity)
+
+        self._build({
+                'positions' : positions,
+                'velocities' : velocities,
+                # disable cog/soc biases until we have real data
+                'pBestPositions' : [list(position) for position in positions],
+                'pBests' : [-INFINITY]*numParticles,
+                'heuristics' : [0.]*numParticles,
+                # initialized randomly per-particle as suggested by PSO
+                # wikipedia article
+                'inertias' : [MAX_INERTIAL*random.random()
+                              for i in xrange(numParticles)],
+                'moves' : [0]*numParticles})
 
         for p in self.particles:
             if DEBUG:
                 p.printState()
 
+    def _build(self, population):
+        """Takes on the population, a dict of lists, as arrays."""
+        for name in POPULATION + PER_PARTICLE:
+            values = population[name]
+            if numpy is not None:
+                values = numpy.array(values)
+                if name != 'moves':
+                    values = values.astype(numpy.float64)
+            else:
+                values = [list(row) if name in POPULATION else row
+                          for row in values]
+            setattr(self, name, values)
+        if numpy is not None:
+            self._random = numpy.random.RandomState(random.getrandbits(32))
+        self._setBounds(self.currSearchMins, self.currSearchMaxs)
+        self.particles = [Particle(self, i) for i in xrange(self.numParticles)]
+
+    def _setBounds(self, searchMins, searchMaxs):
+        """The current search range, and the velocity caps that go with it."""
+        self.currSearchMins = list(searchMins)
+        self.currSearchMaxs = list(searchMaxs)
+        self._optimized = [i for i in xrange(self.nSpace)
+                           if searchMins[i] != searchMaxs[i]]
+        caps = [MAX_VEL_PERCENT*(sMax - sMin)
+                for sMin, sMax in zip(searchMins, searchMaxs)]
+        if numpy is not None:
+            self._mins = numpy.array(searchMins, numpy.float64)
+            self._maxs = numpy.array(searchMaxs, numpy.float64)
+            self._caps = numpy.array(caps, numpy.float64)
+            self._optimizedMask = self._mins != self._maxs
+        else:
+            self._caps = caps
+
+    def optimizedDimensions(self):
+        """The dimensions being searched, where min != max."""
+        return self._optimized
+
+    def __getstate__(self):
+        state = dict((name, getattr(self, name)) for name in STATE)
+        for name in POPULATION + PER_PARTICLE:
+            value = getattr(self, name)
+            if name in POPULATION:
+                state[name] = [_toList(row) for row in value]
+            else:
+                state[name] = _toList(value)
+        return state
+
+    def __setstate__(self, state):
+        if 'particles' in state:
+            state = _fromParticles(state)
+        for name in STATE:
+            setattr(self, name, state[name])
+        self._build(state)
+
     # probably not useful in actual RoboCup situations...
     def solve_swarm(self, iterations):
         for i in range(0, iterations):
@@ -279,7 +276,7 @@ class Swarm:
         return self.particles[self.partIndex]
 
     def getBestSolution(self):
-        return (self.gBest_position, self.gBest)
+        return (list(self.gBest_position), self.gBest)
 
     def regroupSwarm(self):
         '''
@@ -312,37 +309,32 @@ class Swarm:
 
     def calculateRegroupedRange(self):
         '''
-        Does the range calculations as described in regroupSwarm
+        Does the range calculations as described in regroupSwarm, for every
+        dimension at once
         @return (newMins, newMaxs) in a tuple
         '''
-        newMins = [0]*self.nSpace
-        newMaxs = [0]*self.nSpace
-
-        # calculate new range
-        for i in range(0, self.nSpace):
-            total_distance = 0
-
+        if numpy is not None:
+            gBest = numpy.array(self.gBest_position, numpy.float64)
             # avg distance of all particles from gBest
-            for p in self.particles:
-                particleLoc = p.getPosition()
-                distance = fabs(particleLoc[i] - self.gBest_position[i])
-
-                total_distance += distance
-
-            uncertainty = total_distance / len(self.particles)
-
-            initial_range_i = self.initialSearchMaxs[i] - self.initialSearchMins[i]
-            new_range_i = min(initial_range_i, uncertainty*REGROUP_FACTOR)
-
-            if DEBUG and DEBUG_REGROUPING_VERBOSE:
-                print "old range %s" % initial_range_i
-                print "new_range_i %s" % new_range_i
-                print "uncertainty %s" % uncertainty
-                print "regrouping factor %s" % REGROUP_FACTOR
-                print "other range option %s " % (uncertainty*REGROUP_FACTOR)
-
-            newMins[i] = self.gBest_position[i] - .5*new_range_i
-            newMaxs[i] = self.gBest_position[i] + .5*new_range_i
+            uncertainty = numpy.abs(self.positions - gBest).mean(axis = 0)
+            initialRange = (numpy.array(self.initialSearchMaxs, numpy.float64) -
+                            numpy.array(self.initialSearchMins, numpy.float64))
+            newRange = numpy.minimum(initialRange, uncertainty*REGROUP_FACTOR)
+            newMins = (gBest - .5*newRange).tolist()
+            newMaxs = (gBest + .5*newRange).tolist()
+        else:
+            newMins = [0]*self.nSpace
+            newMaxs = [0]*self.nSpace
+            for i in xrange(self.nSpace):
+                gBest_i = self.gBest_position[i]
+                uncertainty = sum(abs(position[i] - gBest_i)
+                                  for position in self.positions) / \
+                                  self.numParticles
+                initial_range_i = (self.initialSearchMaxs[i] -
+                                   self.initialSearchMins[i])
+                new_range_i = min(initial_range_i, uncertainty*REGROUP_FACTOR)
+                newMins[i] = gBest_i - .5*new_range_i
+                newMaxs[i] = gBest_i + .5*new_range_i
 
         if DEBUG and DEBUG_REGROUPING:
             print "range mins"
@@ -357,51 +349,140 @@ class Swarm:
     def redistributeParticles(self):
         '''
         Randomly spreads particles around gBest and on the new ranges,
-        as described in regroupSwarm
+        as described in regroupSwarm, and zeroes their velocities
         '''
-        for p in self.particles:
-            newPosition = [0]*self.nSpace
-
-            for i in range(0, self.nSpace):
-                R_i = random.random()
-                range_i = self.currSearchMaxs[i] - self.currSearchMins[i]
-
-                # randomly distributed around gBest, at radius of half the new range
-                newPosition[i] = self.gBest_position[i] \
-                    + R_i*range_i \
-                    - 0.5*range_i
+        self._setBounds(self.currSearchMins, self.currSearchMaxs)
+        if numpy is not None:
+            ranges = self._maxs - self._mins
+            # randomly distributed around gBest, at radius of half the new range
+            self.positions = (numpy.array(self.gBest_position, numpy.float64) +
+                              self._random.random_sample(self.positions.shape)*
+                              ranges - 0.5*ranges)
+            self.velocities = numpy.zeros_like(self.positions)
+            return
 
-            # now tell the particle where to go, and zero its initial velocity
-            p.setPosition(newPosition)
-            p.setBounds(self.currSearchMins, self.currSearchMaxs)
-            p.zeroVelocity()
+        ranges = [sMax - sMin for sMin, sMax in zip(self.currSearchMins,
+                                                    self.currSearchMaxs)]
+        gBestRanges = zip(self.gBest_position, ranges)
+        rand = random.random
+        self.positions = [[gBest_i + rand()*range_i - 0.5*range_i
+                           for gBest_i, range_i in gBestRanges]
+                          for p in xrange(self.numParticles)]
+        self.velocities = [[0.]*self.nSpace for p in xrange(self.numParticles)]
 
     def tickCurrentParticle(self):
         '''
-        Tells the current particle the gBest, ticks it, listens to see if
-        it found a potential new gBest
-        Each time we tick the last particle in this iteration, run iterationUpkeep()
+        Takes in the current particle's heuristic, updates its own best and
+        the swarm's candidate gBest, and moves on to the next particle.
+        Once the last particle in this iteration is scored, moves them all
+        and runs iterationUpkeep()
 
         IMPORTANT: Assumes that the current particle's heuristic has been set externally
         '''
-        (this_gBest, this_gBest_position) = \
-            self.particles[self.partIndex].tick(self.gBest, self.gBest_position)
+        i = self.partIndex
+        heuristic = self.heuristics[i]
+
+        # Update local best and its fitness
+        if heuristic > self.pBests[i]:
+            self.pBests[i] = heuristic
+            self.pBestPositions[i] = _toList(self.positions[i])
 
         if DEBUG and DEBUG_PROGRESS:
-            self.particles[self.partIndex].printState()
+            self.particles[i].printState()
 
         # save this particle's idea of gBest, if it's any good
-        if this_gBest > self.new_gBest:
-            self.new_gBest = this_gBest
-            self.new_gBest_position = this_gBest_position
+        pBest = self.pBests[i]
+        if pBest > self.gBest and pBest > self.new_gBest:
+            self.new_gBest = float(pBest)
+            self.new_gBest_position = _toList(self.pBestPositions[i])
 
         # increment the particle index after we tick it
         self.partIndex += 1
 
         # if this is a new iteration, do some housekeeping
         if self.partIndex >= self.numParticles:
+            self.moveParticles()
             self.iterationUpkeep()
 
+    def moveParticles(self):
+        '''
+        Updates every particle's velocity, towards its pBest and the gBest
+        it was scored against, and then its position. Velocities are
+        capped, and a particle that leaves the search range is put back
+        at random with no velocity.
+        '''
+        if numpy is not None:
+            self._moveArrays()
+            self.moves += 1
+        else:
+            self._moveLists()
+            self.moves = [moves + 1 for moves in self.moves]
+
+    def _moveArrays(self):
+        shape = self.positions.shape
+        positions = self.positions
+        gBest = numpy.array(self.gBest_position, numpy.float64)
+
+        # Random components to avoid local minima
+        R1 = self._random.random_sample(shape)
+        R2 = self._random.random_sample(shape)
+        velocities = (self.inertias[:, numpy.newaxis]*self.velocities +
+                      COG*R1*(self.pBestPositions - positions) +
+                      SOC*R2*(gBest - positions))
+        numpy.clip(velocities, -self._caps, self._caps, velocities)
+        velocities[numpy.abs(velocities) < VELOCITY_MINIMUM_MAGNITUDE] = 0.
+        # if mins[i] == maxs[i] then ignore, we aren't optimizing it
+        velocities = numpy.where(self._optimizedMask, velocities,
+                                 self.velocities)
+
+        newPositions = positions + velocities
+        lost = newPositions > self._maxs
+        if RANDOMIZE_LOST_PARTICLES:
+            lost |= newPositions < self._mins
+        numpy.clip(newPositions, self._mins, self._maxs, newPositions)
+        if lost.any():
+            if DEBUG:
+                print 'Randomized %d lost particle dimensions' % lost.sum()
+            randomized = (self._mins + self._random.random_sample(shape)*
+                          (self._maxs - self._mins))
+            newPositions = numpy.where(lost, randomized, newPositions)
+            velocities[lost] = 0.
+
+        self.positions = newPositions
+        self.velocities = velocities
+
+    def _moveLists(self):
+        gBest = self.gBest_position
+        rand = random.random
+        uniform = random.uniform
+        searchMins = self.currSearchMins
+        searchMaxs = self.currSearchMaxs
+        caps = self._caps
+        for p in xrange(self.numParticles):
+            inertia = self.inertias[p]
+            position = self.positions[p]
+            velocity = self.velocities[p]
+            pBest = self.pBestPositions[p]
+            for i in self._optimized:
+                newVelocity = inertia*velocity[i] \
+                    + COG * rand() * (pBest[i] - position[i]) \
+                    + SOC * rand() * (gBest[i] - position[i])
+                newVelocity = min(max(newVelocity, -caps[i]), caps[i])
+                if abs(newVelocity) < VELOCITY_MINIMUM_MAGNITUDE:
+                    newVelocity = 0
+                velocity[i] = newVelocity
+
+                newPosition = position[i] + newVelocity
+                if ((newPosition > searchMaxs[i]) or
+                    (newPosition < searchMins[i]) and
+                    RANDOMIZE_LOST_PARTICLES):
+                    if DEBUG:
+                        print 'Randomized a lost particle (dimension {0})'.format(i)
+                    position[i] = uniform(searchMins[i], searchMaxs[i])
+                    velocity[i] = 0
+                else:
+                    position[i] = min(max(newPosition, searchMins[i]),
+                                      searchMaxs[i])
 
     def iterationUpkeep(self):
         '''
@@ -426,12 +507,7 @@ class Swarm:
         # Check for premature convergence of the Swarm, as defined by all
         # particles being closer than a percentage of the search space to
         # the gBest_position
-        furthestParticleDistance = 0;
-
-        for p in self.particles:
-            gBestDistance = p.distanceNd(self.gBest_position)
-            if gBestDistance > furthestParticleDistance:
-                furthestParticleDistance = gBestDistance
+        furthestParticleDistance = self.furthestParticleDistance()
 
         if DEBUG and DEBUG_REGROUPING:
             print "furthestParticleDistance: %s" % furthestParticleDistance
@@ -442,6 +518,21 @@ class Swarm:
                 print "Prematurely converged! Regrouping around current gBest"
             self.regroupSwarm()
 
+    def furthestParticleDistance(self):
+        '''
+        How far the particle furthest from gBest_position is, over the
+        dimensions being searched
+        '''
+        if numpy is not None:
+            offsets = (self.positions - numpy.array(self.gBest_position,
+                                                    numpy.float64))
+            offsets = offsets[:, self._optimizedMask]
+            if not offsets.size:
+                return 0.
+            return float(numpy.sqrt((offsets*offsets).sum(axis = 1)).max())
+        return max(particle.distanceNd(self.gBest_position)
+                   for particle in self.particles)
+
     def calculateSearchSize(self):
         '''
         The search space size is equal to:
@@ -454,9 +545,29 @@ class Swarm:
             if self.currSearchMins[i] == self.currSearchMaxs[i]:
                 continue
 
-            size *= fabs(self.currSearchMaxs[i] - self.currSearchMins[i])
+            size *= abs(self.currSearchMaxs[i] - self.currSearchMins[i])
 
         if DEBUG and DEBUG_REGROUPING:
             print "search space size: %s" % size
 
         return size
+
+def _fromParticles(state):
+    '''
+    The state of a swarm pickled when it kept a list of Particles, each
+    with its own lists, in today's form. Particles already ticked this
+    iteration had moved then, and will move once more at its end.
+    '''
+    particles = state['particles']
+    converted = dict(state)
+    converted['positions'] = [list(p.position) for p in particles]
+    converted['velocities'] = [list(p.velocity) for p in particles]
+    converted['pBestPositions'] = [list(p.pBest_position) for p in particles]
+    converted['pBests'] = [p.pBest for p in particles]
+    converted['heuristics'] = [p.heuristic for p in particles]
+    converted['inertias'] = [p.INERTIAL for p in particles]
+    converted['moves'] = [p.moves for p in particles]
+    for name in ('gBest_position', 'new_gBest_position', 'currSearchMins',
+                 'currSearchMaxs', 'initialSearchMins', 'initialSearchMaxs'):
+        converted[name] = list(state[name])
+    return converted
@@ -0,0 +1,246 @@
+"""
+Profiler.py - profilers that can be switched on and off while Brain runs
+
+SamplingProfiler walks the frame loop's stack from a background thread a
+couple of hundred times a second, so the behaviors run at full speed while
+it is on. FrameProfiler is the deterministic alternative: it runs one frame
+in every N under cProfile.
+
+Both aggregate in memory. Every DUMP_INTERVAL seconds, and when stopped,
+they overwrite a single pstats-compatible file (load it with
+pstats.Stats(path)). The sampler also writes path + '.folded', which is
+the input format of flamegraph.pl. Files are written from a separate
+thread so the frame loop never waits on the disk.
+"""
+import marshal
+import os
+import sys
+import threading
+import time
+
+try:
+    import cProfile
+except ImportError:
+    cProfile = None
+
+from . import FSA
+
+PROFILE_FILE = 'pythonStats'
+SAMPLE_INTERVAL = 0.005 # seconds
+FRAME_PERIOD = 10       # FrameProfiler profiles one frame in this many
+DUMP_INTERVAL = 10.0    # seconds between rolling dumps
+
+# Stacks are tagged with the FSA they ran under, so player, tracker and nav
+# time can be told apart even though they share FSA.run
+_FSA_RUN_CODE = FSA.FSA.run.im_func.func_code
+
+def _writeFile(path, data):
+    """Writes then renames so readers never see a half written file."""
+    tmp = path + '.tmp'
+    f = open(tmp, 'wb')
+    try:
+        f.write(data)
+    finally:
+        f.close()
+    os.rename(tmp, path)
+
+class _AsyncWriter(object):
+    """Runs one dump at a time off the calling thread."""
+    def __init__(self):
+        self.thread = None
+
+    def busy(self):
+        return self.thread is not None and self.thread.isAlive()
+
+    def write(self, job):
+        if self.busy():
+            return False
+        self.thread = threading.Thread(target=job, name='ProfileWriter')
+        self.thread.setDaemon(True)
+        self.thread.start()
+        return True
+
+    def join(self):
+        if self.thread is not None:
+            self.thread.join()
+
+def _funcLabel(code):
+    return (code.co_filename, code.co_firstlineno, code.co_name)
+
+def stacksToStats(stacks, interval):
+    """
+    Turns {stack : sampleCount} into a pstats stats dict, charging each
+    sample interval seconds. Call counts are sample counts.
+    """
+    stats = dict()
+    for stack, count in stacks.iteritems():
+        seconds = count * interval
+        funcs = [_funcLabel(c) for c in stack if not isinstance(c, str)]
+        seen = set()
+        caller = None
+        for func in funcs:
+            entry = stats.get(func)
+            if entry is None:
+                entry = stats[func] = [0, 0, 0.0, 0.0, dict()]
+            entry[1] += count
+            if func not in seen:
+                seen.add(func)
+                entry[0] += count
+                entry[3] += seconds
+            if caller is not None:
+                entry[4][caller] = entry[4].get(caller, 0) + count
+            caller = func
+        if funcs:
+            stats[funcs[-1]][2] += seconds
+    return dict((func, tuple(entry)) for func, entry in stats.iteritems())
+
+def stacksToFolded(stacks):
+    """Turns {stack : sampleCount} into flamegraph.pl's folded format."""
+    lines = []
+    for stack, count in stacks.iteritems():
+        names = []
+        for c in stack:
+            if isinstance(c, str):
+                names.append(c)
+            else:
+                names.append('%s:%s' % (os.path.basename(c.co_filename),
+                                        c.co_name))
+        lines.append('%s %d' % (';'.join(names), count))
+    lines.sort()
+    return '\n'.join(lines) + '\n'
+
+class SamplingProfiler(object):
+    """
+    Samples the stack of the thread that called start() from a background
+    thread. Aggregated stacks live in self.stacks as {stack : count}.
+    """
+    def __init__(self, path = PROFILE_FILE, interval = SAMPLE_INTERVAL,
+                 dumpInterval = DUMP_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.dumpInterval = dumpInterval
+
+        self.stacks = dict()
+        self.samples = 0
+        self.running = False
+        self.targetThread = None
+        self.thread = None
+        self.writer = _AsyncWriter()
+
+    def start(self):
+        if self.running:
+            return
+        self.targetThread = threading.currentThread().ident
+        self.running = True
+        self.thread = threading.Thread(target=self._loop,
+                                       name='SamplingProfiler')
+        self.thread.setDaemon(True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Stops sampling and writes a final dump in the background, once the
+        sampler and any rolling dump still being written have finished.
+        """
+        if not self.running:
+            return
+        self.running = False
+        self.thread.join()
+        self.writer.join()
+        self.dump()
+
+    def _loop(self):
+        lastDump = time.time()
+        while self.running:
+            time.sleep(self.interval)
+            self.sample()
+            if time.time() - lastDump > self.dumpInterval:
+                lastDump = time.time()
+                self.dump()
+
+    def sample(self):
+        frame = sys._current_frames().get(self.targetThread)
+        if frame is None:
+            return
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            if code is _FSA_RUN_CODE:
+                fsa = frame.f_locals.get('self')
+                stack.append('[' + getattr(fsa, 'name', 'FSA') + ']')
+            stack.append(code)
+            frame = frame.f_back
+        stack.reverse()
+        stack = tuple(stack)
+        self.stacks[stack] = self.stacks.get(stack, 0) + 1
+        self.samples += 1
+
+    def dump(self):
+        """Snapshots the samples and writes them without blocking."""
+        stacks = self.stacks.copy()
+        interval = self.interval
+        path = self.path
+
+        def job():
+            _writeFile(path, marshal.dumps(stacksToStats(stacks, interval)))
+            _writeFile(path + '.folded', stacksToFolded(stacks))
+        return self.writer.write(job)
+
+    def reset(self):
+        self.stacks = dict()
+        self.samples = 0
+
+class FrameProfiler(object):
+    """
+    Deterministic profiling of one frame in every `period`. A single
+    cProfile.Profile accumulates across the profiled frames.
+    """
+    def __init__(self, path = PROFILE_FILE, period = FRAME_PERIOD,
+                 dumpInterval = DUMP_INTERVAL):
+        if cProfile is None:
+            raise ImportError("cProfile is not available on this system")
+        self.path = path
+        self.period = period
+        self.dumpInterval = dumpInterval
+
+        self.profile = cProfile.Profile()
+        self.frames = 0
+        self.profiledFrames = 0
+        self.running = False
+        self.lastDump = 0
+        self.writer = _AsyncWriter()
+
+    def start(self):
+        self.running = True
+        self.lastDump = time.time()
+
+    def stop(self):
+        """Writes a final dump once any rolling dump has been written."""
+        if not self.running:
+            return
+        self.running = False
+        self.writer.join()
+        self.dump()
+
+    def runFrame(self, function, *args):
+        self.frames += 1
+        if not self.running or self.frames % self.period != 0:
+            return function(*args)
+
+        self.profiledFrames += 1
+        result = self.profile.runcall(function, *args)
+
+        if time.time() - self.lastDump > self.dumpInterval:
+            self.lastDump = time.time()
+            self.dump()
+        return result
+
+    def dump(self):
+        # snapshot_stats has to run here, but marshalling can wait
+        self.profile.create_stats()
+        stats = self.profile.stats.copy()
+        path = self.path
+
+        def job():
+            _writeFile(path, marshal.dumps(stats))
+        return self.writer.write(job)
@@ -0,0 +1,454 @@
+"""
+Recorder.py - binary log of everything Brain reads from the interface
+
+FrameRecorder captures the incoming messages once per frame into an append
+only log, so real games can be replayed through the behaviors later. The
+log is
+
+    header   MAGIC, VERSION, length, marshal({'fields', 'schemas', ...})
+    frames   struct FRAME (index, brain time, length),
+             zlib(marshal(values))
+
+plus an index file (path + INDEX_SUFFIX) holding the offset of every frame
+as a little endian uint64, for random access. FrameLog reads both back.
+
+Messages are walked through the same accessors the behaviors use, so this
+works on the boost messages and the headless stand-ins alike. Each message
+type is described once in the header by a schema built from its accessors;
+a frame then stores, for every message, a tuple of its primitive values,
+a tuple of its sub-messages (None when unset) and a tuple of its repeated
+fields. Unset primitives are recorded as their defaults.
+
+Capturing runs on the frame path; compression and file writes are batched
+and done by a background thread.
+"""
+import marshal
+import os
+import struct
+import threading
+import zlib
+from collections import deque
+from operator import attrgetter
+
+RECORD_FILE = 'brainFrames.log'
+INDEX_SUFFIX = '.idx'
+
+MAGIC = 'NBFR'
+VERSION = 1
+HEADER = struct.Struct('<4sHI')
+FRAME = struct.Struct('<IdI')
+OFFSET = struct.Struct('<Q')
+
+# Bytes of frames kept before they are handed to the writer thread
+FLUSH_BYTES = 64*1024
+
+# zlib level the writer thread compresses each frame with
+COMPRESSION = 1
+
+# interface fields captured each frame, in log order
+INPUTS = ('gameState',
+          'loc',
+          'visionRobot',
+          'visionField',
+          'visionObstacle',
+          'filteredBall',
+          'motionStatus',
+          'odometry',
+          'sonarState',
+          'footBumperState',
+          'joints',
+          'fallStatus')
+WORLD_MODELS = 'worldModelList'
+
+_PLAIN_TYPES = (int, long, float, bool, str, unicode)
+
+class RecorderError(Exception):
+    pass
+
+##
+##--------------SCHEMAS---------------##
+##
+
+def _isPrimitive(value):
+    return isinstance(value, (int, long, float, basestring))
+
+def _fieldNames(cls):
+    """Splits the accessors of a message class into single and repeated."""
+    single = []
+    repeated = []
+    for name in dir(cls):
+        if name.startswith('_'):
+            continue
+        if hasattr(cls, 'has_' + name) and hasattr(cls, 'clear_' + name):
+            single.append(name)
+        elif hasattr(cls, name + '_size') and hasattr(cls, 'add_' + name):
+            repeated.append(name)
+    return single, repeated
+
+def describe(cls, schemas):
+    """
+    Adds the schema of message class cls, and of every message type
+    reachable from it, to schemas. Types are found on a scratch instance.
+    """
+    typeName = cls.__name__
+    if typeName in schemas:
+        return typeName
+    scratch = cls()
+    single, repeated = _fieldNames(cls)
+
+    primitives = []
+    enums = []
+    messages = []
+    repeats = []
+    # placeholder so recursive types terminate
+    schemas[typeName] = None
+
+    for name in single:
+        value = getattr(scratch, name)
+        if _isPrimitive(value):
+            if type(value) not in _PLAIN_TYPES:
+                # boost enum values are int subclasses marshal won't take
+                enums.append(len(primitives))
+            primitives.append(name)
+        else:
+            messages.append((name, describe(type(value), schemas)))
+
+    for name in repeated:
+        try:
+            item = getattr(scratch, 'add_' + name)()
+        except TypeError:
+            # repeated primitives need a value to add
+            repeats.append((name, None))
+        else:
+            repeats.append((name, describe(type(item), schemas)))
+
+    schemas[typeName] = {'primitives' : tuple(primitives),
+                         'enums' : tuple(enums),
+                         'messages' : tuple(messages),
+                         'repeated' : tuple(repeats)}
+    return typeName
+
+class _Codec(object):
+    """A message schema compiled into accessors."""
+    __slots__ = ('primitives', 'getPrimitives', 'enums',
+                 'messages', 'repeated')
+
+    def __init__(self, schema):
+        self.primitives = schema['primitives']
+        self.enums = schema['enums']
+        if len(self.primitives) > 1:
+            self.getPrimitives = attrgetter(*self.primitives)
+        elif self.primitives:
+            getter = attrgetter(self.primitives[0])
+            self.getPrimitives = lambda message: (getter(message),)
+        else:
+            self.getPrimitives = lambda message: ()
+        # filled in by compileSchemas once every codec exists
+        self.messages = schema['messages']
+        self.repeated = schema['repeated']
+
+def compileSchemas(schemas):
+    """Turns {typeName : schema} from describe() into {typeName : codec}."""
+    codecs = dict((typeName, _Codec(schema))
+                  for typeName, schema in schemas.iteritems())
+    for codec in codecs.itervalues():
+        codec.messages = tuple((name, 'has_' + name, 'clear_' + name,
+                                codecs[typeName])
+                               for name, typeName in codec.messages)
+        codec.repeated = tuple((name, name + '_size', 'add_' + name,
+                                'clear_' + name,
+                                typeName and codecs[typeName])
+                               for name, typeName in codec.repeated)
+    return codecs
+
+def encode(message, codec):
+    """Turns a message into nested tuples that marshal can write."""
+    values = codec.getPrimitives(message)
+    if codec.enums:
+        values = list(values)
+        for i in codec.enums:
+            values[i] = int(values[i])
+        values = tuple(values)
+
+    messages = []
+    for name, hasName, clearName, subCodec in codec.messages:
+        # checking first keeps us from creating unset sub-messages
+        if getattr(message, hasName)():
+            messages.append(encode(getattr(message, name), subCodec))
+        else:
+            messages.append(None)
+
+    repeats = []
+    for name, sizeName, addName, clearName, subCodec in codec.repeated:
+        size = getattr(message, sizeName)()
+        item = getattr(message, name)
+        if subCodec is None:
+            items = [item(i) for i in xrange(size)]
+            if items and type(items[0]) not in _PLAIN_TYPES:
+                items = [int(value) for value in items]
+            repeats.append(items)
+        else:
+            repeats.append([encode(item(i), subCodec) for i in xrange(size)])
+
+    return (values, tuple(messages), tuple(repeats))
+
+def decode(values, message, codec):
+    """Writes values from encode() back into message."""
+    primitives, messages, repeats = values
+    for name, value in zip(codec.primitives, primitives):
+        setattr(message, name, value)
+
+    for (name, hasName, clearName, subCodec), value in \
+            zip(codec.messages, messages):
+        if value is None:
+            getattr(message, clearName)()
+        else:
+            decode(value, getattr(message, name), subCodec)
+
+    for (name, sizeName, addName, clearName, subCodec), items in \
+            zip(codec.repeated, repeats):
+        getattr(message, clearName)()
+        add = getattr(message, addName)
+        if subCodec is None:
+            for item in items:
+                add(item)
+        else:
+            for item in items:
+                decode(item, add(), subCodec)
+
+##
+##--------------RECORDING---------------##
+##
+
+class _LogWriter(threading.Thread):
+    """
+    Frames, compresses and appends queued frames to the log, and their
+    offsets to the index.
+    """
+    def __init__(self, logFile, indexFile, level):
+        threading.Thread.__init__(self, name='FrameRecorder')
+        self.setDaemon(True)
+        self.logFile = logFile
+        self.indexFile = indexFile
+        self.level = level
+        self.offset = 0
+        self.chunks = deque()
+        self.wake = threading.Event()
+        self.closing = False
+
+    def put(self, header, frames):
+        self.chunks.append((header, frames))
+        self.wake.set()
+
+    def write(self, header, frames):
+        data = []
+        offsets = []
+        if header is not None:
+            data.append(header)
+            self.offset += len(header)
+        for index, time, payload in frames:
+            payload = zlib.compress(payload, self.level)
+            offsets.append(OFFSET.pack(self.offset))
+            data.append(FRAME.pack(index, time, len(payload)))
+            data.append(payload)
+            self.offset += FRAME.size + len(payload)
+        self.logFile.write(''.join(data))
+        self.indexFile.write(''.join(offsets))
+
+    def run(self):
+        while True:
+            self.wake.wait()
+            self.wake.clear()
+            while self.chunks:
+                self.write(*self.chunks.popleft())
+            self.logFile.flush()
+            self.indexFile.flush()
+            if self.closing and not self.chunks:
+                break
+        self.logFile.close()
+        self.indexFile.close()
+
+    def close(self):
+        self.closing = True
+        self.wake.set()
+        self.join()
+
+class FrameRecorder(object):
+    """
+    Records the interface inputs once per frame with record(). The log
+    header is written on the first frame, once the message types are
+    known. close() flushes and waits for the writer.
+    """
+    def __init__(self, path = RECORD_FILE, info = None,
+                 flushBytes = FLUSH_BYTES, level = COMPRESSION):
+        self.path = path
+        self.info = info or dict()
+        self.flushBytes = flushBytes
+        self.frames = 0
+        self.bytes = 0
+
+        self.codecs = None
+        self.fields = None
+        self.header = None
+        self.pending = []
+        self.pendingBytes = 0
+
+        self.writer = _LogWriter(open(path, 'wb'),
+                                 open(path + INDEX_SUFFIX, 'wb'),
+                                 level)
+        self.writer.start()
+
+    def _start(self, interface):
+        schemas = dict()
+        fields = []
+        for name in INPUTS:
+            fields.append((name, describe(type(getattr(interface, name)),
+                                          schemas)))
+        worldModels = getattr(interface, WORLD_MODELS)()
+        fields.append((WORLD_MODELS, describe(type(worldModels[0]), schemas)))
+
+        header = marshal.dumps({'version' : VERSION,
+                                'info' : self.info,
+                                'fields' : tuple(fields),
+                                'schemas' : schemas})
+        self.header = HEADER.pack(MAGIC, VERSION, len(header)) + header
+
+        self.codecs = compileSchemas(schemas)
+        self.fields = [(name, self.codecs[typeName])
+                       for name, typeName in fields]
+
+    def record(self, interface, time):
+        """Captures one frame of input; time is the Brain's frame time."""
+        if self.writer is None:
+            return
+        if self.codecs is None:
+            self._start(interface)
+
+        values = []
+        for name, codec in self.fields[:-1]:
+            values.append(encode(getattr(interface, name), codec))
+        codec = self.fields[-1][1]
+        values.append([encode(model, codec)
+                       for model in getattr(interface, WORLD_MODELS)()])
+
+        payload = marshal.dumps(tuple(values))
+        self.pending.append((self.frames, time, payload))
+        self.pendingBytes += len(payload)
+        self.bytes += len(payload)
+        self.frames += 1
+        if self.pendingBytes >= self.flushBytes:
+            self.flush()
+
+    def flush(self):
+        """Hands the pending frames to the writer thread."""
+        if self.writer is None or (not self.pending and self.header is None):
+            return
+        self.writer.put(self.header, self.pending)
+        self.header = None
+        self.pending = []
+        self.pendingBytes = 0
+
+    def close(self):
+        if self.writer is None:
+            return
+        self.flush()
+        self.writer.close()
+        self.writer = None
+
+##
+##--------------READING---------------##
+##
+
+class FrameLog(object):
+    """
+    Reads a log written by FrameRecorder. Iterating gives
+    (index, time, values) for every frame; load() writes a frame's values
+    into an interface.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+
+        data = self.file.read(HEADER.size)
+        if len(data) < HEADER.size:
+            raise RecorderError(path + " has no header")
+        magic, version, length = HEADER.unpack(data)
+        if magic != MAGIC:
+            raise RecorderError(path + " is not a frame log")
+        if version != VERSION:
+            raise RecorderError("%s is version %d, expected %d" %
+                                (path, version, VERSION))
+        header = marshal.loads(self.file.read(length))
+        self.dataStart = self.file.tell()
+
+        # whatever the recording Brain wanted to note, like its player
+        self.info = header.get('info', dict())
+        self.schemas = header['schemas']
+        self.codecs = compileSchemas(self.schemas)
+        self.fields = [(name, self.codecs[typeName])
+                       for name, typeName in header['fields']]
+        self.offsets = self._readIndex()
+
+    def _readIndex(self):
+        indexPath = self.path + INDEX_SUFFIX
+        if not os.path.exists(indexPath):
+            return None
+        f = open(indexPath, 'rb')
+        try:
+            data = f.read()
+        finally:
+            f.close()
+        count = len(data)/OFFSET.size
+        return [OFFSET.unpack_from(data, i*OFFSET.size)[0]
+                for i in xrange(count)]
+
+    def __len__(self):
+        if self.offsets is None:
+            self.offsets = [offset for offset, frame in self._scan()]
+        return len(self.offsets)
+
+    def _readFrame(self):
+        data = self.file.read(FRAME.size)
+        if len(data) < FRAME.size:
+            return None
+        index, time, length = FRAME.unpack(data)
+        payload = self.file.read(length)
+        if len(payload) < length:
+            # the recorder was cut off mid frame
+            return None
+        return index, time, zlib.decompress(payload)
+
+    def _scan(self):
+        self.file.seek(self.dataStart)
+        while True:
+            offset = self.file.tell()
+            frame = self._readFrame()
+            if frame is None:
+                return
+            yield offset, frame
+
+    def __iter__(self):
+        for offset, (index, time, payload) in self._scan():
+            yield index, time, marshal.loads(payload)
+
+    def frame(self, i):
+        """Random access to frame i through the index."""
+        if self.offsets is None:
+            len(self)
+        self.file.seek(self.offsets[i])
+        frame = self._readFrame()
+        if frame is None:
+            raise RecorderError("frame %d of %s is truncated" % (i, self.path))
+        index, time, payload = frame
+        return index, time, marshal.loads(payload)
+
+    def load(self, values, interface):
+        """Writes one frame of recorded values into interface's messages."""
+        for (name, codec), value in zip(self.fields[:-1], values[:-1]):
+            decode(value, getattr(interface, name), codec)
+        codec = self.fields[-1][1]
+        for model, value in zip(getattr(interface, WORLD_MODELS)(), values[-1]):
+            decode(value, model, codec)
+
+    def close(self):
+        self.file.close()
@@ -0,0 +1,122 @@
+"""
+Scheduler.py - runs Brain's subsystems in order, each at its own rate
+
+Each task is a function with a divider and a priority. A task with
+divider n runs every nth frame. LOW priority tasks are also deferred when
+the frame has already used DEFER_FRACTION of its budget, and run on a
+later frame instead; after MAX_DEFERRED frames in a row they run anyway.
+CRITICAL and NORMAL tasks always run when due, so the player and
+navigator stay on time when something else, like vision, eats the frame.
+
+The time used is the FrameTimer's, from the start of the frame, so the
+clock tick, recorder and snapshot before the scheduler count against the
+budget too. With the timer disabled nothing is deferred.
+
+Tasks are marked on the FrameTimer as they finish, so their timings show
+up with the rest of the frame. dump() reports the schedule: how often
+each task ran, was skipped by its divider and was deferred.
+"""
+from . import Log
+
+CRITICAL = 0
+NORMAL = 1
+LOW = 2
+
+PRIORITY_NAMES = {CRITICAL : 'critical',
+                  NORMAL : 'normal',
+                  LOW : 'low'}
+
+# Share of the budget after which LOW priority tasks are put off
+DEFER_FRACTION = 0.75
+
+# Frames a LOW priority task can be put off in a row
+MAX_DEFERRED = 15
+
+class Task(object):
+    __slots__ = ('name', 'function', 'divider', 'priority',
+                 'runs', 'divided', 'deferred', 'owed', 'deferredInARow')
+
+    def __init__(self, name, function, divider, priority):
+        self.name = name
+        self.function = function
+        self.divider = divider
+        self.priority = priority
+        self.runs = 0
+        self.divided = 0
+        self.deferred = 0
+        # a deferred run still to be made
+        self.owed = False
+        self.deferredInARow = 0
+
+class Scheduler(object):
+    """
+    Add tasks in the order they should run each frame, then call run()
+    once per frame.
+    """
+    def __init__(self, timer):
+        self.timer = timer
+        self.tasks = []
+        self.tasksByName = dict()
+        self.frame = 0
+
+    def add(self, name, function, divider = 1, priority = NORMAL):
+        task = Task(name, function, divider, priority)
+        self.tasks.append(task)
+        self.tasksByName[name] = task
+        return task
+
+    def setDivider(self, name, divider):
+        """Runs the named task every divider frames from now on."""
+        self.tasksByName[name].divider = divider
+
+    def run(self):
+        frame = self.frame
+        self.frame += 1
+        timer = self.timer
+        mark = timer.mark
+        if timer.enabled:
+            deferAfter = timer.budget*DEFER_FRACTION
+        else:
+            deferAfter = None
+
+        for task in self.tasks:
+            if frame % task.divider and not task.owed:
+                task.divided += 1
+                continue
+
+            if (task.priority == LOW and
+                task.deferredInARow < MAX_DEFERRED and
+                deferAfter is not None and
+                timer.frameElapsed() > deferAfter):
+                task.deferred += 1
+                task.deferredInARow += 1
+                task.owed = True
+                continue
+
+            task.function()
+            task.runs += 1
+            task.owed = False
+            task.deferredInARow = 0
+            mark(task.name)
+
+    def report(self):
+        """{task name : (runs, divided, deferred)}"""
+        return dict((task.name, (task.runs, task.divided, task.deferred))
+                    for task in self.tasks)
+
+    def dump(self, outputFunction = None):
+        """Writes one line per task, in the order they run."""
+        if outputFunction is None:
+            outputFunction = Log.printLine
+        outputFunction("Scheduler: %d frames" % self.frame)
+        for task in self.tasks:
+            outputFunction("  %-20s %-8s every %-3d ran %7d divided %7d "
+                           "deferred %7d" %
+                           (task.name, PRIORITY_NAMES[task.priority],
+                            task.divider, task.runs, task.divided,
+                            task.deferred))
+
+    def reset(self):
+        for task in self.tasks:
+            task.runs = task.divided = task.deferred = 0
+        self.frame = 0
@@ -0,0 +1,205 @@
+"""
+Snapshot.py - Brain's inputs, read once per frame
+
+Reading a boost wrapped message goes through the wrapper on every access,
+and the transitions read the same fields over and over within a frame.
+Brain instead reads the fields the behaviors use into a WorldSnapshot at
+the start of the frame, and the behaviors read that.
+
+A WorldSnapshot holds plain floats, ints and bools, named after what they
+are (locX, gameState, headYaw, ...). The things behaviors hand around as
+objects (the ball, the goal posts, corners, motion status and teammates'
+world models) are small records with __slots__, whose fields keep their
+message names so brain.ball.vis.frames_on reads as before. Nothing else is
+copied; a field the behaviors start reading has to be added here.
+
+Nothing writes to a snapshot once it is taken.
+"""
+
+class VisualBall(object):
+    """The ball as vision saw it this frame."""
+    __slots__ = ('on', 'frames_on', 'frames_off', 'distance', 'bearing',
+                 'bearing_deg', 'angle_x_deg', 'heat')
+
+    def __init__(self, vis):
+        self.on = vis.on
+        self.frames_on = vis.frames_on
+        self.frames_off = vis.frames_off
+        self.distance = vis.distance
+        self.bearing = vis.bearing
+        self.bearing_deg = vis.bearing_deg
+        self.angle_x_deg = vis.angle_x_deg
+        self.heat = vis.heat
+
+class Ball(object):
+    """The filtered ball, relative and on the field."""
+    __slots__ = ('vis', 'distance', 'bearing', 'bearing_deg', 'rel_x',
+                 'rel_y', 'vel_x', 'x', 'y')
+
+    def __init__(self, ball):
+        self.vis = VisualBall(ball.vis)
+        self.distance = ball.distance
+        self.bearing = ball.bearing
+        self.bearing_deg = ball.bearing_deg
+        self.rel_x = ball.rel_x
+        self.rel_y = ball.rel_y
+        self.vel_x = ball.vel_x
+        self.x = ball.x
+        self.y = ball.y
+
+class VisualPost(object):
+    """A goal post's visual detection."""
+    __slots__ = ('on', 'frames_on', 'frames_off', 'distance', 'bearing',
+                 'bearing_deg', 'certainty')
+
+    def __init__(self, detection):
+        self.on = detection.on
+        self.frames_on = detection.frames_on
+        self.frames_off = detection.frames_off
+        self.distance = detection.distance
+        self.bearing = detection.bearing
+        self.bearing_deg = detection.bearing_deg
+        self.certainty = detection.certainty
+
+class Corner(object):
+    """
+    A visual corner. poss_id holds the ids it may be, and the class's
+    corner_id holds the message's enum of them (corner_id.CENTER_TOP_T,
+    ...), set when the first snapshot is taken.
+    """
+    __slots__ = ('distance', 'bearing', 'orientation',
+                 'physical_orientation', 'poss_id')
+    corner_id = None
+
+    def __init__(self, corner):
+        detection = corner.visual_detection
+        self.distance = detection.distance
+        self.bearing = detection.bearing
+        self.orientation = corner.orientation
+        self.physical_orientation = corner.physical_orientation
+        self.poss_id = tuple([corner.poss_id(i)
+                              for i in xrange(corner.poss_id_size())])
+
+class Motion(object):
+    """Motion's status flags."""
+    __slots__ = ('standing', 'body_is_active', 'walk_is_active',
+                 'head_is_active', 'calibrated')
+
+    def __init__(self, status):
+        self.standing = status.standing
+        self.body_is_active = status.body_is_active
+        self.walk_is_active = status.walk_is_active
+        self.head_is_active = status.head_is_active
+        self.calibrated = status.calibrated
+
+class MateModel(object):
+    """A teammate's world model, as TeamMember.update reads it."""
+    __slots__ = ('my_x', 'my_y', 'my_h', 'ball_on', 'ball_dist',
+                 'ball_bearing', 'role', 'sub_role', 'chase_time', 'active')
+
+    def __init__(self, model):
+        self.my_x = model.my_x
+        self.my_y = model.my_y
+        self.my_h = model.my_h
+        self.ball_on = model.ball_on
+        self.ball_dist = model.ball_dist
+        self.ball_bearing = model.ball_bearing
+        self.role = model.role
+        self.sub_role = model.sub_role
+        self.chase_time = model.chase_time
+        self.active = model.active
+
+class WorldSnapshot(object):
+    """
+    One frame of input. teamNumbers, scores and penalties are indexed by
+    team color, penalties then by player number - 1.
+    """
+    __slots__ = ('time',
+                 # loc
+                 'locX', 'locY', 'locH',
+                 # game state
+                 'gameState', 'secondaryState', 'kickOffTeam',
+                 'secsRemaining', 'teamNumbers', 'scores', 'penalties',
+                 # vision
+                 'ball', 'leftPost', 'rightPost', 'corners',
+                 'crossOn', 'crossDistance', 'crossBearing',
+                 'fieldEdgeLeft', 'fieldEdgeMiddle', 'fieldEdgeRight',
+                 'obstacleOnLeft', 'obstacleOnRight',
+                 # sensors and motion
+                 'sonarLeft', 'sonarRight', 'headYaw',
+                 'odometryX', 'odometryY', 'odometryH',
+                 'motion', 'falling', 'fallen', 'onFront',
+                 # comm
+                 'worldModels')
+
+class Snapshotter(object):
+    """
+    Takes WorldSnapshots of an interface. Corner.corner_id is filled in on
+    the first frame, once the message types are known.
+    """
+    def __init__(self):
+        self.started = False
+
+    def _start(self, interface):
+        vision = type(interface.visionField)()
+        Corner.corner_id = vision.add_visual_corner().corner_id
+        self.started = True
+
+    def take(self, interface, time):
+        if not self.started:
+            self._start(interface)
+        world = WorldSnapshot()
+        world.time = time
+
+        loc = interface.loc
+        world.locX = loc.x
+        world.locY = loc.y
+        world.locH = loc.h
+
+        game = interface.gameState
+        world.gameState = game.state
+        world.secondaryState = game.secondary_state
+        world.kickOffTeam = game.kick_off_team
+        world.secsRemaining = game.secs_remaining
+        teams = [game.team(i) for i in xrange(game.team_size())]
+        world.teamNumbers = tuple([team.team_number for team in teams])
+        world.scores = tuple([team.score for team in teams])
+        world.penalties = tuple([tuple([team.player(i).penalty for i in
+                                        xrange(team.player_size())])
+                                 for team in teams])
+
+        world.ball = Ball(interface.filteredBall)
+        vision = interface.visionField
+        world.leftPost = VisualPost(vision.goal_post_l.visual_detection)
+        world.rightPost = VisualPost(vision.goal_post_r.visual_detection)
+        world.corners = tuple([Corner(vision.visual_corner(i)) for i in
+                               xrange(vision.visual_corner_size())])
+        cross = vision.visual_cross
+        world.crossOn = cross.on
+        world.crossDistance = cross.distance
+        world.crossBearing = cross.bearing
+        edge = vision.visual_field_edge
+        world.fieldEdgeLeft = edge.distance_l
+        world.fieldEdgeMiddle = edge.distance_m
+        world.fieldEdgeRight = edge.distance_r
+        obstacles = interface.visionObstacle
+        world.obstacleOnLeft = obstacles.on_left
+        world.obstacleOnRight = obstacles.on_right
+
+        sonar = interface.sonarState
+        world.sonarLeft = sonar.us_left
+        world.sonarRight = sonar.us_right
+        world.headYaw = interface.joints.head_yaw
+        odometry = interface.odometry
+        world.odometryX = odometry.x
+        world.odometryY = odometry.y
+        world.odometryH = odometry.h
+        world.motion = Motion(interface.motionStatus)
+        fall = interface.fallStatus
+        world.falling = fall.falling
+        world.fallen = fall.fallen
+        world.onFront = fall.on_front
+
+        world.worldModels = tuple([MateModel(model) for model in
+                                   interface.worldModelList()])
+        return world
@@ -0,0 +1,120 @@
+"""
+StateStats.py - where an FSA spends its time, and how it moves
+
+Every FSA keeps one of these. For each state it counts the frames the
+state ran in, the time spent in it by the FSA's clock (residency), and
+the CPU time its function took to run (cost). Every switch is counted in
+a transition matrix, with the cost of the state function that made it,
+and kept in a fixed size ring of recent transitions, so a pair of states
+flipping back and forth shows up both as a large count and as a run of
+alternating entries in the ring.
+
+Nothing is allocated per frame: states are indexed by their FSA id and
+the ring is preallocated. export() returns everything as plain dicts and
+lists, keyed by state name, so it can be marshalled or printed.
+"""
+from array import array
+
+# Transitions kept in the ring
+RING_SIZE = 64
+
+class StateStats(object):
+    def __init__(self, ringSize = RING_SIZE):
+        self.frames = []
+        self.residency = []
+        self.cost = []
+        # (from id, to id) : count, and seconds the from state took
+        self.transitions = dict()
+        self.transitionCost = dict()
+        # cost of the state that ran last, until a switch claims it
+        self.hopCost = 0.0
+
+        self.ringTimes = array('d', [0.0]*ringSize)
+        self.ringFrom = array('i', [0]*ringSize)
+        self.ringTo = array('i', [0]*ringSize)
+        self.ringIndex = 0
+        self.ringCount = 0
+
+    def addState(self):
+        """Makes room for the next state id."""
+        self.frames.append(0)
+        self.residency.append(0.0)
+        self.cost.append(0.0)
+
+    def ran(self, stateId, elapsed):
+        """stateId's function ran once, for elapsed seconds."""
+        self.frames[stateId] += 1
+        self.cost[stateId] += elapsed
+        self.hopCost = elapsed
+
+    def switched(self, fromId, toId, now, residency):
+        """fromId was left for toId at now, after residency seconds."""
+        if fromId >= 0:
+            self.residency[fromId] += residency
+        key = (fromId, toId)
+        self.transitions[key] = self.transitions.get(key, 0) + 1
+        self.transitionCost[key] = (self.transitionCost.get(key, 0.0) +
+                                    self.hopCost)
+        self.hopCost = 0.0
+
+        index = self.ringIndex
+        self.ringTimes[index] = now
+        self.ringFrom[index] = fromId
+        self.ringTo[index] = toId
+        index += 1
+        if index == len(self.ringTimes):
+            index = 0
+        self.ringIndex = index
+        self.ringCount += 1
+
+    def recent(self):
+        """(time, from id, to id) of the kept transitions, oldest first."""
+        size = len(self.ringTimes)
+        count = min(self.ringCount, size)
+        start = (self.ringIndex - count) % size
+        return [(self.ringTimes[i % size], self.ringFrom[i % size],
+                 self.ringTo[i % size])
+                for i in xrange(start, start + count)]
+
+    def export(self, names, currentId = -1, currentResidency = 0.0):
+        """
+        Everything by state name. The time so far in the current state is
+        counted in its residency.
+        """
+        def name(stateId):
+            if stateId < 0:
+                return ''
+            return names[stateId]
+
+        states = dict()
+        for stateId, stateName in enumerate(names):
+            residency = self.residency[stateId]
+            if stateId == currentId:
+                residency += currentResidency
+            states[stateName] = {'frames' : self.frames[stateId],
+                                 'residency' : residency,
+                                 'cost' : self.cost[stateId]}
+
+        transitions = dict()
+        transitionCost = dict()
+        for (fromId, toId), count in self.transitions.iteritems():
+            transitions.setdefault(name(fromId), dict())[name(toId)] = count
+            transitionCost.setdefault(name(fromId), dict())[name(toId)] = \
+                self.transitionCost[fromId, toId]
+
+        return {'states' : states,
+                'transitions' : transitions,
+                'transitionCost' : transitionCost,
+                'recent' : [(when, name(fromId), name(toId))
+                            for when, fromId, toId in self.recent()]}
+
+    def reset(self):
+        for stateId in xrange(len(self.frames)):
+            self.frames[stateId] = 0
+            self.residency[stateId] = 0.0
+            self.cost[stateId] = 0.0
+        self.transitions.clear()
+        self.transitionCost.clear()
+        self.hopCost = 0.0
+        self.ringIndex = 0
+        self.ringCount = 0
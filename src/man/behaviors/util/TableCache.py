@@ -0,0 +1,276 @@
+#!/usr/bin/python
+"""
+TableCache.py - the behaviors' precomputed tables, loaded in one read
+
+SweetMoves, StiffnessModes and HeadMoves are tables worked out when they
+are imported: SweetMoves alone mirrors a dozen moves with mirrorMove and
+flipStiffness. The results are the same every time, so the build works
+them out once and keeps the finished modules in one marshalled file,
+
+    python TableCache.py output [package]
+
+which imports just those modules, without the rest of the behaviors or
+the robot's bindings. cmake reruns it whenever one of their sources
+changes and installs the file as CACHE_FILE, next to the package.
+
+The behaviors package calls install() before it imports Brain. That reads
+the file once and, through an import hook, serves each table module whose
+sources are unchanged. Sources are compared by size and checksum, so a
+copy to the robot that doesn't keep modification times still matches,
+and a module edited on the robot is imported from source. The hook takes
+itself out once it has served or dropped every module in the file.
+Without a cache file everything imports as usual.
+
+A module is stored as its globals: data marshal can hold, functions as
+their code, and modules, classes and functions from elsewhere by name.
+A module holding anything else, like instances, is imported as usual;
+that is why PBConstants, kicks and GoTeam aren't in TABLES.
+"""
+import __builtin__
+import imp
+import marshal
+import os
+import sys
+import types
+import zlib
+
+VERSION = 2
+
+# Modules served from the cache, relative to the behaviors package
+TABLES = ('StiffnessModes', 'SweetMoves', 'headTracker.HeadMoves')
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_FILE = os.path.join(PACKAGE_DIR, 'tables.cache')
+
+# Kinds of stored globals
+DATA = 0
+MODULE = 1
+FUNCTION = 2
+IMPORTED = 3
+ALIAS = 4
+
+def _sourceFile(module):
+    """The module's source, relative to the package, or None if outside."""
+    path = getattr(module, '__file__', None)
+    if path is None:
+        return None
+    if path.endswith(('.pyc', '.pyo')):
+        path = path[:-1]
+    path = os.path.relpath(os.path.abspath(path), PACKAGE_DIR)
+    if path.startswith(os.pardir):
+        return None
+    return path
+
+def _signature(path):
+    try:
+        f = open(os.path.join(PACKAGE_DIR, path), 'rb')
+    except IOError:
+        return None
+    try:
+        source = f.read()
+    finally:
+        f.close()
+    return (len(source), zlib.crc32(source))
+
+def _isData(value):
+    try:
+        marshal.dumps(value)
+    except ValueError:
+        return False
+    return not isinstance(value, types.CodeType)
+
+def snapshot(module):
+    """
+    (entries, dependencies) for a module, or None if a global can't be
+    stored. dependencies maps the package's files the values came from to
+    their signatures.
+    """
+    entries = []
+    dependencies = {_sourceFile(module) : None}
+    seen = dict()
+    for name, value in sorted(vars(module).iteritems()):
+        if name.startswith('__') and name != '__doc__':
+            continue
+
+        if id(value) in seen and not isinstance(value, (int, float, str)):
+            entries.append((name, ALIAS, seen[id(value)]))
+            continue
+        seen[id(value)] = name
+
+        if isinstance(value, types.ModuleType):
+            entries.append((name, MODULE, value.__name__))
+            dependencies[_sourceFile(value)] = None
+        elif (isinstance(value, types.FunctionType) and
+              value.__module__ == module.__name__):
+            if value.func_closure is not None:
+                return None
+            defaults = value.func_defaults
+            if defaults is not None and not _isData(defaults):
+                return None
+            entries.append((name, FUNCTION,
+                            (value.func_code, value.__name__, defaults)))
+        elif isinstance(value, (type, types.ClassType, types.FunctionType,
+                                types.BuiltinFunctionType)):
+            home = sys.modules.get(value.__module__)
+            if home is None or getattr(home, value.__name__, None) is not value:
+                return None
+            entries.append((name, IMPORTED, (value.__module__,
+                                             value.__name__)))
+            dependencies[_sourceFile(home)] = None
+        elif _isData(value):
+            entries.append((name, DATA, value))
+        else:
+            return None
+
+    dependencies.pop(None, None)
+    for path in dependencies:
+        dependencies[path] = _signature(path)
+    return entries, dependencies
+
+def _importModule(name):
+    __import__(name)
+    return sys.modules[name]
+
+def restore(module, entries):
+    """Fills in a new module from its snapshot entries."""
+    namespace = module.__dict__
+    aliases = []
+    for name, kind, payload in entries:
+        if kind == DATA:
+            namespace[name] = payload
+        elif kind == MODULE:
+            namespace[name] = _importModule(payload)
+        elif kind == FUNCTION:
+            code, functionName, defaults = payload
+            namespace[name] = types.FunctionType(code, namespace,
+                                                 functionName, defaults)
+        elif kind == IMPORTED:
+            moduleName, attribute = payload
+            namespace[name] = getattr(_importModule(moduleName), attribute)
+        else:
+            aliases.append((name, payload))
+    for name, other in aliases:
+        namespace[name] = namespace[other]
+
+class _Importer(object):
+    """
+    Serves the modules in the cache whose dependencies are unchanged, and
+    leaves sys.meta_path once none are left.
+    """
+    def __init__(self, modules):
+        # full module name : (source file, entries, dependencies)
+        self.modules = modules
+
+    def find_module(self, fullname, path = None):
+        cached = self.modules.get(fullname)
+        if cached is None:
+            return None
+        source, entries, dependencies = cached
+        for dependency, signature in dependencies.iteritems():
+            if _signature(dependency) != signature:
+                self._done(fullname)
+                return None
+        return self
+
+    def load_module(self, fullname):
+        if fullname in sys.modules:
+            return sys.modules[fullname]
+        source, entries, dependencies = self.modules[fullname]
+        module = imp.new_module(fullname)
+        module.__file__ = os.path.join(PACKAGE_DIR, source)
+        module.__loader__ = self
+        module.__package__ = fullname.rpartition('.')[0]
+        module.__builtins__ = __builtin__.__dict__
+        sys.modules[fullname] = module
+        try:
+            restore(module, entries)
+        except Exception:
+            del sys.modules[fullname]
+            raise
+        finally:
+            self._done(fullname)
+        return module
+
+    def _done(self, fullname):
+        del self.modules[fullname]
+        if not self.modules and self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+def _header(package):
+    return (VERSION, imp.get_magic(), package)
+
+def _read(path, package):
+    try:
+        f = open(path, 'rb')
+    except IOError:
+        return dict()
+    try:
+        try:
+            header, modules = marshal.loads(f.read())
+        except (EOFError, ValueError, TypeError):
+            return dict()
+    finally:
+        f.close()
+    if header != _header(package):
+        return dict()
+    return modules
+
+def install(path = CACHE_FILE):
+    """Reads the cache and serves its modules until they are imported."""
+    package = __name__.rpartition('.')[0].rpartition('.')[0]
+    modules = _read(path, package)
+    if modules:
+        sys.meta_path.insert(0, _Importer(modules))
+
+def _importTables(package):
+    """
+    Imports the table modules as package.<name> without running the
+    package's __init__, which needs the robot's bindings.
+    """
+    for name in ('',) + TABLES:
+        parts = name.split('.')[:-1] if name else []
+        for i in xrange(len(parts) + 1):
+            parent = '.'.join([package] + parts[:i])
+            if parent not in sys.modules:
+                module = imp.new_module(parent)
+                module.__path__ = [os.path.join(PACKAGE_DIR, *parts[:i])]
+                sys.modules[parent] = module
+    return [_importModule(package + '.' + name) for name in TABLES]
+
+def build(path, package):
+    """
+    Writes the cache of the table modules as package.<name> to path.
+    Returns the names of the modules that could not be cached.
+    """
+    modules = dict()
+    uncacheable = []
+    for module in _importTables(package):
+        stored = snapshot(module)
+        if stored is None:
+            uncacheable.append(module.__name__)
+            continue
+        entries, dependencies = stored
+        modules[module.__name__] = (_sourceFile(module), entries,
+                                    dependencies)
+
+    tmp = path + '.tmp'
+    f = open(tmp, 'wb')
+    try:
+        f.write(marshal.dumps((_header(package), modules), 2))
+    finally:
+        f.close()
+    os.rename(tmp, path)
+    return uncacheable
+
+def main(argv):
+    if len(argv) not in (1, 2):
+        print "Usage: TableCache.py output [package]"
+        sys.exit(2)
+    package = argv[1] if len(argv) > 1 else os.path.basename(PACKAGE_DIR)
+    # nothing is left behind in the source tree
+    sys.dont_write_bytecode = True
+    for name in build(argv[0], package):
+        print "TableCache: %s can't be cached, it imports from source" % name
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
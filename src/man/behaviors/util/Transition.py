@@ -1,5 +1,3 @@
-import Queue
-
 OCCASIONALLY = 0.3
 SOME_OF_THE_TIME = .5
 MOST_OF_THE_TIME = .75
@@ -12,11 +10,31 @@ HIGH_PRECISION = 50
 
 DEBUG = True
 
-def resetTransitions(state):
+def compileTransitions(spec):
+    """
+    Compiles a transition spec into {state name : ((transition, target
+    state), ...)}. The spec lists each state with its transitions,
+
+        ((state, ((condition, threshold, frameWindow, target state),
+                  ...)),
+         ...)
+
+    and a state's transitions are checked in the order they are listed,
+    so when several are true in the same frame the first one wins. Each
+    compile makes new CountTransitions, so FSAs never share windows.
+    """
+    table = dict()
+    for state, transitions in spec:
+        table[state.__name__] = tuple(
+            (CountTransition(condition, threshold, frameWindow), targetState)
+            for condition, threshold, frameWindow, targetState in transitions)
+    return table
+
+def resetTransitions(fsa, state):
     """
     resets the transitions of a state
     """
-    for transition, targetState in state.transitions.iteritems():
+    for transition, targetState in fsa.transitionTable.get(state.__name__, ()):
         transition.reset()
 
 def getNextState(fsa, state):
@@ -24,23 +42,44 @@ def getNextState(fsa, state):
     Method for checking all of the transitions of a state
     and returning the next state
     If any of the transitions are true, then it returns the associate state
+    A state without transitions stays.
     """
+    transitions = fsa.transitionTable.get(state.__name__)
+    if not transitions:
+        return fsa.stay()
+
     if fsa.firstFrame():
-        resetTransitions(state)
+        for transition, targetState in transitions:
+            transition.reset()
 
     #@todo: make it so we can tell the transition whether to use goNow or goLater
-    for transition, targetState in state.transitions.iteritems():
-        if transition.checkCondition(fsa):
+    transition, targetState = checkTransitions(fsa, transitions)
+    if transition is not None:
 
-            if DEBUG:
-                fsa.printf(fsa.name + " switching to " + targetState.__name__ +
-                           " from " + state.__name__ + " after " + str(transition))
-            targetState.incomingTransition = transition
-            targetState.incomingState = state
-            return fsa.goNow(targetState.__name__) #FSA use states by their names
+        if DEBUG:
+            fsa.printf(fsa.name + " switching to " + targetState.__name__ +
+                       " from " + state.__name__ + " after " + str(transition))
+        fsa.incomingTransition = transition
+        fsa.incomingState = state
+        return fsa.goNow(targetState.__name__) #FSA use states by their names
 
     return fsa.stay()
 
+def checkTransitions(fsa, transitions):
+    """
+    Moves the windows of all of a state's compiled (transition, target
+    state) pairs along in one pass, so they always cover the same frames,
+    and returns the first (transition, target state) that is true, in
+    order, or (None, None).
+    """
+    fired = None
+    for pair in transitions:
+        if pair[0].checkCondition(fsa) and fired is None:
+            fired = pair
+    if fired is None:
+        return None, None
+    return fired
+
 
 class CountTransition:
     """
@@ -60,32 +99,44 @@ class CountTransition:
         self.threshold = threshold
         self.frameWindow = frameWindow
 
-        self.count = 0
-        self.fifo = Queue.Queue()
+        self.needed = threshold * frameWindow
+        # the last frameWindow results, one per frame, in a ring; index is
+        # the slot of the next frame. Slots are only read once the window
+        # has filled since the last reset, so reset() leaves them be
+        self.ring = [False]*frameWindow
+        self.reset()
 
     def checkCondition(self, fsa):
         """
         If the transition's condition was true for a certain number of frames
         in the frameWindow then return true
         """
-        if self.condition(fsa):
-            self.count += 1
-            self.fifo.put(1)
+        ring = self.ring
+        index = self.index
+        # the slot about to be written holds the oldest result once full
+        if self.filled == self.frameWindow:
+            if ring[index]:
+                self.count -= 1
         else:
-            self.fifo.put(0)
+            self.filled += 1
 
-        if self.fifo.qsize() > self.frameWindow:
-            self.count -= self.fifo.get()
+        result = ring[index] = bool(self.condition(fsa))
+        if result:
+            self.count += 1
 
-        if self.count >= self.threshold * self.frameWindow:
-            return True
-        else:
-            return False
+        index += 1
+        if index == self.frameWindow:
+            index = 0
+        self.index = index
+
+        return self.count >= self.needed
 
     def __str__(self):
         return (self.condition.__name__ + " happened " +
                 str(self.count) + " out of " + str(self.frameWindow) + " frames")
 
     def reset(self):
-        self.fifo = Queue.Queue()
+        """Empties the window, count included, as the Queue one did."""
+        self.index = 0
+        self.filled = 0
         self.count = 0
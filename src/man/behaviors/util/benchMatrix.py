@@ -0,0 +1,127 @@
+#!/usr/bin/python
+"""
+benchMatrix.py - the Matrix engines side by side
+
+Times every operation of PyMatrix and, when NumPy imports, NumpyMatrix on
+random square matrices of each size, and least squares regressions on
+growing sets of points, printing microseconds per call:
+
+    python benchMatrix.py [size ...]
+"""
+import random
+import sys
+import timeit
+
+import Log
+import PyMatrix
+try:
+    import NumpyMatrix
+except ImportError:
+    NumpyMatrix = None
+
+SIZES = (2, 3, 4, 8, 16, 32)
+# Points fitted by the regressions, and the order of their polynomial
+POINTS = (10, 100, 1000)
+REGRESSION_DIMENSION = 3
+
+# Each timing runs for at least this many seconds
+MIN_TIME = 0.05
+
+MATRIX_OPERATIONS = (
+    ('times', lambda engine, a, b: a.times(b)),
+    ('plus', lambda engine, a, b: a.plus(b)),
+    ('scale', lambda engine, a, b: a.scale(2.0)),
+    ('transpose', lambda engine, a, b: a.transpose()),
+    ('inverse', lambda engine, a, b: a.inverse()),
+    ('solve', lambda engine, a, b: a.solve(b)),
+    ('LUDecomposition', lambda engine, a, b: engine.LUDecomposition(a)),
+    )
+# Timed on a decomposition made beforehand, as it is meant to be reused
+SOLVE_LU = 'solveLU'
+
+def perCall(function):
+    """Seconds per call of function, best of three runs."""
+    number = 1
+    while True:
+        elapsed = min(timeit.Timer(function).repeat(3, number))
+        if elapsed >= MIN_TIME:
+            return elapsed/number
+        number *= 10
+
+def engines():
+    found = [('python', PyMatrix)]
+    if NumpyMatrix is not None:
+        found.append(('numpy', NumpyMatrix))
+    return found
+
+def randomRows(rows, columns):
+    return [[random.uniform(-10.0, 10.0) for j in xrange(columns)]
+            for i in xrange(rows)]
+
+def benchMatrices(size):
+    """{operation : {engine name : seconds per call}} at one size."""
+    values = randomRows(size, size)
+    # diagonally dominant, so inverse() and solve() are well conditioned
+    for i in xrange(size):
+        values[i][i] += 20.0*size
+    others = randomRows(size, size)
+
+    results = dict()
+    for name, engine in engines():
+        a = engine.withValues(size, size, [row[:] for row in values])
+        b = engine.withValues(size, size, [row[:] for row in others])
+        for operation, run in MATRIX_OPERATIONS:
+            results.setdefault(operation, dict())[name] = \
+                perCall(lambda: run(engine, a, b))
+        decomposition = engine.LUDecomposition(a)
+        results.setdefault(SOLVE_LU, dict())[name] = \
+            perCall(lambda: decomposition.solveLU(b))
+    return results
+
+def benchRegressions(points):
+    """{function : {engine name : seconds per call}} for one data set."""
+    x = [float(i) for i in xrange(points)]
+    y = [3.0 + 0.5*i - 0.01*i*i + random.uniform(-1.0, 1.0) for i in x]
+    middle = x[points/2] + 0.5
+
+    results = dict()
+    for name, engine in engines():
+        fit = engine.leastSquares(x, y, REGRESSION_DIMENSION)[0]
+        interpolate = engine.interpolation(x, y)[0]
+        for function, run in (
+            ('leastSquares',
+             lambda: engine.leastSquares(x, y, REGRESSION_DIMENSION)),
+            ('apply fit', lambda: fit(middle)),
+            ('interpolate', lambda: interpolate(middle))):
+            results.setdefault(function, dict())[name] = perCall(run)
+    return results
+
+def report(label, results, outputFunction):
+    names = [name for name, engine in engines()]
+    for operation in sorted(results):
+        times = results[operation]
+        line = "%-8s %-16s" % (label, operation)
+        for name in names:
+            line += " %12.1f" % (times[name]*1e6)
+        if len(names) > 1:
+            line += " %8.1fx" % (times['python']/times['numpy'])
+        outputFunction(line)
+
+def main(argv):
+    sizes = [int(arg) for arg in argv] or SIZES
+    random.seed(0)
+    names = [name for name, engine in engines()]
+    header = "%-8s %-16s" % ('size', 'operation')
+    header += "".join(" %9s us" % name for name in names)
+    if len(names) > 1:
+        header += "  speedup"
+    else:
+        header += "  (NumPy is not available)"
+    print header
+    for size in sizes:
+        report(str(size), benchMatrices(size), Log.printLine)
+    for points in POINTS:
+        report("%d pts" % points, benchRegressions(points), Log.printLine)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
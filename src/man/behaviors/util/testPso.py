@@ -25,9 +25,16 @@
 
 # @see PSO::Particle::tick() for several benchmark functions
 
+import random
+
 import PSO as PSO
 from MyMath import distance3d
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 # a simple 3d geometric search example
 # the heuristic for each particle is the inverse of distance from DESTINATION
 # verdict: works pretty well, runs into some trouble due to the distance function
@@ -66,3 +73,43 @@ while (geometric_search.getIterations() < 100):
 
 
 
+
+# the same search on both of the Swarm's engines: NumPy arrays, when NumPy
+# imports, and the lists it falls back to otherwise. They draw their
+# random numbers differently, so their searches differ, but with a fixed
+# seed each is repeatable and both find the known optimum
+
+SPHERE_CENTER = 1.
+SPHERE_MINS = (-10., 3., -10., -10.)
+SPHERE_MAXS = (10., 3., 10., 10.) # the second dimension isn't searched
+SPHERE_ITERATIONS = 150
+
+def sphere(position):
+    return -sum((x - SPHERE_CENTER)**2 for x, sMin, sMax in
+                zip(position, SPHERE_MINS, SPHERE_MAXS) if sMin != sMax)
+
+def searchSphere(engine, seed):
+    PSO.numpy = engine
+    random.seed(seed)
+    swarm = PSO.Swarm(20, len(SPHERE_MINS), SPHERE_MINS, SPHERE_MAXS)
+    while swarm.getIterations() < SPHERE_ITERATIONS:
+        particle = swarm.getCurrentParticle()
+        particle.setHeuristic(sphere(particle.getPosition()))
+        swarm.tickCurrentParticle()
+    return swarm.getBestSolution()
+
+engines = [('lists', None)]
+if numpy is not None:
+    engines.insert(0, ('numpy', numpy))
+else:
+    print "NumPy isn't available, only the list engine is checked"
+
+for name, engine in engines:
+    for seed in xrange(5):
+        (position, score) = searchSphere(engine, seed)
+        print "%s, seed %d: %s scores %.4f" % (name, seed, position, score)
+        assert (position, score) == searchSphere(engine, seed)
+        assert score == sphere(position)
+        assert position[1] == SPHERE_MAXS[1]
+        assert score > -0.5
+PSO.numpy = numpy